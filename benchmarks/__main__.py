@@ -0,0 +1,53 @@
+import json
+
+import click
+from click import ClickException
+
+from benchmarks.crosswords import find_regressions, run_benchmarks
+
+
+@click.command()
+@click.option(
+    '--iterations', type=click.IntRange(min=1), default=20, help='Repetitions per case'
+)
+@click.option('--seed', type=int, default=0, help='Seed of the generated corpora')
+@click.option(
+    '--output',
+    type=click.File('w'),
+    default=None,
+    help='Writes the results as JSON to this file, - for the standard output',
+)
+@click.option(
+    '--baseline',
+    type=click.File('r'),
+    default=None,
+    help='JSON results of an earlier run to check for regressions',
+)
+@click.option(
+    '--tolerance',
+    type=click.FloatRange(min=0),
+    default=0.25,
+    help='Allowed relative slowdown of the median latencies',
+)
+def bench(iterations, seed, output, baseline, tolerance):
+    """
+    Benchmarks the crossword generation with generated lemma corpora, and reports the throughput, the latency
+    percentiles and the peak memory of every case. Fails if a median latency regressed compared to the baseline.
+    """
+    results = run_benchmarks(iterations, seed)
+    for result in results:
+        click.echo(
+            result.text_view(), err=output is not None and output.name == '<stdout>'
+        )
+    if output:
+        json.dump([result.to_dict() for result in results], output, indent=2)
+    if baseline:
+        regressions = find_regressions(results, json.load(baseline), tolerance)
+        if regressions:
+            raise ClickException(
+                'Performance regressions detected:\n' + '\n'.join(regressions)
+            )
+
+
+if __name__ == '__main__':
+    bench()
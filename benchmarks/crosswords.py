@@ -0,0 +1,248 @@
+import math
+import random
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Iterable
+
+from fastapi.testclient import TestClient
+
+from learnle.api import create_fast_api
+from learnle.api.dependencies import get_crossword_draft_cache
+from learnle.application.crosswords import create_crossword_draft
+from learnle.application.draft_cache import CrosswordDraftCache
+from learnle.application.model import Lemma
+from learnle.datatypes import Dimensions
+from learnle.utils.crossword_grid import UnpackedCrosswordGrid
+
+# Relative frequencies of the letters in English text, so the words intersect about as often as real words
+_LETTER_FREQUENCIES = {
+    'a': 8.2, 'b': 1.5, 'c': 2.8, 'd': 4.3, 'e': 12.7, 'f': 2.2, 'g': 2.0, 'h': 6.1, 'i': 7.0,
+    'j': 0.2, 'k': 0.8, 'l': 4.0, 'm': 2.4, 'n': 6.7, 'o': 7.5, 'p': 1.9, 'q': 0.1, 'r': 6.0,
+    's': 6.3, 't': 9.1, 'u': 2.8, 'v': 1.0, 'w': 2.4, 'x': 0.2, 'y': 2.0, 'z': 0.1,
+}  # fmt: skip
+
+WORD_COUNTS = (10, 50, 200)
+LEMMA_COUNTS = (3, 8)
+GRID_SIZES: tuple[int | None, ...] = (None, 10, 20)
+ENDPOINT_GRID_SIZES = (5, 10)
+
+
+def generate_corpus(size: int, rng: random.Random) -> list[Lemma]:
+    """
+    Generates lemmas with unique words of 3 to 9 letters drawn with the frequencies of English letters.
+    """
+    letters, weights = zip(*_LETTER_FREQUENCIES.items())
+    words: dict[str, None] = {}
+    while len(words) < size:
+        words[''.join(rng.choices(letters, weights, k=rng.randint(3, 9)))] = None
+    return [
+        Lemma(
+            uid=f'lemma_{index}',
+            word=word,
+            definition=f'definition of {word}',
+            example=f'example of {word}',
+        )
+        for index, word in enumerate(words)
+    ]
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    name: str
+    parameters: dict[str, int | None]
+    operations: int
+    throughput_per_second: float
+    latency_ms: dict[str, float]
+    peak_memory_bytes: int
+
+    @property
+    def key(self) -> str:
+        return self.name + ''.join(
+            f' {name}={value}' for name, value in sorted(self.parameters.items())
+        )
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def text_view(self) -> str:
+        latency = ' '.join(
+            f'{name}={value:.3f}' for name, value in self.latency_ms.items()
+        )
+        return (
+            f'{self.key}: {self.throughput_per_second:.1f} ops/s, latency ms {latency}, '
+            f'peak memory {self.peak_memory_bytes / 1024:.1f} KiB'
+        )
+
+
+def _percentile(sorted_values: list[float], percentile: float) -> float:
+    return sorted_values[max(math.ceil(percentile / 100 * len(sorted_values)) - 1, 0)]
+
+
+def _measure(
+    name: str,
+    parameters: dict[str, int | None],
+    iterations: int,
+    run: Callable[[], list[float]],
+) -> BenchmarkResult:
+    """
+    :param run: Runs one iteration of the benchmark and returns the latencies of its timed operations in seconds
+    """
+    latencies = sorted(latency for _ in range(iterations) for latency in run())
+    tracemalloc.start()
+    try:
+        run()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    total_seconds = sum(latencies)
+    return BenchmarkResult(
+        name=name,
+        parameters=parameters,
+        operations=len(latencies),
+        throughput_per_second=len(latencies) / total_seconds if total_seconds else 0.0,
+        latency_ms={
+            'p50': _percentile(latencies, 50) * 1000,
+            'p90': _percentile(latencies, 90) * 1000,
+            'p99': _percentile(latencies, 99) * 1000,
+            'max': latencies[-1] * 1000,
+        },
+        peak_memory_bytes=peak_memory,
+    )
+
+
+def _timed(operation: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    operation()
+    return time.perf_counter() - start
+
+
+def _maximum_dimensions(grid_size: int | None) -> Dimensions | None:
+    return Dimensions(grid_size, grid_size) if grid_size else None
+
+
+def _add_word_benchmark(
+    rng: random.Random, iterations: int, word_count: int, grid_size: int | None
+) -> BenchmarkResult:
+    def _run() -> list[float]:
+        grid = UnpackedCrosswordGrid(_maximum_dimensions(grid_size))
+        return [
+            _timed(lambda: grid.add_word(lemma.word))
+            for lemma in generate_corpus(word_count, rng)
+        ]
+
+    return _measure(
+        'add_word',
+        {'word_count': word_count, 'grid_size': grid_size},
+        iterations,
+        _run,
+    )
+
+
+def _pack_benchmark(
+    rng: random.Random, iterations: int, word_count: int, grid_size: int | None
+) -> BenchmarkResult:
+    def _run() -> list[float]:
+        grid = UnpackedCrosswordGrid(_maximum_dimensions(grid_size))
+        for lemma in generate_corpus(word_count, rng):
+            grid.add_word(lemma.word)
+        return [_timed(grid.pack)]
+
+    return _measure(
+        'pack', {'word_count': word_count, 'grid_size': grid_size}, iterations, _run
+    )
+
+
+def _create_crossword_draft_benchmark(
+    rng: random.Random, iterations: int, lemma_count: int, grid_size: int | None
+) -> BenchmarkResult:
+    def _run() -> list[float]:
+        lemmas = generate_corpus(lemma_count, rng)
+        return [_timed(lambda: create_crossword_draft(lemmas, grid_size, grid_size))]
+
+    return _measure(
+        'create_crossword_draft',
+        {'lemma_count': lemma_count, 'grid_size': grid_size},
+        iterations,
+        _run,
+    )
+
+
+def _draft_endpoint_benchmark(
+    client: TestClient, rng: random.Random, iterations: int, grid_size: int
+) -> BenchmarkResult:
+    def _run() -> list[float]:
+        request = {
+            'lemmas': [lemma.model_dump() for lemma in generate_corpus(3, rng)],
+            'maximum_width': grid_size,
+            'maximum_height': grid_size,
+        }
+        return [
+            _timed(
+                lambda: client.post('/crossword/draft', json=request).raise_for_status()
+            )
+        ]
+
+    return _measure('draft_endpoint', {'grid_size': grid_size}, iterations, _run)
+
+
+def run_benchmarks(iterations: int = 20, seed: int = 0) -> list[BenchmarkResult]:
+    """
+    Measures the grid operations, the draft generation and the draft endpoint with generated corpora. The draft
+    cache is disabled for the endpoint, so every request generates a new draft. The application runs with its
+    lifespan, which shuts down the crossword executor and its worker processes at the end.
+    :param iterations: The number of times each benchmark is repeated
+    :param seed: The seed of the generated corpora
+    :return: The results of the benchmarks
+    """
+    rng = random.Random(seed)
+    results = [
+        benchmark(rng, iterations, word_count, grid_size)
+        for benchmark in (_add_word_benchmark, _pack_benchmark)
+        for word_count in WORD_COUNTS
+        for grid_size in GRID_SIZES
+    ]
+    results += [
+        _create_crossword_draft_benchmark(rng, iterations, lemma_count, grid_size)
+        for lemma_count in LEMMA_COUNTS
+        for grid_size in GRID_SIZES
+    ]
+    fast_api = create_fast_api()
+    fast_api.dependency_overrides[get_crossword_draft_cache] = lambda: (
+        CrosswordDraftCache(maximum_size=0)
+    )
+    with TestClient(fast_api) as client:
+        _draft_endpoint_benchmark(client, rng, 1, ENDPOINT_GRID_SIZES[0])
+        results += [
+            _draft_endpoint_benchmark(client, rng, iterations, grid_size)
+            for grid_size in ENDPOINT_GRID_SIZES
+        ]
+    return results
+
+
+def find_regressions(
+    results: Iterable[BenchmarkResult], baseline: Iterable[dict], tolerance: float
+) -> list[str]:
+    """
+    Compares the median latencies with a baseline produced by an earlier run.
+    :param results: The results of the current run
+    :param baseline: The results of the earlier run as dictionaries
+    :param tolerance: The allowed relative slowdown, 0.25 allows 25% slower medians
+    :return: A description of every benchmark that got slower than allowed
+    """
+    baseline_latencies = {
+        BenchmarkResult(**result).key: result['latency_ms']['p50']
+        for result in baseline
+    }
+    regressions = []
+    for result in results:
+        baseline_latency = baseline_latencies.get(result.key)
+        if baseline_latency is None:
+            continue
+        latency = result.latency_ms['p50']
+        if latency > baseline_latency * (1 + tolerance):
+            regressions.append(
+                f'{result.key}: median latency {latency:.3f} ms, '
+                f'baseline {baseline_latency:.3f} ms'
+            )
+    return regressions
@@ -1,36 +1,23 @@
-from functools import lru_cache
+from typing import TYPE_CHECKING
 
-from fastapi import FastAPI, APIRouter
+if TYPE_CHECKING:
+    from fastapi import FastAPI
 
-from learnle.api.crossword_api import crossword_api_router
-from learnle.application.model import Lemma, Crossword
-from learnle.services.crossword_database import CrosswordInMemoryDatabaseAdapter
-from learnle.services.lemma_database import LemmaInMemoryDatabaseAdapter
-from learnle.utils.crud_operation import crud_api
 
+def create_fast_api() -> 'FastAPI':
+    """
+    Creates the application. The routers are only imported here, so that importing a module of this package, like
+    the dependencies, does not build all the routers.
+    """
+    from fastapi import FastAPI
 
-@lru_cache
-def get_lemma_database():
-    return LemmaInMemoryDatabaseAdapter()
+    from learnle.api.root_api import (
+        root_api_router,
+        RequestTimingMiddleware,
+        lifespan,
+    )
 
-
-@lru_cache
-def get_crossword_database():
-    return CrosswordInMemoryDatabaseAdapter()
-
-
-root_api_router = APIRouter()
-root_api_router.include_router(crud_api(get_lemma_database, Lemma))
-root_api_router.include_router(crud_api(get_crossword_database, Crossword))
-root_api_router.include_router(crossword_api_router)
-
-
-@root_api_router.get('/ping', tags=['misc'])
-def ping():
-    return 'OK'
-
-
-def create_fast_api():
-    api = FastAPI()
+    api = FastAPI(lifespan=lifespan)
+    api.add_middleware(RequestTimingMiddleware)
     api.include_router(root_api_router)
     return api
@@ -1,18 +1,48 @@
+import asyncio
+import logging
+from contextlib import contextmanager
+from typing import AsyncIterator
+
 from fastapi import (
     APIRouter,
+    Depends,
+    HTTPException,
+    Query,
 )
+from fastapi.responses import StreamingResponse
 from pydantic import (
     BaseModel,
     Field,
 )
 
+from learnle.application.answer_check import CrosswordAnswerKey, CrosswordCheckResult
 from learnle.application.model import (
     Lemma,
+    Crossword,
     CrosswordDraft,
+    CrosswordPuzzle,
+    CrosswordPuzzleLetter,
 )
+from learnle.application.draft_cache import CrosswordDraftCache
+from learnle.application.puzzle_pool import CrosswordPuzzlePool
+from learnle.datatypes import Dimensions
 
 import learnle.application.crosswords as crosswords
+from learnle.api.dependencies import (
+    get_crossword_database,
+    get_crossword_executor,
+    get_crossword_executor_settings,
+    get_crossword_puzzle_pool,
+    get_crossword_draft_cache,
+    get_served_puzzle_answer_keys,
+)
+from learnle.utils.crossword_search import SearchBudget
+from learnle.settings import CrosswordExecutorSettings
+from learnle.utils.executor import BoundedExecutor, ExecutorSaturatedError
+from learnle.utils.response_cache import VersionedCache
+
 
+logger = logging.getLogger(__name__)
 
 crossword_api_router = APIRouter(prefix='/crossword', tags=['Crossword'])
 
@@ -21,10 +51,292 @@ class CreateCrosswordRequest(BaseModel, frozen=True):
     lemmas: list[Lemma] = Field(max_length=3)
     maximum_width: int = Field(gt=3, le=10)
     maximum_height: int = Field(gt=3, le=10)
+    search_node_budget: int | None = Field(default=None, gt=0, le=10_000)
+    search_time_budget_ms: int | None = Field(default=None, gt=0, le=1_000)
+    trace: bool = False
+
+    @property
+    def search_budget(self) -> SearchBudget | None:
+        if self.search_node_budget is None and self.search_time_budget_ms is None:
+            return None
+        return SearchBudget(
+            max_nodes=self.search_node_budget or SearchBudget.max_nodes,
+            max_seconds=self.search_time_budget_ms / 1000
+            if self.search_time_budget_ms
+            else None,
+        )
+
+    @property
+    def draft_arguments(self) -> tuple:
+        return (
+            self.lemmas,
+            self.maximum_width,
+            self.maximum_height,
+            self.search_budget,
+            self.trace,
+        )
+
+
+class CreateCrosswordBatchRequest(BaseModel, frozen=True):
+    drafts: list[CreateCrosswordRequest] = Field(min_length=1, max_length=1_000)
+
+
+class AddCrosswordWordRequest(BaseModel, frozen=True):
+    lemma: Lemma
+    maximum_width: int | None = Field(default=None, gt=3, le=10)
+    maximum_height: int | None = Field(default=None, gt=3, le=10)
+
+    @property
+    def maximum_dimensions(self) -> Dimensions | None:
+        if self.maximum_width and self.maximum_height:
+            return Dimensions(self.maximum_width, self.maximum_height)
+        return None
+
 
+class CrosswordAnswer(BaseModel, frozen=True):
+    letters: list[CrosswordPuzzleLetter] = Field(max_length=10_000)
 
-@crossword_api_router.post('/draft')
-async def create_crossword_draft(request: CreateCrosswordRequest) -> CrosswordDraft:
-    return crosswords.create_crossword_draft(
-        request.lemmas, request.maximum_width, request.maximum_height
+
+class CrosswordBatchResult(BaseModel):
+    index: int
+    draft: CrosswordDraft | None = None
+    error: str | None = None
+
+
+@contextmanager
+def _executor_errors_as_http_errors():
+    try:
+        yield
+    except ExecutorSaturatedError:
+        raise HTTPException(
+            status_code=429, detail='Too many crossword drafts in progress'
+        )
+    except TimeoutError:
+        raise HTTPException(
+            status_code=504, detail='Crossword draft generation timed out'
+        )
+
+
+_EXECUTOR_ERROR_RESPONSES: dict[int | str, dict] = {
+    429: {'description': 'Too many crossword drafts in progress'},
+    504: {'description': 'Crossword draft generation timed out'},
+}
+
+
+async def _run_draft(
+    request: CreateCrosswordRequest,
+    executor: BoundedExecutor,
+    draft_cache: CrosswordDraftCache,
+    wait: bool = False,
+) -> CrosswordDraft:
+    """
+    Serves the draft from the cache unless the grid has to be traced, and computes it in the executor otherwise.
+    :param wait: Waits for a free slot of the executor instead of failing with 429 when it is saturated
+    """
+    layout_arguments = (
+        request.lemmas,
+        request.maximum_width,
+        request.maximum_height,
+        request.search_budget,
     )
+    if not request.trace and (draft := draft_cache.get(*layout_arguments)):
+        return draft
+    with _executor_errors_as_http_errors():
+        draft = await executor.run(
+            crosswords.create_crossword_draft, *request.draft_arguments, wait=wait
+        )
+    draft_cache.put(*layout_arguments, draft)
+    return draft
+
+
+@crossword_api_router.post('/draft', responses=_EXECUTOR_ERROR_RESPONSES)
+async def create_crossword_draft(
+    request: CreateCrosswordRequest,
+    executor: BoundedExecutor = Depends(get_crossword_executor),
+    draft_cache: CrosswordDraftCache = Depends(get_crossword_draft_cache),
+) -> CrosswordDraft:
+    return await _run_draft(request, executor, draft_cache)
+
+
+async def _batch_result(
+    index: int,
+    request: CreateCrosswordRequest,
+    executor: BoundedExecutor,
+    draft_cache: CrosswordDraftCache,
+    semaphore: asyncio.Semaphore,
+) -> CrosswordBatchResult:
+    async with semaphore:
+        try:
+            # Batch items queue for the executor, so a busy server slows a batch down instead of failing its drafts
+            draft = await _run_draft(request, executor, draft_cache, wait=True)
+            return CrosswordBatchResult(index=index, draft=draft)
+        except HTTPException as e:
+            return CrosswordBatchResult(index=index, error=e.detail)
+        except crosswords.CrosswordError as e:
+            return CrosswordBatchResult(index=index, error=str(e))
+        except Exception:
+            # A failing draft must not end the stream of the other drafts
+            logger.exception(
+                'Failed to create the crossword draft %d of a batch', index
+            )
+            return CrosswordBatchResult(
+                index=index, error='Failed to create the crossword draft'
+            )
+
+
+async def _batch_result_lines(
+    requests: list[CreateCrosswordRequest],
+    executor: BoundedExecutor,
+    draft_cache: CrosswordDraftCache,
+    concurrency: int,
+) -> AsyncIterator[str]:
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = [
+        asyncio.create_task(
+            _batch_result(index, request, executor, draft_cache, semaphore)
+        )
+        for index, request in enumerate(requests)
+    ]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield (await next_result).model_dump_json() + '\n'
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+@crossword_api_router.post(
+    '/draft/batch',
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            'content': {'application/x-ndjson': {}},
+            'description': 'One CrosswordBatchResult per line, in the order of completion',
+        }
+    },
+)
+async def create_crossword_drafts(
+    request: CreateCrosswordBatchRequest,
+    executor: BoundedExecutor = Depends(get_crossword_executor),
+    draft_cache: CrosswordDraftCache = Depends(get_crossword_draft_cache),
+    settings: CrosswordExecutorSettings = Depends(get_crossword_executor_settings),
+) -> StreamingResponse:
+    return StreamingResponse(
+        _batch_result_lines(
+            request.drafts, executor, draft_cache, settings.batch_concurrency
+        ),
+        media_type='application/x-ndjson',
+    )
+
+
+@crossword_api_router.get(
+    '/puzzle/random',
+    description='Serves a puzzle without the characters of its words. Its answers can be checked with '
+    'POST /crossword/{uid}/check until the answer key of the puzzle expires.',
+    responses=_EXECUTOR_ERROR_RESPONSES,
+)
+async def random_crossword_puzzle(
+    maximum_width: int | None = Query(default=None, gt=3, le=10),
+    maximum_height: int | None = Query(default=None, gt=3, le=10),
+    pool: CrosswordPuzzlePool = Depends(get_crossword_puzzle_pool),
+    answer_keys: VersionedCache[CrosswordAnswerKey] = Depends(
+        get_served_puzzle_answer_keys
+    ),
+) -> CrosswordPuzzle:
+    maximum_dimensions = (
+        Dimensions(maximum_width, maximum_height)
+        if maximum_width and maximum_height
+        else None
+    )
+    with _executor_errors_as_http_errors():
+        puzzle, crossword = await pool.get(maximum_dimensions)
+    # Only the answer key is kept, for a limited time, so the served puzzles stay out of the stored crosswords
+    answer_keys.put(puzzle.uid, answer_keys.version, CrosswordAnswerKey(crossword))
+    return puzzle
+
+
+@crossword_api_router.post(
+    '/{uid}/check',
+    description='Checks the letters placed by a player against the solution of a served puzzle or a stored '
+    'crossword, without revealing the solution. Letters outside of the grid are ignored and the case is ignored.',
+    responses={404: {'description': 'Crossword not found'}},
+)
+async def check_crossword_answer(
+    uid: str,
+    answer: CrosswordAnswer,
+    crossword_database: crosswords.CrosswordDatabaseAdapter = Depends(
+        get_crossword_database
+    ),
+    served_puzzle_answer_keys: VersionedCache[CrosswordAnswerKey] = Depends(
+        get_served_puzzle_answer_keys
+    ),
+) -> CrosswordCheckResult:
+    answer_key = served_puzzle_answer_keys.get(
+        uid
+    ) or await crossword_database.get_answer_key(uid)
+    if answer_key is None:
+        raise HTTPException(status_code=404, detail='Crossword not found')
+    return answer_key.check(answer.letters)
+
+
+async def _get_crossword(
+    uid: str, crossword_database: crosswords.CrosswordDatabaseAdapter
+) -> Crossword:
+    crossword = await crossword_database.get_by_uid(uid)
+    if crossword is None:
+        raise HTTPException(status_code=404, detail='Crossword not found')
+    return crossword
+
+
+@crossword_api_router.post(
+    '/{uid}/words',
+    description='Inserts the word of a lemma into a stored crossword, keeping the placements of the other words. '
+    'The crossword is saved if the word fits, otherwise the lemma is returned in lemmas_excluded.',
+    responses={
+        404: {'description': 'Crossword not found'},
+        409: {'description': 'The word cannot be added to the crossword'},
+    },
+)
+async def add_crossword_word(
+    uid: str,
+    request: AddCrosswordWordRequest,
+    crossword_database: crosswords.CrosswordDatabaseAdapter = Depends(
+        get_crossword_database
+    ),
+) -> CrosswordDraft:
+    crossword = await _get_crossword(uid, crossword_database)
+    try:
+        draft = crosswords.add_lemma_to_crossword(
+            crossword, request.lemma, request.maximum_dimensions
+        )
+    except crosswords.CrosswordError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not draft.lemmas_excluded:
+        await crossword_database.save(draft.crossword)
+    return draft
+
+
+@crossword_api_router.delete(
+    '/{uid}/words/{lemma_uid}',
+    description='Removes the word of a lemma from a stored crossword, keeping the placements of the other words. '
+    'A word that the other words are only connected through cannot be removed.',
+    responses={
+        404: {'description': 'Crossword or word not found'},
+        409: {'description': 'The other words would no longer be connected'},
+    },
+)
+async def remove_crossword_word(
+    uid: str,
+    lemma_uid: str,
+    crossword_database: crosswords.CrosswordDatabaseAdapter = Depends(
+        get_crossword_database
+    ),
+) -> Crossword:
+    crossword = await _get_crossword(uid, crossword_database)
+    try:
+        edited_crossword = crosswords.remove_lemma_from_crossword(crossword, lemma_uid)
+    except crosswords.CrosswordWordNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except crosswords.CrosswordError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return await crossword_database.save(edited_crossword)
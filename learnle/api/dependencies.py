@@ -0,0 +1,117 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+
+from learnle.application.answer_check import CrosswordAnswerKey
+from learnle.application.draft_cache import CrosswordDraftCache
+from learnle.application.puzzle_pool import CrosswordPuzzlePool
+from learnle.application.crosswords import CrosswordDatabaseAdapter
+from learnle.application.words import LemmaDatabaseAdapter
+from learnle.services.crossword_database import (
+    CrosswordInMemoryDatabaseAdapter,
+    CrosswordSQLiteDatabaseAdapter,
+)
+from learnle.services.lemma_database import (
+    LemmaInMemoryDatabaseAdapter,
+    LemmaSQLiteDatabaseAdapter,
+)
+from learnle.settings import (
+    AnswerKeyCacheSettings,
+    CrosswordExecutorSettings,
+    PuzzlePoolSettings,
+    DatabaseSettings,
+    ResponseCacheSettings,
+    DraftCacheSettings,
+    ServedPuzzleSettings,
+)
+from learnle.utils.executor import BoundedExecutor
+from learnle.utils.response_cache import SerializedCache, VersionedCache
+from learnle.utils.sqlite_crud import SQLiteConnectionPool
+
+
+@lru_cache
+def get_database_settings() -> DatabaseSettings:
+    return DatabaseSettings()
+
+
+@lru_cache
+def get_sqlite_connection_pool() -> SQLiteConnectionPool:
+    settings = get_database_settings()
+    return SQLiteConnectionPool(settings.sqlite_path, settings.sqlite_pool_size)
+
+
+def _serialized_cache() -> SerializedCache:
+    settings = ResponseCacheSettings()
+    return SerializedCache(settings.maximum_size, settings.time_to_live_seconds)
+
+
+@lru_cache
+def get_lemma_database() -> LemmaDatabaseAdapter:
+    lemma_database: LemmaDatabaseAdapter
+    if get_database_settings().backend == 'sqlite':
+        lemma_database = LemmaSQLiteDatabaseAdapter(get_sqlite_connection_pool())
+    else:
+        lemma_database = LemmaInMemoryDatabaseAdapter()
+    lemma_database.use_serialized_cache(_serialized_cache())
+    return lemma_database
+
+
+@lru_cache
+def get_crossword_database() -> CrosswordDatabaseAdapter:
+    crossword_database: CrosswordDatabaseAdapter
+    if get_database_settings().backend == 'sqlite':
+        crossword_database = CrosswordSQLiteDatabaseAdapter(
+            get_sqlite_connection_pool()
+        )
+    else:
+        crossword_database = CrosswordInMemoryDatabaseAdapter()
+    crossword_database.use_serialized_cache(_serialized_cache())
+    crossword_database.use_answer_key_cache(
+        VersionedCache(AnswerKeyCacheSettings().maximum_size)
+    )
+    return crossword_database
+
+
+@lru_cache
+def get_crossword_executor_settings() -> CrosswordExecutorSettings:
+    return CrosswordExecutorSettings()
+
+
+@lru_cache
+def get_crossword_executor() -> BoundedExecutor:
+    settings = get_crossword_executor_settings()
+    executor_class = (
+        ProcessPoolExecutor if settings.kind == 'process' else ThreadPoolExecutor
+    )
+    return BoundedExecutor(
+        executor_class(max_workers=settings.max_workers),
+        max_pending=settings.max_pending,
+        timeout_seconds=settings.timeout_seconds,
+    )
+
+
+@lru_cache
+def get_puzzle_pool_settings() -> PuzzlePoolSettings:
+    return PuzzlePoolSettings()
+
+
+@lru_cache
+def get_crossword_puzzle_pool() -> CrosswordPuzzlePool:
+    settings = get_puzzle_pool_settings()
+    return CrosswordPuzzlePool(
+        get_lemma_database(),
+        depth=settings.depth,
+        refill_concurrency=settings.refill_concurrency,
+        executor=get_crossword_executor(),
+    )
+
+
+@lru_cache
+def get_served_puzzle_answer_keys() -> VersionedCache[CrosswordAnswerKey]:
+    settings = ServedPuzzleSettings()
+    return VersionedCache(settings.maximum_size, settings.time_to_live_seconds)
+
+
+@lru_cache
+def get_crossword_draft_cache() -> CrosswordDraftCache:
+    settings = DraftCacheSettings()
+    return CrosswordDraftCache(settings.maximum_size, settings.directory)
@@ -0,0 +1,81 @@
+from fastapi import (
+    APIRouter,
+    Depends,
+    Query,
+    Request,
+)
+
+from learnle.api.dependencies import get_lemma_database
+from learnle.application.lemma_import import (
+    DEFAULT_CHUNK_SIZE,
+    LemmaImportFormat,
+    LemmaImportSummary,
+    import_lemmas,
+)
+from learnle.application.model import Lemma
+from learnle.application.words import LemmaDatabaseAdapter, LemmaTextSearchPage
+from learnle.utils.streaming import iterate_lines
+
+
+lemma_api_router = APIRouter(prefix='/lemma', tags=['Lemma'])
+
+
+@lemma_api_router.post(
+    path='/import',
+    description='Streams JSONL or CSV encoded lemmas from the request body into the database. '
+    'CSV input must start with a header naming the fields.',
+    summary='Import Lemma objects in bulk',
+    openapi_extra={
+        'requestBody': {
+            'required': True,
+            'content': {
+                'application/x-ndjson': {'schema': {'type': 'string'}},
+                'text/csv': {'schema': {'type': 'string'}},
+            },
+        }
+    },
+)
+async def _(
+    request: Request,
+    import_format: LemmaImportFormat = Query(
+        default=LemmaImportFormat.JSONL, alias='format'
+    ),
+    chunk_size: int = Query(default=DEFAULT_CHUNK_SIZE, gt=0, le=10_000),
+    lemma_database: LemmaDatabaseAdapter = Depends(get_lemma_database),
+) -> LemmaImportSummary:
+    return await import_lemmas(
+        lemma_database,
+        iterate_lines(request.stream()),
+        import_format,
+        chunk_size,
+    )
+
+
+@lemma_api_router.get(
+    path='/search',
+    description='Finds the lemmas whose word matches a pattern, ignoring the case. '
+    'A question mark matches any letter, ?a??e matches the five letter words with a as their second '
+    'and e as their last letter.',
+    summary='Search Lemma objects by word pattern',
+)
+async def _(
+    pattern: str = Query(min_length=1, max_length=64),
+    limit: int = Query(default=100, gt=0, le=1_000),
+    lemma_database: LemmaDatabaseAdapter = Depends(get_lemma_database),
+) -> list[Lemma]:
+    return await lemma_database.find_by_pattern(pattern, limit)
+
+
+@lemma_api_router.get(
+    path='/text-search',
+    description='Finds the lemmas whose definition or example contains every term of the query, each term '
+    'matching the start of a word, ignoring the case and the diacritics. The best matches come first.',
+    summary='Search Lemma objects by definition and example',
+)
+async def _(
+    query: str = Query(min_length=1, max_length=256),
+    page_number: int = Query(default=1, gt=0),
+    page_size: int = Query(default=20, gt=0, le=100),
+    lemma_database: LemmaDatabaseAdapter = Depends(get_lemma_database),
+) -> LemmaTextSearchPage:
+    return await lemma_database.search_text(query, page_number, page_size)
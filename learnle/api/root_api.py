@@ -0,0 +1,113 @@
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from learnle.api.crossword_api import crossword_api_router
+from learnle.api.lemma_api import lemma_api_router
+from learnle.api.dependencies import (
+    get_lemma_database,
+    get_crossword_database,
+    get_crossword_executor,
+    get_crossword_puzzle_pool,
+    get_puzzle_pool_settings,
+)
+from learnle.application.model import Lemma, Crossword
+from learnle.application.words import RESERVED_LEMMA_UIDS
+from learnle.datatypes import Dimensions
+from learnle.utils.crud_api import crud_api
+from learnle.utils.metrics import REGISTRY
+
+
+root_api_router = APIRouter()
+root_api_router.include_router(lemma_api_router)
+root_api_router.include_router(crud_api(get_lemma_database, Lemma, RESERVED_LEMMA_UIDS))
+root_api_router.include_router(crud_api(get_crossword_database, Crossword))
+root_api_router.include_router(crossword_api_router)
+
+
+@root_api_router.get('/ping', tags=['misc'])
+def ping():
+    return 'OK'
+
+
+@root_api_router.get(
+    '/metrics',
+    tags=['misc'],
+    response_class=PlainTextResponse,
+    description='Metrics in the Prometheus text exposition format',
+)
+def metrics():
+    return PlainTextResponse(
+        REGISTRY.render(), media_type='text/plain; version=0.0.4; charset=utf-8'
+    )
+
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    'learnle_http_request_seconds',
+    'Duration of the HTTP requests by route',
+    ('method', 'route', 'status'),
+)
+
+
+class RequestTimingMiddleware:
+    """
+    Records the duration of the HTTP requests until the last chunk of their response body is sent, so streamed
+    responses are timed in full. A request that fails before its response is complete is recorded with status 500.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = '500'
+        recorded = False
+
+        def record():
+            nonlocal recorded
+            recorded = True
+            route = scope.get('route')
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                scope['method'],
+                route.path if route else 'unmatched',
+                status,
+            )
+
+        async def timed_send(message: Message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = str(message['status'])
+            await send(message)
+            if message['type'] == 'http.response.body' and not message.get(
+                'more_body', False
+            ):
+                record()
+
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            if not recorded:
+                record()
+
+
+@asynccontextmanager
+async def lifespan(api: FastAPI):
+    """
+    Starts filling the puzzle pools of the configured sizes, and stops the background work of the pool and the
+    executor when the application shuts down.
+    """
+    pool = get_crossword_puzzle_pool()
+    for size in get_puzzle_pool_settings().prefill:
+        pool.refill(Dimensions(*size) if size else None)
+    yield
+    await pool.close()
+    get_crossword_puzzle_pool.cache_clear()
+    get_crossword_executor().shutdown()
+    get_crossword_executor.cache_clear()
@@ -0,0 +1,87 @@
+from operator import itemgetter
+from typing import Callable, Iterable
+
+from pydantic import BaseModel
+
+from learnle.application.model import Crossword, CrosswordPuzzleLetter
+
+
+class CrosswordWordCheck(BaseModel):
+    lemma_uid: str
+    correct: bool
+
+
+class CrosswordCheckResult(BaseModel):
+    solved: bool
+    words: list[CrosswordWordCheck]
+
+
+def _no_slots(state: list) -> tuple:
+    return ()
+
+
+class CrosswordAnswerKey:
+    """
+    The solution of a crossword, built once per crossword. The positions of the letters are relative to the first word
+    of the crossword and may be negative, so every position is indexed by y * width + x within the bounding box of the
+    solution letters, and the index maps to the slot of the cell in an array of the solution characters. Every word is
+    checked by taking the characters of its slots from the submitted state with an itemgetter and comparing them with
+    the solution, ignoring the case.
+    """
+
+    __slots__ = ('_left', '_top', '_width', '_height', '_slots', '_words')
+
+    def __init__(self, crossword: Crossword):
+        positions = [letter.position for letter in crossword.solution_letters]
+        self._left = min((position.x for position in positions), default=0)
+        self._top = min((position.y for position in positions), default=0)
+        self._width = (
+            max((position.x for position in positions), default=-1) + 1 - self._left
+        )
+        self._height = (
+            max((position.y for position in positions), default=-1) + 1 - self._top
+        )
+        self._slots: dict[int, int] = {}
+        solution: list[str | None] = []
+        self._words: list[tuple[str, Callable[[list], object], object]] = []
+        for word in crossword.solution:
+            slots = []
+            for letter in word.letters:
+                index = (
+                    (letter.position.y - self._top) * self._width
+                    + letter.position.x
+                    - self._left
+                )
+                slot = self._slots.setdefault(index, len(self._slots))
+                if slot == len(solution):
+                    solution.append(None)
+                solution[slot] = letter.character.casefold()
+                slots.append(slot)
+            # A tuple of the characters of the word, or a single character for one letter words
+            slots_getter = itemgetter(*slots) if slots else _no_slots
+            self._words.append((word.lemma.uid, slots_getter, slots_getter(solution)))
+
+    def check(self, letters: Iterable[CrosswordPuzzleLetter]) -> CrosswordCheckResult:
+        """
+        :param letters: The letters placed by the player, in the coordinates of the solution. The letters outside of
+            the solution are ignored, and a later letter replaces an earlier one at the same position
+        :return: Whether each word of the solution is spelled correctly by the placed letters
+        """
+        left, top, width, slots = self._left, self._top, self._width, self._slots
+        right, bottom = left + width, top + self._height
+        state: list[str | None] = [None] * len(slots)
+        for letter in letters:
+            x, y = letter.position.x, letter.position.y
+            if left <= x < right and top <= y < bottom:
+                slot = slots.get((y - top) * width + x - left)
+                if slot is not None:
+                    state[slot] = letter.character.casefold()
+        words = [
+            CrosswordWordCheck(
+                lemma_uid=lemma_uid, correct=slots_getter(state) == expected
+            )
+            for lemma_uid, slots_getter, expected in self._words
+        ]
+        return CrosswordCheckResult(
+            solved=all(word.correct for word in words), words=words
+        )
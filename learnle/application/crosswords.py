@@ -1,8 +1,12 @@
+import logging
 from abc import ABC
+from collections import defaultdict
 from random import shuffle
 from typing import Iterable
 
+from learnle.application.answer_check import CrosswordAnswerKey
 from learnle.application.model import (
+    CrosswordPuzzleClue,
     CrosswordPuzzleLetter,
     SolvedCrosswordPuzzleWord,
     CrosswordPuzzle,
@@ -12,12 +16,30 @@ from learnle.application.model import (
 )
 
 from learnle.application.words import LemmaDatabaseAdapter
-from learnle.datatypes import Dimensions
+from learnle.datatypes import Dimensions, Position
 from learnle.utils.crossword_grid import (
+    GridLetter,
     UnpackedCrosswordGrid,
 )
+from learnle.utils.crossword_search import SearchBudget, search_layout
 from learnle.utils.crud_operation import CRUDAdapter
 from learnle.utils import generate_uid
+from learnle.utils.metrics import REGISTRY
+from learnle.utils.response_cache import VersionedCache
+
+logger = logging.getLogger(__name__)
+# The grid traces requested for single drafts are logged whatever the level of the root logger, TRACE_CROSSWORDS
+# lowers this level to DEBUG to log every grid
+logger.setLevel(logging.INFO)
+
+# The largest width and height of a stored crossword that is rebuilt into a grid to be edited
+MAXIMUM_CROSSWORD_DIMENSION = 256
+
+CROSSWORD_STAGE_SECONDS = REGISTRY.histogram(
+    'learnle_crossword_stage_seconds',
+    'Duration of the stages of the crossword draft generation',
+    ('stage',),
+)
 
 
 def _get_shuffled_characters(letters: Iterable[CrosswordPuzzleLetter]):
@@ -28,45 +50,97 @@ def _get_shuffled_characters(letters: Iterable[CrosswordPuzzleLetter]):
 
 async def random_crossword_puzzle(
     lemma_database: LemmaDatabaseAdapter,
-) -> CrosswordPuzzle:
-    random_lemmas = await lemma_database.random_lemmas()
-    draft = _build_crossword_grid(list(random_lemmas))
-    solution_letters = draft.crossword.solution_letters
+    maximum_dimensions: Dimensions | None = None,
+) -> tuple[CrosswordPuzzle, Crossword]:
+    random_lemmas = await lemma_database.random_interlocking_lemmas()
+    return create_crossword_puzzle(list(random_lemmas), maximum_dimensions)
+
+
+def create_crossword_puzzle(
+    lemmas: list[Lemma], maximum_dimensions: Dimensions | None = None
+) -> tuple[CrosswordPuzzle, Crossword]:
+    """
+    :return: The puzzle served to the player, with the definitions of the words but without their characters, and
+        the crossword of its solution, under the same uid
+    """
+    crossword = _build_crossword_grid(lemmas, maximum_dimensions).crossword
+    solution_letters = crossword.solution_letters
     shuffled_characters = _get_shuffled_characters(solution_letters)
-    return CrosswordPuzzle(
-        uid=generate_uid(),
-        width=draft.crossword.width,
-        height=draft.crossword.height,
+    puzzle = CrosswordPuzzle(
+        uid=crossword.uid,
+        width=crossword.width,
+        height=crossword.height,
+        clues=[
+            CrosswordPuzzleClue(
+                lemma_uid=word.lemma.uid,
+                definition=word.lemma.definition,
+                positions=[letter.position for letter in word.letters],
+            )
+            for word in crossword.solution
+        ],
         shuffled_state=[
             CrosswordPuzzleLetter(character=character, position=letter.position)
             for letter, character in zip(solution_letters, shuffled_characters)
         ],
-        solution=draft.crossword.solution,
     )
+    return puzzle, crossword
 
 
 class CrosswordDatabaseAdapter(CRUDAdapter[Crossword], ABC):
-    pass
+    _answer_key_cache: VersionedCache[CrosswordAnswerKey] | None = None
+
+    def use_answer_key_cache(self, cache: VersionedCache[CrosswordAnswerKey]):
+        """
+        Caches the answer keys read by get_answer_key, which are invalidated together with the serialized items.
+        """
+        self._answer_key_cache = cache
+
+    def _invalidate(self, uid: str):
+        super()._invalidate(uid)
+        if self._answer_key_cache is not None:
+            self._answer_key_cache.invalidate(uid)
+
+    async def get_answer_key(self, uid: str) -> CrosswordAnswerKey | None:
+        """
+        :return: The answer key of the crossword, None if the crossword does not exist
+        """
+        cache = self._answer_key_cache
+        answer_key = cache.get(uid) if cache is not None else None
+        if answer_key is None:
+            version = cache.version if cache is not None else 0
+            crossword = await self.get_by_uid(uid)
+            if crossword is None:
+                return None
+            answer_key = CrosswordAnswerKey(crossword)
+            if cache is not None:
+                cache.put(uid, version, answer_key)
+        return answer_key
 
 
 class CrosswordError(Exception):
     pass
 
 
+class CrosswordWordNotFoundError(CrosswordError):
+    pass
+
+
 def create_crossword_draft(
     lemmas: list[Lemma],
     maximum_width: int | None = None,
     maximum_height: int | None = None,
+    search_budget: SearchBudget | None = None,
+    trace: bool = False,
 ) -> CrosswordDraft:
     maximum_dimensions = (
         Dimensions(maximum_width, maximum_height)
         if maximum_width and maximum_height
         else None
     )
-    return _build_crossword_grid(lemmas, maximum_dimensions)
+    return _build_crossword_grid(lemmas, maximum_dimensions, search_budget, trace)
 
 
-def _sort_lemmas(lemmas: Iterable[Lemma]) -> list[Lemma]:
+def sort_lemmas(lemmas: Iterable[Lemma]) -> list[Lemma]:
     sorted_lemmas = list(lemmas)
     sorted_lemmas.sort(key=lambda x: len(x.word), reverse=True)
     return sorted_lemmas
@@ -74,47 +148,243 @@ def _sort_lemmas(lemmas: Iterable[Lemma]) -> list[Lemma]:
 
 def _insert_lemmas(
     sorted_lemmas: Iterable[Lemma], unpacked_crossword_grid: UnpackedCrosswordGrid
-) -> dict[str, list[CrosswordPuzzleLetter]]:
-    letters_by_lemma: dict[str, list[CrosswordPuzzleLetter]] = {}
+) -> dict[str, list[GridLetter]]:
+    letters_by_lemma: dict[str, list[GridLetter]] = {}
     for lemma in sorted_lemmas:
         if letters := unpacked_crossword_grid.add_word(lemma.word):
             letters_by_lemma[lemma.uid] = letters
     return letters_by_lemma
 
 
+def _search_lemmas(
+    sorted_lemmas: list[Lemma],
+    maximum_dimensions: Dimensions | None,
+    search_budget: SearchBudget,
+) -> tuple[UnpackedCrosswordGrid, dict[str, list[GridLetter]]]:
+    layout = search_layout(
+        [lemma.word for lemma in sorted_lemmas], maximum_dimensions, search_budget
+    )
+    return layout.grid, {
+        lemma.uid: layout.letters_by_word[lemma.word]
+        for lemma in sorted_lemmas
+        if lemma.word in layout.letters_by_word
+    }
+
+
 def _has_non_unique_words(lemmas: list[Lemma]):
     return len(lemmas) != len(set(map(lambda x: x.word, lemmas)))
 
 
+def _trace_grid(unpacked_crossword_grid: UnpackedCrosswordGrid, trace: bool):
+    """
+    Logs the text view of the grid at INFO level if tracing was requested for the draft, at DEBUG level otherwise.
+    The text view is only rendered if the record is going to be logged.
+    """
+    level = logging.INFO if trace else logging.DEBUG
+    if logger.isEnabledFor(level):
+        logger.log(level, 'Crossword grid:\n%s', unpacked_crossword_grid.text_view())
+
+
 def _build_crossword_grid(
-    lemmas: list[Lemma], maximum_dimensions: Dimensions | None = None
+    lemmas: list[Lemma],
+    maximum_dimensions: Dimensions | None = None,
+    search_budget: SearchBudget | None = None,
+    trace: bool = False,
 ):
     if _has_non_unique_words(lemmas):
         raise CrosswordError('Non-unique words detected')
 
-    unpacked_crossword_grid = UnpackedCrosswordGrid(maximum_dimensions)
-    sorted_lemmas = _sort_lemmas(lemmas)
-    inserted_letters_by_lemma = _insert_lemmas(sorted_lemmas, unpacked_crossword_grid)
+    with CROSSWORD_STAGE_SECONDS.time('sort'):
+        sorted_lemmas = sort_lemmas(lemmas)
+    if search_budget:
+        with CROSSWORD_STAGE_SECONDS.time('search'):
+            unpacked_crossword_grid, inserted_letters_by_lemma = _search_lemmas(
+                sorted_lemmas, maximum_dimensions, search_budget
+            )
+    else:
+        with CROSSWORD_STAGE_SECONDS.time('insert'):
+            unpacked_crossword_grid = UnpackedCrosswordGrid(maximum_dimensions)
+            inserted_letters_by_lemma = _insert_lemmas(
+                sorted_lemmas, unpacked_crossword_grid
+            )
+
+    with CROSSWORD_STAGE_SECONDS.time('pack'):
+        packed_crossword_grid = unpacked_crossword_grid.pack()
+    _trace_grid(unpacked_crossword_grid, trace)
+    with CROSSWORD_STAGE_SECONDS.time('serialize'):
+        return assemble_crossword_draft(
+            sorted_lemmas,
+            packed_crossword_grid.dimensions(),
+            {
+                uid: [letter.to_model() for letter in letters]
+                for uid, letters in inserted_letters_by_lemma.items()
+            },
+        )
+
+
+def rehydrate_crossword_grid(
+    crossword: Crossword, maximum_dimensions: Dimensions | None = None
+) -> UnpackedCrosswordGrid:
+    """
+    Rebuilds the unpacked grid of a crossword from its solution, whose letters are in the coordinates of that grid.
+    The grid spans the letters and the origin of the coordinates, so that span is checked against the dimensions of
+    the crossword before any cell is allocated.
+    :raises CrosswordError: If the words are not connected, if their letters and the origin do not fit into the
+        dimensions of the crossword or MAXIMUM_CROSSWORD_DIMENSION, or if the letters do not form a grid
+    """
+    if not _is_connected(crossword.solution):
+        raise CrosswordError('The words of the crossword are not connected')
+    # The width and height of the grid minus one, the origin is always part of the grid
+    xs = [0, *(letter.position.x for letter in crossword.solution_letters)]
+    ys = [0, *(letter.position.y for letter in crossword.solution_letters)]
+    if crossword.solution and (
+        max(xs) - min(xs) >= min(crossword.width, MAXIMUM_CROSSWORD_DIMENSION)
+        or max(ys) - min(ys) >= min(crossword.height, MAXIMUM_CROSSWORD_DIMENSION)
+    ):
+        raise CrosswordError('The letters exceed the dimensions of the crossword')
+    try:
+        return UnpackedCrosswordGrid.from_words(
+            (
+                [
+                    GridLetter(letter.character, letter.position)
+                    for letter in word.letters
+                ]
+                for word in crossword.solution
+            ),
+            maximum_dimensions,
+        )
+    except ValueError as e:
+        raise CrosswordError(str(e)) from e
+
+
+def _edited_crossword(
+    crossword: Crossword, solution: list[SolvedCrosswordPuzzleWord]
+) -> Crossword:
+    """
+    :return: The crossword with the edited solution, sized to the bounding box of its letters, which are shifted so
+        that the bounding box starts at 0, 0
+    """
+    positions = [letter.position for word in solution for letter in word.letters]
+    left = min((position.x for position in positions), default=0)
+    top = min((position.y for position in positions), default=0)
+    return Crossword(
+        uid=crossword.uid,
+        width=max((position.x for position in positions), default=-1) + 1 - left,
+        height=max((position.y for position in positions), default=-1) + 1 - top,
+        solution=[
+            SolvedCrosswordPuzzleWord(
+                lemma=word.lemma,
+                letters=[
+                    CrosswordPuzzleLetter(
+                        character=letter.character,
+                        position=letter.position.shift(-left, -top),
+                    )
+                    for letter in word.letters
+                ],
+            )
+            for word in solution
+        ],
+    )
+
+
+def _is_connected(solution: list[SolvedCrosswordPuzzleWord]) -> bool:
+    """
+    :return: Whether every word can be reached from the first one through the letters the words share
+    """
+    if not solution:
+        return True
+    words_by_position: dict[Position, list[int]] = defaultdict(list)
+    for index, word in enumerate(solution):
+        for letter in word.letters:
+            words_by_position[letter.position].append(index)
+    reached = {0}
+    unvisited = [0]
+    while unvisited:
+        for letter in solution[unvisited.pop()].letters:
+            for index in words_by_position[letter.position]:
+                if index not in reached:
+                    reached.add(index)
+                    unvisited.append(index)
+    return len(reached) == len(solution)
+
 
-    packed_crossword_grid = unpacked_crossword_grid.pack()
-    print(unpacked_crossword_grid.text_view())
+def add_lemma_to_crossword(
+    crossword: Crossword, lemma: Lemma, maximum_dimensions: Dimensions | None = None
+) -> CrosswordDraft:
+    """
+    Inserts the word of a lemma into an existing crossword, keeping the placements of the other words.
+    :param crossword: The crossword to edit
+    :param lemma: The lemma to insert
+    :param maximum_dimensions: The maximum dimensions of the edited crossword
+    :return: The edited crossword with the same uid, or the unchanged crossword and the lemma in lemmas_excluded if
+        the word does not fit
+    :raises CrosswordError: If the crossword already has the word or the lemma
+    """
+    if any(
+        word.lemma.word == lemma.word or word.lemma.uid == lemma.uid
+        for word in crossword.solution
+    ):
+        raise CrosswordError('Non-unique words detected')
+    unpacked_crossword_grid = rehydrate_crossword_grid(crossword, maximum_dimensions)
+    letters = unpacked_crossword_grid.add_word(lemma.word)
+    if not letters:
+        return CrosswordDraft(crossword=crossword, lemmas_excluded=[lemma])
+    solution = [
+        *crossword.solution,
+        SolvedCrosswordPuzzleWord(
+            lemma=lemma, letters=[letter.to_model() for letter in letters]
+        ),
+    ]
+    return CrosswordDraft(
+        crossword=_edited_crossword(crossword, solution),
+        lemmas_excluded=[],
+    )
+
+
+def remove_lemma_from_crossword(crossword: Crossword, lemma_uid: str) -> Crossword:
+    """
+    Removes the word of a lemma from an existing crossword, keeping the placements of the other words. The letters
+    of the word that other words cross stay in the grid, and the crossword shrinks to the remaining letters.
+    :param crossword: The crossword to edit
+    :param lemma_uid: The uid of the lemma to remove
+    :return: The edited crossword with the same uid
+    :raises CrosswordWordNotFoundError: If the crossword has no word of the lemma
+    :raises CrosswordError: If the other words would no longer be connected without the word
+    """
+    solution = [word for word in crossword.solution if word.lemma.uid != lemma_uid]
+    if len(solution) == len(crossword.solution):
+        raise CrosswordWordNotFoundError('The crossword has no word of the lemma')
+    if not _is_connected(solution):
+        raise CrosswordError('Removing the word would split the crossword')
+    return _edited_crossword(crossword, solution)
+
+
+def assemble_crossword_draft(
+    sorted_lemmas: list[Lemma],
+    dimensions: Dimensions,
+    letters_by_lemma: dict[str, list[CrosswordPuzzleLetter]],
+) -> CrosswordDraft:
+    """
+    Creates a draft with a new uid from the letters of the lemmas inserted into the grid.
+    :param sorted_lemmas: The lemmas of the draft in the order of insertion
+    :param dimensions: The dimensions of the packed grid
+    :param letters_by_lemma: The letters of the inserted lemmas by lemma uid
+    """
     return CrosswordDraft(
         crossword=Crossword(
             uid=generate_uid(),
-            width=packed_crossword_grid.dimensions().width,
-            height=packed_crossword_grid.dimensions().height,
+            width=dimensions.width,
+            height=dimensions.height,
             solution=[
                 SolvedCrosswordPuzzleWord(
                     lemma=lemma,
-                    letters=inserted_letters_by_lemma[lemma.uid],
+                    letters=letters_by_lemma[lemma.uid],
                 )
                 for lemma in sorted_lemmas
-                if lemma.uid in inserted_letters_by_lemma
+                if lemma.uid in letters_by_lemma
             ],
         ),
         lemmas_excluded=[
-            lemma
-            for lemma in sorted_lemmas
-            if lemma.uid not in inserted_letters_by_lemma
+            lemma for lemma in sorted_lemmas if lemma.uid not in letters_by_lemma
         ],
     )
@@ -0,0 +1,159 @@
+import json
+import logging
+import os
+from collections import OrderedDict
+from hashlib import sha256
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+
+from pydantic import BaseModel, ValidationError
+
+from learnle.application.crosswords import assemble_crossword_draft, sort_lemmas
+from learnle.application.model import CrosswordDraft, CrosswordPuzzleLetter, Lemma
+from learnle.datatypes import Dimensions
+from learnle.utils.crossword_search import SearchBudget
+
+logger = logging.getLogger(__name__)
+
+
+class _DraftLayout(BaseModel):
+    width: int
+    height: int
+    letters_by_word: dict[str, list[CrosswordPuzzleLetter]]
+
+
+def draft_cache_key(
+    words: list[str],
+    maximum_width: int | None,
+    maximum_height: int | None,
+    search_budget: SearchBudget | None,
+) -> str | None:
+    """
+    :return: A hash of the draft arguments that determine the layout, None if the layout is not deterministic
+    """
+    if search_budget is not None and search_budget.max_seconds is not None:
+        return None
+    budget = (
+        [search_budget.max_nodes, search_budget.max_branching]
+        if search_budget
+        else None
+    )
+    canonical_arguments = json.dumps([words, maximum_width, maximum_height, budget])
+    return sha256(canonical_arguments.encode()).hexdigest()
+
+
+class CrosswordDraftCache:
+    """
+    Memoizes the layouts of the drafts, because the layout only depends on the ordered words, the maximum dimensions
+    and the node budget of the search. The layouts are kept in a least recently used cache, and optionally in a
+    directory shared by several processes, which is not pruned. Every hit assembles a new draft with a new uid from
+    the lemmas of the request.
+    """
+
+    def __init__(self, maximum_size: int = 1024, directory: str | None = None):
+        self._maximum_size = maximum_size
+        self._layouts: OrderedDict[str, _DraftLayout] = OrderedDict()
+        self._directory = Path(directory) if directory else None
+        if self._directory:
+            self._directory.mkdir(parents=True, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._layouts)
+
+    def get(
+        self,
+        lemmas: list[Lemma],
+        maximum_width: int | None = None,
+        maximum_height: int | None = None,
+        search_budget: SearchBudget | None = None,
+    ) -> CrosswordDraft | None:
+        key = draft_cache_key(
+            [lemma.word for lemma in lemmas],
+            maximum_width,
+            maximum_height,
+            search_budget,
+        )
+        if key is None:
+            return None
+        layout = self._layouts.get(key)
+        if layout is None:
+            layout = self._read(key)
+            if layout is None:
+                return None
+            self._remember(key, layout)
+        else:
+            self._layouts.move_to_end(key)
+        return assemble_crossword_draft(
+            sort_lemmas(lemmas),
+            Dimensions(layout.width, layout.height),
+            {
+                lemma.uid: [
+                    letter.model_copy() for letter in layout.letters_by_word[lemma.word]
+                ]
+                for lemma in lemmas
+                if lemma.word in layout.letters_by_word
+            },
+        )
+
+    def put(
+        self,
+        lemmas: list[Lemma],
+        maximum_width: int | None,
+        maximum_height: int | None,
+        search_budget: SearchBudget | None,
+        draft: CrosswordDraft,
+    ):
+        key = draft_cache_key(
+            [lemma.word for lemma in lemmas],
+            maximum_width,
+            maximum_height,
+            search_budget,
+        )
+        if key is None:
+            return
+        layout = _DraftLayout(
+            width=draft.crossword.width,
+            height=draft.crossword.height,
+            letters_by_word={
+                word.lemma.word: [letter.model_copy() for letter in word.letters]
+                for word in draft.crossword.solution
+            },
+        )
+        self._remember(key, layout)
+        self._write(key, layout)
+
+    def _remember(self, key: str, layout: _DraftLayout):
+        if self._maximum_size <= 0:
+            return
+        self._layouts[key] = layout
+        self._layouts.move_to_end(key)
+        if len(self._layouts) > self._maximum_size:
+            self._layouts.popitem(last=False)
+
+    def _read(self, key: str) -> _DraftLayout | None:
+        if self._directory is None:
+            return None
+        try:
+            return _DraftLayout.model_validate_json(
+                (self._directory / f'{key}.json').read_bytes()
+            )
+        except FileNotFoundError:
+            return None
+        except (OSError, ValidationError):
+            logger.warning('Ignoring unreadable cached draft layout %s', key)
+            return None
+
+    def _write(self, key: str, layout: _DraftLayout):
+        """
+        Writes the layout to a temporary file first, so other processes never read a partially written layout.
+        """
+        if self._directory is None:
+            return
+        try:
+            with NamedTemporaryFile(
+                'w', dir=self._directory, suffix='.tmp', delete=False
+            ) as f:
+                f.write(layout.model_dump_json())
+            os.replace(f.name, self._directory / f'{key}.json')
+        except OSError:
+            logger.warning('Could not write cached draft layout %s', key)
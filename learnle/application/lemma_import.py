@@ -0,0 +1,178 @@
+import csv
+from collections import deque
+from enum import Enum
+from typing import AsyncIterable, AsyncIterator, Collection, Iterator
+
+from pydantic import BaseModel, ValidationError
+
+from learnle.application.model import Lemma
+from learnle.application.words import LemmaDatabaseAdapter, RESERVED_LEMMA_UIDS
+
+DEFAULT_CHUNK_SIZE = 1000
+MAXIMUM_REPORTED_ERRORS = 100
+MAXIMUM_RECORD_LENGTH = 64 * 1024
+
+
+class LemmaImportFormat(str, Enum):
+    JSONL = 'jsonl'
+    CSV = 'csv'
+
+
+class LemmaImportError(BaseModel):
+    line: int
+    error: str
+
+
+class LemmaImportSummary(BaseModel):
+    imported: int = 0
+    failed: int = 0
+    errors: list[LemmaImportError] = []
+
+    def add_error(self, line: int, error: str):
+        self.failed += 1
+        if len(self.errors) < MAXIMUM_REPORTED_ERRORS:
+            self.errors.append(LemmaImportError(line=line, error=error))
+
+
+class _RecordSplitter:
+    """
+    Joins the lines of quoted CSV fields that contain line breaks. A record whose quote is still open after
+    MAXIMUM_RECORD_LENGTH characters, or at the end of the input, is reported as unterminated, and the lines after
+    its first line are read again as new records, so an unclosed quote cannot swallow the rest of the input.
+    """
+
+    def __init__(self):
+        self._lines: list[tuple[int, str]] = []
+        self._quotes = 0
+        self._length = 0
+
+    def feed(self, line_number: int, line: str) -> Iterator[tuple[int, str | None]]:
+        pending = deque([(line_number, line)])
+        while pending:
+            line_number, line = pending.popleft()
+            self._lines.append((line_number, line))
+            self._quotes += line.count('"')
+            self._length += len(line) + 1
+            if self._quotes % 2 == 0:
+                record = '\n'.join(line for _, line in self._lines)
+                start = self._reset()[0][0]
+                if record.strip():
+                    yield start, record
+            elif self._length > MAXIMUM_RECORD_LENGTH:
+                yield from self._unterminated(pending)
+
+    def close(self) -> Iterator[tuple[int, str | None]]:
+        pending: deque[tuple[int, str]] = deque()
+        while self._lines:
+            yield from self._unterminated(pending)
+            while pending:
+                yield from self.feed(*pending.popleft())
+
+    def _unterminated(
+        self, pending: deque[tuple[int, str]]
+    ) -> Iterator[tuple[int, None]]:
+        lines = self._reset()
+        pending.extendleft(reversed(lines[1:]))
+        yield lines[0][0], None
+
+    def _reset(self) -> list[tuple[int, str]]:
+        lines = self._lines
+        self._lines, self._quotes, self._length = [], 0, 0
+        return lines
+
+
+async def _records(
+    lines: AsyncIterable[str],
+) -> AsyncIterator[tuple[int, str | None]]:
+    """
+    :return: The line number where each record starts and the record, None for an unterminated record
+    """
+    splitter = _RecordSplitter()
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        for record in splitter.feed(line_number, line):
+            yield record
+    for record in splitter.close():
+        yield record
+
+
+async def _numbered_lines(
+    lines: AsyncIterable[str],
+) -> AsyncIterator[tuple[int, str]]:
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if line.strip():
+            yield line_number, line
+
+
+class _LemmaParser:
+    def __init__(self, import_format: LemmaImportFormat):
+        self._import_format = import_format
+        self._field_names: list[str] | None = None
+
+    def parse(self, record: str) -> Lemma | None:
+        """
+        :return: The lemma of the record, None for the header of a CSV file
+        """
+        if self._import_format == LemmaImportFormat.JSONL:
+            return Lemma.model_validate_json(record)
+        values = next(csv.reader([record]))
+        if self._field_names is None:
+            self._field_names = [name.strip() for name in values]
+            return None
+        if len(values) != len(self._field_names):
+            raise ValueError(
+                f'Expected {len(self._field_names)} fields, got {len(values)}'
+            )
+        return Lemma.model_validate(dict(zip(self._field_names, values)))
+
+
+async def import_lemmas(
+    lemma_database: LemmaDatabaseAdapter,
+    lines: AsyncIterable[str],
+    import_format: LemmaImportFormat = LemmaImportFormat.JSONL,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    reserved_uids: Collection[str] = RESERVED_LEMMA_UIDS,
+) -> LemmaImportSummary:
+    """
+    Validates and saves the lemmas of a JSONL or CSV stream chunk by chunk, so only one chunk is kept in memory.
+    Invalid records are skipped and reported in the summary. CSV input must start with a header naming the fields.
+    :param lemma_database: The database to save the lemmas to
+    :param lines: The lines of the input
+    :param import_format: The format of the input
+    :param chunk_size: The number of lemmas saved at once
+    :param reserved_uids: The uids that are rejected like invalid records, the uids of the fixed lemma paths by
+        default
+    :return: The number of imported lemmas and the errors of the invalid records
+    """
+    summary = LemmaImportSummary()
+    parser = _LemmaParser(import_format)
+    records: AsyncIterator[tuple[int, str | None]] = (
+        _records(lines)
+        if import_format == LemmaImportFormat.CSV
+        else _numbered_lines(lines)
+    )
+    chunk: list[Lemma] = []
+    async for line_number, record in records:
+        if record is None:
+            summary.add_error(line_number, 'Unterminated quoted field')
+            continue
+        try:
+            lemma = parser.parse(record)
+        except (ValidationError, ValueError, csv.Error) as e:
+            summary.add_error(line_number, str(e))
+            continue
+        if lemma is None:
+            continue
+        if lemma.uid in reserved_uids:
+            summary.add_error(line_number, f'The uid {lemma.uid} is reserved')
+            continue
+        chunk.append(lemma)
+        if len(chunk) == chunk_size:
+            summary.imported += await lemma_database.save_many(chunk)
+            chunk = []
+    if chunk:
+        summary.imported += await lemma_database.save_many(chunk)
+    return summary
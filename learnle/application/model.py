@@ -36,7 +36,17 @@ class Crossword(BaseModel):
         return list(chain(*map(lambda x: x.letters, self.solution)))
 
 
-class CrosswordPuzzle(Crossword):
+class CrosswordPuzzleClue(BaseModel):
+    lemma_uid: str
+    definition: str
+    positions: list[Position]
+
+
+class CrosswordPuzzle(BaseModel):
+    uid: str
+    width: int
+    height: int
+    clues: list[CrosswordPuzzleClue]
     shuffled_state: list[CrosswordPuzzleLetter]
 
 
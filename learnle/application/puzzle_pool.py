@@ -0,0 +1,94 @@
+import asyncio
+import logging
+from collections import defaultdict, deque
+
+from learnle.application.crosswords import create_crossword_puzzle
+from learnle.application.model import Crossword, CrosswordPuzzle
+from learnle.application.words import LemmaDatabaseAdapter
+from learnle.datatypes import Dimensions
+from learnle.utils.executor import BoundedExecutor, ExecutorSaturatedError
+
+logger = logging.getLogger(__name__)
+
+
+class CrosswordPuzzlePool:
+    """
+    Keeps up to depth ready crossword puzzles for every maximum dimensions that were asked for. Taking a puzzle
+    schedules background tasks that fill the pool up again, at most refill_concurrency puzzles are generated at the
+    same time. If the pool of the requested dimensions is empty, the puzzle is generated on the spot.
+    """
+
+    def __init__(
+        self,
+        lemma_database: LemmaDatabaseAdapter,
+        depth: int,
+        refill_concurrency: int,
+        executor: BoundedExecutor | None = None,
+    ):
+        self._lemma_database = lemma_database
+        self._depth = depth
+        self._refill_semaphore = asyncio.Semaphore(refill_concurrency)
+        self._executor = executor
+        self._puzzles: dict[
+            Dimensions | None, deque[tuple[CrosswordPuzzle, Crossword]]
+        ] = defaultdict(deque)
+        self._refills_in_flight: dict[Dimensions | None, int] = defaultdict(int)
+        self._refill_tasks: set[asyncio.Task] = set()
+
+    def size(self, maximum_dimensions: Dimensions | None = None) -> int:
+        return len(self._puzzles[maximum_dimensions])
+
+    async def get(
+        self, maximum_dimensions: Dimensions | None = None
+    ) -> tuple[CrosswordPuzzle, Crossword]:
+        """
+        :return: The puzzle and the crossword of its solution, as returned by create_crossword_puzzle
+        """
+        puzzles = self._puzzles[maximum_dimensions]
+        puzzle = puzzles.popleft() if puzzles else None
+        self.refill(maximum_dimensions)
+        return puzzle or await self._generate(maximum_dimensions)
+
+    def refill(self, maximum_dimensions: Dimensions | None = None):
+        """
+        Schedules the generation of the puzzles that are missing from the pool of the maximum dimensions.
+        """
+        missing = (
+            self._depth
+            - len(self._puzzles[maximum_dimensions])
+            - self._refills_in_flight[maximum_dimensions]
+        )
+        for _ in range(missing):
+            self._refills_in_flight[maximum_dimensions] += 1
+            task = asyncio.create_task(self._refill_one(maximum_dimensions))
+            self._refill_tasks.add(task)
+            task.add_done_callback(self._refill_tasks.discard)
+
+    async def close(self):
+        for task in self._refill_tasks:
+            task.cancel()
+        await asyncio.gather(*self._refill_tasks, return_exceptions=True)
+
+    async def _refill_one(self, maximum_dimensions: Dimensions | None):
+        try:
+            async with self._refill_semaphore:
+                puzzle, crossword = await self._generate(maximum_dimensions)
+            # An empty lemma database gives puzzles without words, they are not worth keeping for later
+            if puzzle.shuffled_state:
+                self._puzzles[maximum_dimensions].append((puzzle, crossword))
+        except ExecutorSaturatedError:
+            logger.debug('Executor is saturated, skipping crossword puzzle refill')
+        except Exception:
+            logger.exception('Failed to generate a crossword puzzle for the pool')
+        finally:
+            self._refills_in_flight[maximum_dimensions] -= 1
+
+    async def _generate(
+        self, maximum_dimensions: Dimensions | None
+    ) -> tuple[CrosswordPuzzle, Crossword]:
+        lemmas = list(await self._lemma_database.random_interlocking_lemmas())
+        if self._executor:
+            return await self._executor.run(
+                create_crossword_puzzle, lemmas, maximum_dimensions
+            )
+        return create_crossword_puzzle(lemmas, maximum_dimensions)
@@ -2,16 +2,99 @@ from abc import (
     ABC,
     abstractmethod,
 )
+from typing import Callable
+
+from pydantic import BaseModel
 
 from learnle.application.model import Lemma
-from learnle.utils.crud_operation import CRUDAdapter
+from learnle.utils.crud_operation import CRUDAdapter, RESERVED_UIDS
+
+# The uids of the fixed paths of the lemma routers, items with these uids could not be read back
+RESERVED_LEMMA_UIDS = RESERVED_UIDS | {'search', 'text-search'}
+
+
+class LemmaTextSearchPage(BaseModel):
+    items: list[Lemma]
+    total: int
 
 
 class LemmaDatabaseAdapter(CRUDAdapter[Lemma], ABC):
     @abstractmethod
-    async def random_lemmas(self) -> list[Lemma]:
+    async def random_lemmas(
+        self,
+        count: int = 3,
+        minimum_word_length: int | None = None,
+        maximum_word_length: int | None = None,
+        letters: str | None = None,
+    ) -> list[Lemma]:
+        """
+        Picks distinct random lemmas. Fewer lemmas are returned if not enough of them match the filters.
+        :param count: The number of lemmas to pick
+        :param minimum_word_length: The minimum length of the words
+        :param maximum_word_length: The maximum length of the words
+        :param letters: If specified, the words must contain at least one of these letters
+        :return: The picked lemmas
+        """
         raise NotImplementedError
 
+    @abstractmethod
+    async def random_interlocking_lemmas(self, count: int = 3) -> list[Lemma]:
+        """
+        Picks distinct random lemmas whose words pairwise share at least one letter of a to z, ignoring the case, so
+        they can all intersect in a crossword.
+        :param count: The number of lemmas to pick
+        :return: The picked lemmas, fewer if not enough lemmas share letters with the picked ones
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def search_text(
+        self, query: str, page_number: int = 1, page_size: int = 20
+    ) -> LemmaTextSearchPage:
+        """
+        Finds the lemmas whose definition or example contains every term of the query, each term matching the start
+        of a word, ignoring the case and the diacritics. The lemmas are ranked with BM25.
+        :param query: The search terms
+        :param page_number: The number of the page, starting with 1
+        :param page_size: The maximum number of lemmas on the page
+        :return: The lemmas of the page, best ranked first, and the number of matching lemmas
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_by_pattern(self, pattern: str, limit: int = 100) -> list[Lemma]:
+        """
+        Finds the lemmas whose word matches a pattern, ignoring the case.
+        :param pattern: The letters of the word, with a question mark where any letter is allowed, ?a??e matches
+            the five letter words with a as their second and e as their last letter
+        :param limit: The maximum number of lemmas returned
+        :return: The matching lemmas
+        """
+        raise NotImplementedError
+
+
+def lemma_filter(
+    minimum_word_length: int | None = None,
+    maximum_word_length: int | None = None,
+    letters: str | None = None,
+) -> Callable[[Lemma], bool] | None:
+    """
+    :return: The predicate of the random_lemmas filters, None if no filter was specified
+    """
+    if minimum_word_length is None and maximum_word_length is None and not letters:
+        return None
+    letter_set = frozenset(letters or '')
+
+    def _matches(lemma: Lemma) -> bool:
+        word = lemma.word
+        return (
+            (minimum_word_length is None or len(word) >= minimum_word_length)
+            and (maximum_word_length is None or len(word) <= maximum_word_length)
+            and (not letter_set or not letter_set.isdisjoint(word))
+        )
+
+    return _matches
+
 
 async def create_lemma(lemma: Lemma, lemma_db: LemmaDatabaseAdapter):
     await lemma_db.save(lemma)
@@ -1,24 +1,34 @@
-import click
+import logging
+from typing import TYPE_CHECKING, Iterator
 
-import uvicorn
-import yaml
+import click
 from click import ClickException
-from fastapi import FastAPI
-from pydantic import Field
 
-from pydantic_settings import BaseSettings
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
+    from learnle.settings import ApiSettings
+
 
-from learnle.api import create_fast_api
+def setup_app() -> tuple['FastAPI', 'ApiSettings']:
+    from learnle.settings import ApiSettings
 
+    return create_app(), ApiSettings()
 
-class ApiSettings(BaseSettings):
-    port: int = Field(alias='API_PORT', default=8000)
 
+def create_app() -> 'FastAPI':
+    from learnle.api import create_fast_api
 
-def setup_app() -> tuple[FastAPI, ApiSettings]:
-    settings = ApiSettings()
-    fast_api = create_fast_api()
-    return fast_api, settings
+    return create_fast_api()
+
+
+def setup_logging(settings: 'ApiSettings'):
+    from learnle.application import crosswords
+
+    logging.basicConfig(level=settings.log_level.upper())
+    crosswords.logger.setLevel(
+        logging.DEBUG if settings.trace_crosswords else logging.INFO
+    )
 
 
 @click.group()
@@ -28,22 +38,27 @@ def main():
 
 @main.command()
 def serve():
+    import uvicorn
+
     fast_api, settings = setup_app()
+    setup_logging(settings)
     uvicorn.run(fast_api, port=settings.port)
 
 
 @main.command()
 def generate_openapi():
-    fast_api, _ = setup_app()
-    openapi_schema = fast_api.openapi()
+    import yaml
+
+    openapi_schema = create_app().openapi()
     with open('openapi.yaml', 'w+') as f:
         f.write(yaml.dump(openapi_schema))
 
 
 @main.command()
 def check_openapi():
-    fast_api, _ = setup_app()
-    openapi_schema = fast_api.openapi()
+    import yaml
+
+    openapi_schema = create_app().openapi()
     with open('openapi.yaml', 'r') as f:
         openapi_schema_in_repo = yaml.safe_load(f)
     if openapi_schema != openapi_schema_in_repo:
@@ -51,5 +66,151 @@ def check_openapi():
         raise ClickException('openapi.yaml is not up-to-date')
 
 
+@main.command()
+@click.argument('input_file', type=click.File('r'))
+@click.option('--workers', type=int, default=None, help='Number of worker processes')
+def draft_batch(input_file, workers):
+    """
+    Creates crossword drafts for a file of JSON encoded draft requests, one per line. The results are written to the
+    standard output as NDJSON, in the order of completion. An invalid line is reported with its line number in the
+    result of its request, and the other requests are still drafted. So is a request whose draft fails.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from os import cpu_count
+
+    from pydantic import ValidationError
+
+    from learnle.api.crossword_api import CreateCrosswordRequest, CrosswordBatchResult
+    from learnle.application.crosswords import create_crossword_draft, CrosswordError
+    from learnle.utils.executor import map_unordered
+
+    workers = workers or cpu_count() or 1
+    # The index of the request of every valid line, the invalid lines are reported while the input is read
+    request_indexes: list[int] = []
+
+    def _draft_arguments() -> Iterator[tuple]:
+        index = 0
+        for line_number, line in enumerate(input_file, start=1):
+            if not line.strip():
+                continue
+            try:
+                request = CreateCrosswordRequest.model_validate_json(line)
+            except ValidationError as e:
+                error = f'Invalid request on line {line_number}: {e}'
+                click.echo(
+                    CrosswordBatchResult(index=index, error=error).model_dump_json()
+                )
+            else:
+                request_indexes.append(index)
+                yield request.draft_arguments
+            index += 1
+
+    with ProcessPoolExecutor(workers) as executor:
+        for argument_index, future in map_unordered(
+            executor, create_crossword_draft, _draft_arguments(), workers * 2
+        ):
+            index = request_indexes[argument_index]
+            try:
+                result = CrosswordBatchResult(index=index, draft=future.result())
+            except CrosswordError as e:
+                result = CrosswordBatchResult(index=index, error=str(e))
+            except Exception as e:
+                # A failing worker, or a broken process pool, must not end the output of the other drafts
+                result = CrosswordBatchResult(
+                    index=index, error=f'Failed to create the crossword draft: {e!r}'
+                )
+            click.echo(result.model_dump_json())
+
+
+@main.command(name='import-lemmas')
+@click.argument('input_file', type=click.File('r', encoding='utf-8'))
+@click.option(
+    '--format',
+    'import_format',
+    type=click.Choice(['jsonl', 'csv']),
+    default='jsonl',
+    help='Format of the input file',
+)
+@click.option(
+    '--chunk-size',
+    type=click.IntRange(min=1),
+    default=None,
+    help='Number of lemmas saved at once, 1000 by default',
+)
+def import_lemmas_command(input_file, import_format, chunk_size):
+    """
+    Imports the lemmas of a JSONL or CSV file into the configured SQLite database. The file is read line by line, so
+    it can be larger than the memory. A summary of the import is written to the standard output as JSON.
+    """
+    import asyncio
+
+    from learnle.api.dependencies import get_database_settings, get_lemma_database
+    from learnle.application.lemma_import import (
+        DEFAULT_CHUNK_SIZE,
+        LemmaImportFormat,
+        import_lemmas,
+    )
+    from learnle.utils.streaming import iterate_async
+
+    database_settings = get_database_settings()
+    if (
+        database_settings.backend != 'sqlite'
+        or database_settings.sqlite_path == ':memory:'
+    ):
+        raise ClickException(
+            'The lemmas would be lost when the command exits, '
+            'set DATABASE_BACKEND=sqlite and a SQLITE_PATH file to import them'
+        )
+    summary = asyncio.run(
+        import_lemmas(
+            get_lemma_database(),
+            iterate_async(line.rstrip('\r\n') for line in input_file),
+            LemmaImportFormat(import_format),
+            chunk_size or DEFAULT_CHUNK_SIZE,
+        )
+    )
+    click.echo(summary.model_dump_json())
+
+
+@main.command()
+@click.argument('module', default='learnle.cli')
+@click.option(
+    '--limit', type=click.IntRange(min=1), default=20, help='Number of modules shown'
+)
+@click.option(
+    '--sort',
+    'sort_by',
+    type=click.Choice(['cumulative', 'self']),
+    default='cumulative',
+    help='Sorts by the time including or excluding the nested imports',
+)
+def import_time(module, limit, sort_by):
+    """
+    Measures how long importing a module takes in a new interpreter, and lists the slowest modules imported along with
+    it. Pass learnle.api to see the cost of the server, or a module of a command to see the cost of that command.
+    """
+    from learnle.utils.import_time import measure_import_times
+
+    try:
+        import_times = measure_import_times(module)
+    except ImportError as e:
+        raise ClickException(str(e))
+    total_microseconds = sum(x.self_microseconds for x in import_times)
+    import_times.sort(
+        key=lambda x: x.cumulative_microseconds
+        if sort_by == 'cumulative'
+        else x.self_microseconds,
+        reverse=True,
+    )
+    click.echo(
+        f'{module}: {total_microseconds / 1000:.1f} ms, {len(import_times)} modules'
+    )
+    click.echo(f'{"self ms":>9} {"cumulative ms":>14}  module')
+    for x in import_times[:limit]:
+        click.echo(
+            f'{x.self_microseconds / 1000:9.1f} {x.cumulative_microseconds / 1000:14.1f}  {x.module}'
+        )
+
+
 if __name__ == '__main__':
     main()
@@ -3,7 +3,7 @@ from enum import Enum, auto
 from typing import Iterable
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Dimensions:
     width: int
     height: int
@@ -20,10 +20,10 @@ class Axis(Enum):
         return self.VERTICAL if self == self.HORIZONTAL else self.HORIZONTAL
 
     def unit_position(self) -> 'Position':
-        return Position(1, 0) if self == self.HORIZONTAL else Position(0, 1)
+        return _UNIT_POSITIONS[self]
 
 
-@dataclass(frozen=True, eq=True, unsafe_hash=True)
+@dataclass(frozen=True, eq=True, unsafe_hash=True, slots=True)
 class Position:
     x: int
     y: int
@@ -40,44 +40,48 @@ class Position:
                 yield Position(x, self.y)
 
     def adjacent_positions(self) -> list['Position']:
+        x, y = self.x, self.y
         return [
-            self.shift(x=-1),
-            self.shift(x=+1),
-            self.shift(y=-1),
-            self.shift(y=+1),
+            Position(x - 1, y),
+            Position(x + 1, y),
+            Position(x, y - 1),
+            Position(x, y + 1),
         ]
 
     def adjacent_positions_on_axis(self, axis: Axis) -> set['Position']:
-        unit_position = axis.unit_position()
+        unit_position = _UNIT_POSITIONS[axis]
         return {
-            self.shift(unit_position.x, unit_position.y),
-            self.shift(-unit_position.x, -unit_position.y),
+            Position(self.x + unit_position.x, self.y + unit_position.y),
+            Position(self.x - unit_position.x, self.y - unit_position.y),
         }
 
     def next_by_axis(self, axis: Axis) -> 'Position':
-        unit_position = axis.unit_position()
-        return self.shift(unit_position.x, unit_position.y)
+        unit_position = _UNIT_POSITIONS[axis]
+        return Position(self.x + unit_position.x, self.y + unit_position.y)
 
     def prev_by_axis(self, axis: Axis) -> 'Position':
-        unit_position = axis.unit_position()
-        return self.shift(-unit_position.x, -unit_position.y)
+        unit_position = _UNIT_POSITIONS[axis]
+        return Position(self.x - unit_position.x, self.y - unit_position.y)
 
     def line(
         self, length: int, axis: Axis, offset: int = 0
     ) -> tuple['Position', 'Position']:
         length = length - 1
-        unit_position = axis.unit_position()
-        start_pos = self.shift(
-            x=-unit_position.x * offset,
-            y=-unit_position.y * offset,
+        unit_position = _UNIT_POSITIONS[axis]
+        start_x = self.x - unit_position.x * offset
+        start_y = self.y - unit_position.y * offset
+        return Position(start_x, start_y), Position(
+            start_x + unit_position.x * length, start_y + unit_position.y * length
         )
-        end_pos = start_pos.shift(
-            x=unit_position.x * length, y=unit_position.y * length
-        )
-        return start_pos, end_pos
 
 
-@dataclass
+_UNIT_POSITIONS = {
+    Axis.HORIZONTAL: Position(1, 0),
+    Axis.VERTICAL: Position(0, 1),
+}
+
+
+@dataclass(slots=True)
 class Shape:
     min_y: int = 0
     min_x: int = 0
@@ -1,6 +1,7 @@
 from learnle.application.crosswords import CrosswordDatabaseAdapter
 from learnle.application.model import Crossword
 from learnle.utils.crud_operation import InMemoryCRUDAdapter
+from learnle.utils.sqlite_crud import SQLiteCRUDAdapter, SQLiteConnectionPool
 
 
 class CrosswordInMemoryDatabaseAdapter(
@@ -14,3 +15,13 @@ class CrosswordInMemoryDatabaseAdapter(
 
     async def random_lemmas(self) -> list[Crossword]:
         raise NotImplementedError
+
+
+class CrosswordSQLiteDatabaseAdapter(
+    CrosswordDatabaseAdapter, SQLiteCRUDAdapter[Crossword]
+):
+    def __init__(self, connection_pool: SQLiteConnectionPool):
+        super().__init__(connection_pool, 'crossword', Crossword)
+
+    def _extract_uid(self, item: Crossword) -> str:
+        return item.uid
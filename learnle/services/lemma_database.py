@@ -1,16 +1,253 @@
-from learnle.application.words import LemmaDatabaseAdapter
+import random
+import sqlite3
+from string import ascii_lowercase
+from typing import Sequence
+
+from learnle.application.words import (
+    LemmaDatabaseAdapter,
+    LemmaTextSearchPage,
+    lemma_filter,
+)
 from learnle.application.model import Lemma
 from learnle.utils.crud_operation import (
     InMemoryCRUDAdapter,
 )
+from learnle.utils.sqlite_crud import SQLiteCRUDAdapter, SQLiteConnectionPool
+from learnle.utils.text_index import TextIndex, tokenize
+from learnle.utils.word_index import WILDCARD, WordPatternIndex, letter_signature
+
+
+def _indexed_text(lemma: Lemma) -> str:
+    return f'{lemma.definition}\n{lemma.example}'
 
 
 class LemmaInMemoryDatabaseAdapter(LemmaDatabaseAdapter, InMemoryCRUDAdapter[Lemma]):
+    def __init__(self):
+        super().__init__()
+        self._word_index = WordPatternIndex()
+        self._text_index = TextIndex()
+
     def _set_uid(self, item: Lemma, uid: str):
         item.uid = uid
 
     def _extract_uid(self, item: Lemma) -> str:
         return item.uid
 
-    async def random_lemmas(self) -> list[Lemma]:
-        raise NotImplementedError
+    async def random_lemmas(
+        self,
+        count: int = 3,
+        minimum_word_length: int | None = None,
+        maximum_word_length: int | None = None,
+        letters: str | None = None,
+    ) -> list[Lemma]:
+        return self._items.sample(
+            count, lemma_filter(minimum_word_length, maximum_word_length, letters)
+        )
+
+    async def save(self, item: Lemma) -> Lemma:
+        saved_item = await super().save(item)
+        self._word_index.add(item.uid, item.word)
+        self._text_index.add(item.uid, _indexed_text(item))
+        return saved_item
+
+    async def save_many(self, items: Sequence[Lemma]) -> int:
+        saved_count = await super().save_many(items)
+        for item in items:
+            self._word_index.add(item.uid, item.word)
+            self._text_index.add(item.uid, _indexed_text(item))
+        return saved_count
+
+    async def delete(self, uid: str):
+        await super().delete(uid)
+        self._word_index.remove(uid)
+        self._text_index.remove(uid)
+
+    async def random_interlocking_lemmas(self, count: int = 3) -> list[Lemma]:
+        return [
+            self._items[uid]
+            for uid in self._word_index.sample_interlocking(count, random.Random())
+        ]
+
+    async def find_by_pattern(self, pattern: str, limit: int = 100) -> list[Lemma]:
+        return [self._items[uid] for uid in self._word_index.find(pattern, limit)]
+
+    async def search_text(
+        self, query: str, page_number: int = 1, page_size: int = 20
+    ) -> LemmaTextSearchPage:
+        total, uids = self._text_index.search(
+            query, (page_number - 1) * page_size, page_size
+        )
+        return LemmaTextSearchPage(
+            items=[self._items[uid] for uid in uids], total=total
+        )
+
+
+_WORD = "lower(json_extract(data, '$.word'))"
+
+
+def _sharing_a_letter_glob_pattern(word: str) -> str | None:
+    """
+    :return: A pattern matching the words that share a letter with the word, None if the word has no letters
+    """
+    signature = letter_signature(word)
+    letters = ''.join(
+        letter for bit, letter in enumerate(ascii_lowercase) if signature >> bit & 1
+    )
+    return f'*[{letters}]*' if letters else None
+
+
+def _glob_pattern(pattern: str) -> str:
+    return ''.join(
+        '?'
+        if character == WILDCARD
+        else f'[{character}]'
+        if character in '*[]'
+        else character
+        for character in pattern.lower()
+    )
+
+
+def _text_match_expression(query: str) -> str | None:
+    """
+    :return: An FTS5 query matching the documents with every token of the query as a prefix, None if the query has
+        no tokens
+    """
+    tokens = tokenize(query)
+    return ' '.join(f'"{token}"*' for token in tokens) if tokens else None
+
+
+class LemmaSQLiteDatabaseAdapter(LemmaDatabaseAdapter, SQLiteCRUDAdapter[Lemma]):
+    """
+    Pattern queries use an index on the length of the words, and only match the words of the given length. The
+    definitions and the examples are copied into an FTS5 table by triggers, whose rowid is the sequence of the lemma.
+    """
+
+    def __init__(self, connection_pool: SQLiteConnectionPool):
+        super().__init__(connection_pool, 'lemma', Lemma)
+        with connection_pool.transaction() as connection:
+            connection.execute(
+                f'CREATE INDEX IF NOT EXISTS lemma_word_length ON lemma (length({_WORD}))'
+            )
+            self._create_text_index(connection)
+
+    @staticmethod
+    def _create_text_index(connection: sqlite3.Connection):
+        text_index_exists = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'lemma_text'"
+        ).fetchone()
+        if text_index_exists:
+            return
+        columns = "json_extract(new.data, '$.definition'), json_extract(new.data, '$.example')"
+        connection.execute(
+            'CREATE VIRTUAL TABLE lemma_text USING fts5('
+            "definition, example, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        connection.execute(
+            'CREATE TRIGGER lemma_text_insert AFTER INSERT ON lemma BEGIN '
+            f'INSERT INTO lemma_text (rowid, definition, example) VALUES (new.sequence, {columns}); END'
+        )
+        connection.execute(
+            'CREATE TRIGGER lemma_text_update AFTER UPDATE OF data ON lemma BEGIN '
+            'DELETE FROM lemma_text WHERE rowid = old.sequence; '
+            f'INSERT INTO lemma_text (rowid, definition, example) VALUES (new.sequence, {columns}); END'
+        )
+        connection.execute(
+            'CREATE TRIGGER lemma_text_delete AFTER DELETE ON lemma BEGIN '
+            'DELETE FROM lemma_text WHERE rowid = old.sequence; END'
+        )
+        connection.execute(
+            'INSERT INTO lemma_text (rowid, definition, example) '
+            "SELECT sequence, json_extract(data, '$.definition'), json_extract(data, '$.example') FROM lemma"
+        )
+
+    def _extract_uid(self, item: Lemma) -> str:
+        return item.uid
+
+    async def random_lemmas(
+        self,
+        count: int = 3,
+        minimum_word_length: int | None = None,
+        maximum_word_length: int | None = None,
+        letters: str | None = None,
+    ) -> list[Lemma]:
+        return await self._random_items(
+            count, lemma_filter(minimum_word_length, maximum_word_length, letters)
+        )
+
+    async def random_interlocking_lemmas(self, count: int = 3) -> list[Lemma]:
+        """
+        Probes random primary keys like random_lemmas, taking the first following row whose word shares a letter
+        with every lemma picked before, and wrapping around to the first row.
+        """
+
+        def _sample(connection: sqlite3.Connection) -> list[Lemma]:
+            minimum, maximum = connection.execute(
+                'SELECT (SELECT min(sequence) FROM lemma), '
+                '(SELECT max(sequence) FROM lemma)'
+            ).fetchone()
+            if minimum is None:
+                return []
+            sequences: list[int] = []
+            glob_patterns: list[str] = []
+            lemmas: list[Lemma] = []
+            while len(lemmas) < count:
+                query = (
+                    'SELECT sequence, data FROM lemma WHERE sequence >= ? '
+                    f'AND sequence NOT IN ({", ".join("?" * len(sequences))})'
+                    + f' AND {_WORD} GLOB ?' * len(glob_patterns)
+                    + ' ORDER BY sequence LIMIT 1'
+                )
+                parameters = (*sequences, *glob_patterns)
+                row = connection.execute(
+                    query, (random.randint(minimum, maximum), *parameters)
+                ).fetchone()
+                if row is None:
+                    row = connection.execute(query, (minimum, *parameters)).fetchone()
+                if row is None:
+                    break
+                lemma = self._parse(row[1])
+                lemmas.append(lemma)
+                glob_pattern = _sharing_a_letter_glob_pattern(lemma.word)
+                if glob_pattern is None:
+                    break
+                sequences.append(row[0])
+                glob_patterns.append(glob_pattern)
+            return lemmas
+
+        return await self._connection_pool.run(_sample)
+
+    async def find_by_pattern(self, pattern: str, limit: int = 100) -> list[Lemma]:
+        rows = await self._connection_pool.run(
+            lambda connection: connection.execute(
+                'SELECT data FROM lemma INDEXED BY lemma_word_length '
+                f'WHERE length({_WORD}) = ? AND {_WORD} GLOB ? LIMIT ?',
+                (len(pattern), _glob_pattern(pattern), limit),
+            ).fetchall()
+        )
+        return [self._parse(data) for (data,) in rows]
+
+    async def search_text(
+        self, query: str, page_number: int = 1, page_size: int = 20
+    ) -> LemmaTextSearchPage:
+        match_expression = _text_match_expression(query)
+        if match_expression is None:
+            return LemmaTextSearchPage(items=[], total=0)
+
+        def _search(connection: sqlite3.Connection) -> tuple[int, list[str]]:
+            (total,) = connection.execute(
+                'SELECT count(*) FROM lemma_text WHERE lemma_text MATCH ?',
+                (match_expression,),
+            ).fetchone()
+            rows = connection.execute(
+                'SELECT lemma.data FROM lemma_text '
+                'JOIN lemma ON lemma.sequence = lemma_text.rowid '
+                'WHERE lemma_text MATCH ? ORDER BY lemma_text.rank, lemma.uid '
+                'LIMIT ? OFFSET ?',
+                (match_expression, page_size, (page_number - 1) * page_size),
+            ).fetchall()
+            return total, [data for (data,) in rows]
+
+        total, rows = await self._connection_pool.run(_search)
+        return LemmaTextSearchPage(
+            items=[self._parse(data) for data in rows], total=total
+        )
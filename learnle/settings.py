@@ -0,0 +1,59 @@
+from typing import Literal
+
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class ApiSettings(BaseSettings):
+    port: int = Field(alias='API_PORT', default=8000)
+    log_level: str = Field(alias='LOG_LEVEL', default='WARNING')
+    trace_crosswords: bool = Field(alias='TRACE_CROSSWORDS', default=False)
+
+
+class DatabaseSettings(BaseSettings):
+    backend: Literal['memory', 'sqlite'] = Field(
+        alias='DATABASE_BACKEND', default='memory'
+    )
+    sqlite_path: str = Field(alias='SQLITE_PATH', default='learnle.sqlite3')
+    sqlite_pool_size: int = Field(alias='SQLITE_POOL_SIZE', default=4)
+
+
+class CrosswordExecutorSettings(BaseSettings):
+    kind: Literal['process', 'thread'] = Field(
+        alias='CROSSWORD_EXECUTOR', default='process'
+    )
+    max_workers: int | None = Field(alias='CROSSWORD_EXECUTOR_WORKERS', default=None)
+    max_pending: int = Field(alias='CROSSWORD_EXECUTOR_MAX_PENDING', default=32)
+    timeout_seconds: float = Field(alias='CROSSWORD_EXECUTOR_TIMEOUT', default=5.0)
+    batch_concurrency: int = Field(alias='CROSSWORD_BATCH_CONCURRENCY', default=4)
+
+
+class PuzzlePoolSettings(BaseSettings):
+    depth: int = Field(alias='PUZZLE_POOL_DEPTH', default=8)
+    refill_concurrency: int = Field(alias='PUZZLE_POOL_REFILL_CONCURRENCY', default=2)
+    # The maximum width and height of the pools filled at startup, null for the puzzles of any size
+    prefill: list[tuple[int, int] | None] = Field(
+        alias='PUZZLE_POOL_PREFILL', default=[None]
+    )
+
+
+class ResponseCacheSettings(BaseSettings):
+    maximum_size: int = Field(alias='RESPONSE_CACHE_SIZE', default=4096)
+    time_to_live_seconds: float | None = Field(
+        alias='RESPONSE_CACHE_TTL', default=300.0
+    )
+
+
+class DraftCacheSettings(BaseSettings):
+    maximum_size: int = Field(alias='DRAFT_CACHE_SIZE', default=1024)
+    directory: str | None = Field(alias='DRAFT_CACHE_DIRECTORY', default=None)
+
+
+class AnswerKeyCacheSettings(BaseSettings):
+    maximum_size: int = Field(alias='ANSWER_KEY_CACHE_SIZE', default=4096)
+
+
+class ServedPuzzleSettings(BaseSettings):
+    # The answer keys of the served puzzles are only kept in memory, the oldest are dropped first
+    maximum_size: int = Field(alias='SERVED_PUZZLE_ANSWER_KEYS', default=65536)
+    time_to_live_seconds: float = Field(alias='SERVED_PUZZLE_TTL', default=86400.0)
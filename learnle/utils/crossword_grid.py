@@ -1,16 +1,48 @@
+from array import array
+from collections import defaultdict
 from dataclasses import dataclass
 from functools import cached_property
-from typing import Iterable, Generic, TypeVar, OrderedDict, Callable
+from typing import (
+    Iterable,
+    Iterator,
+    Generic,
+    TypeVar,
+    OrderedDict,
+    Callable,
+    Protocol,
+    Sequence,
+)
 
 from learnle.application.model import CrosswordPuzzleLetter
 from learnle.datatypes import Dimensions, Position, Shape, Axis
 
 from learnle.constants import BLOCK_CHARACTER, NEW_LINE
-from learnle.utils import union
+from learnle.utils.metrics import REGISTRY
 
 R = TypeVar('R')
 
 
+class Grid(Protocol[R]):
+    def __init__(self, item_to_text_converter: Callable[[R], str] = str): ...
+
+    def __setitem__(self, position: Position, item: R): ...
+
+    def __getitem__(self, position: Position) -> R: ...
+
+    def __contains__(self, item: Position) -> bool: ...
+
+    @property
+    def items(self) -> Iterable[R]: ...
+
+    @property
+    def dimensions(self) -> Dimensions: ...
+
+    @property
+    def shape(self) -> Shape: ...
+
+    def __len__(self) -> int: ...
+
+
 class InfiniteGrid(Generic[R]):
     def __init__(self, item_to_text_converter: Callable[[R], str] = str):
         self._items = OrderedDict[Position, R]()
@@ -40,13 +72,122 @@ class InfiniteGrid(Generic[R]):
         return self._shape
 
     def __str__(self):
+        shape = self._shape
+        characters = [
+            [BLOCK_CHARACTER] * shape.dimensions.width for _ in shape.vertical_indices
+        ]
+        for position, item in self._items.items():
+            characters[position.y - shape.min_y][position.x - shape.min_x] = (
+                self._item_to_text(item)
+            )
+        return NEW_LINE.join(''.join(line) for line in characters)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return bool(len(self))
+
+
+_INITIAL_DENSE_GRID_SIZE = 16
+
+
+class DenseGrid(Generic[R]):
+    """
+    Grid backed by a flat array of slot indices that is addressed with integer offsets. Items are kept in a dense
+    list in insertion order, the array cell of a position holds the item's index in that list plus one (zero marks an
+    empty cell). Whenever a position falls outside the array, it is reallocated with a bigger size and the current
+    shape is re-centered in it.
+    """
+
+    def __init__(self, item_to_text_converter: Callable[[R], str] = str):
+        self._items: list[R] = []
+        self._shape = Shape()
+        self._item_to_text = item_to_text_converter
+        self._width = _INITIAL_DENSE_GRID_SIZE
+        self._height = _INITIAL_DENSE_GRID_SIZE
+        self._offset_x = _INITIAL_DENSE_GRID_SIZE // 2
+        self._offset_y = _INITIAL_DENSE_GRID_SIZE // 2
+        self._slots = array('l', [0]) * (self._width * self._height)
+
+    def _index(self, x: int, y: int) -> int:
+        column = x + self._offset_x
+        row = y + self._offset_y
+        if 0 <= column < self._width and 0 <= row < self._height:
+            return row * self._width + column
+        return -1
+
+    def _grow(self, position: Position):
+        new_shape = self._shape.with_new_positions(position)
+        new_dimensions = new_shape.dimensions
+        width = max(self._width, new_dimensions.width) * 2
+        height = max(self._height, new_dimensions.height) * 2
+        offset_x = (width - new_dimensions.width) // 2 - new_shape.min_x
+        offset_y = (height - new_dimensions.height) // 2 - new_shape.min_y
+        slots = array('l', [0]) * (width * height)
+        shape = self._shape
+        row_length = shape.max_x - shape.min_x + 1
+        for y in shape.vertical_indices:
+            old_start = (
+                (y + self._offset_y) * self._width + shape.min_x + self._offset_x
+            )
+            new_start = (y + offset_y) * width + shape.min_x + offset_x
+            slots[new_start : new_start + row_length] = self._slots[
+                old_start : old_start + row_length
+            ]
+        self._slots = slots
+        self._width, self._height = width, height
+        self._offset_x, self._offset_y = offset_x, offset_y
+
+    def __setitem__(self, position: Position, item: R):
+        index = self._index(position.x, position.y)
+        if index < 0:
+            self._grow(position)
+            index = self._index(position.x, position.y)
+        slot = self._slots[index]
+        if slot:
+            self._items[slot - 1] = item
+        else:
+            self._items.append(item)
+            self._slots[index] = len(self._items)
+        self._shape.update_shape_with_new_position(position)
+
+    def __getitem__(self, position: Position) -> R:
+        index = self._index(position.x, position.y)
+        slot = self._slots[index] if index >= 0 else 0
+        if not slot:
+            raise KeyError(position)
+        return self._items[slot - 1]
+
+    def __contains__(self, item: Position) -> bool:
+        index = self._index(item.x, item.y)
+        return index >= 0 and self._slots[index] > 0
+
+    @property
+    def items(self) -> Iterable[R]:
+        return self._items
+
+    @property
+    def dimensions(self) -> Dimensions:
+        return self._shape.dimensions
+
+    @property
+    def shape(self):
+        return self._shape
+
+    def __str__(self):
+        items, slots, to_text = self._items, self._slots, self._item_to_text
+        width = self._shape.dimensions.width
         lines = []
         for y in self._shape.vertical_indices:
-            line = ''
-            for x in self._shape.horizontal_indices:
-                item = self._items.get(Position(x, y))
-                line += self._item_to_text(item) if item else BLOCK_CHARACTER
-            lines.append(line)
+            start = self._index(self._shape.min_x, y)
+            row = slots[start : start + width]
+            lines.append(
+                ''.join(
+                    to_text(items[slot - 1]) if slot else BLOCK_CHARACTER
+                    for slot in row
+                )
+            )
         return NEW_LINE.join(lines)
 
     def __len__(self):
@@ -59,15 +200,116 @@ class InfiniteGrid(Generic[R]):
 _START_POSITION = Position(0, 0)
 
 
-@dataclass
+def _line_coordinates(position: Position, axis: Axis) -> tuple[int, int]:
+    """
+    :return: The index of the line running along the axis through the position and the index of the position
+    within that line
+    """
+    return (
+        (position.y, position.x)
+        if axis == Axis.HORIZONTAL
+        else (position.x, position.y)
+    )
+
+
+def _set_bit_indices(mask: int) -> Iterable[int]:
+    while mask:
+        lowest_bit = mask & -mask
+        yield lowest_bit.bit_length() - 1
+        mask ^= lowest_bit
+
+
+class _LineMasks:
+    """
+    Bitmasks of the parallel lines of a grid. Bit i of a line's mask represents the cell at index i - bias of the
+    line, the bias grows whenever a cell with a negative index has to be represented.
+    """
+
+    def __init__(self):
+        self._masks: dict[int, int] = {}
+        self._bias = 0
+
+    def set(self, line: int, index: int):
+        bit = index + self._bias
+        if bit < 0:
+            self._rebase(-bit)
+            bit = index + self._bias
+        self._masks[line] = self._masks.get(line, 0) | (1 << bit)
+
+    def clear(self, line: int, index: int):
+        bit = index + self._bias
+        if bit >= 0 and line in self._masks:
+            self._masks[line] &= ~(1 << bit)
+
+    def span(self, line: int, start: int, length: int) -> int:
+        """
+        :return: The bits of the cells start...start + length - 1 of the line, shifted down to bit 0
+        """
+        mask = self._masks.get(line, 0)
+        bit = start + self._bias
+        mask = mask >> bit if bit >= 0 else mask << -bit
+        return mask & ((1 << length) - 1)
+
+    def _rebase(self, shift: int):
+        shift += _INITIAL_DENSE_GRID_SIZE
+        self._bias += shift
+        self._masks = {line: mask << shift for line, mask in self._masks.items()}
+
+
+class _OccupancyMasks:
+    """
+    Row and column bitmasks of the occupied cells of a grid. For both axes, the lines running along the axis keep a
+    mask of all occupied cells and a mask of the cells that belong to a word running across the axis.
+    """
+
+    def __init__(self):
+        self._occupied = {axis: _LineMasks() for axis in Axis}
+        self._crossing = {axis: _LineMasks() for axis in Axis}
+
+    def add(self, position: Position, axis: Axis):
+        for line_axis in Axis:
+            line, index = _line_coordinates(position, line_axis)
+            self._occupied[line_axis].set(line, index)
+            if axis == line_axis:
+                self._crossing[line_axis].clear(line, index)
+            else:
+                self._crossing[line_axis].set(line, index)
+
+    def occupied(self, axis: Axis, line: int, start: int, length: int) -> int:
+        return self._occupied[axis].span(line, start, length)
+
+    def crossing(self, axis: Axis, line: int, start: int, length: int) -> int:
+        return self._crossing[axis].span(line, start, length)
+
+
+@dataclass(frozen=True, slots=True)
+class GridLetter:
+    """
+    A letter placed into the grid. The grid works with these plain values, and they are only converted to the models of
+    the API once a draft is assembled.
+    """
+
+    character: str
+    position: Position
+
+    def to_model(self) -> CrosswordPuzzleLetter:
+        # The values were created by the grid, so they need no validation
+        return CrosswordPuzzleLetter.model_construct(
+            character=self.character, position=self.position
+        )
+
+
+@dataclass(slots=True)
 class _CrosswordCell:
-    letter: CrosswordPuzzleLetter
+    character: str
+    position: Position
     axis: Axis
     is_intersected: bool = False
 
-    @property
-    def position(self):
-        return self.letter.position
+    def copy(self) -> '_CrosswordCell':
+        return _CrosswordCell(
+            self.character, self.position, self.axis, self.is_intersected
+        )
 
     def mark_intersected(self):
         self.is_intersected = True
@@ -79,83 +321,75 @@ class _Insertion:
     start_position: Position
     end_position: Position
     axis: Axis
-    grid: InfiniteGrid[_CrosswordCell]
+    grid: Grid[_CrosswordCell]
+    occupancy: _OccupancyMasks
     maximum_dimensions: Dimensions | None
 
     @cached_property
-    def letters(self) -> list[CrosswordPuzzleLetter]:
+    def letters(self) -> list[GridLetter]:
         return [
-            CrosswordPuzzleLetter(character=char, position=letter_position)
+            GridLetter(char, letter_position)
             for letter_position, char in zip(
                 self.start_position.to(self.end_position), self.word
             )
         ]
 
-    @cached_property
-    def cells_by_position(self) -> dict[Position, _CrosswordCell]:
-        return {
-            letter.position: _CrosswordCell(letter, self.axis)
-            for letter in self.letters
-        }
-
     @cached_property
     def cells(self) -> Iterable[_CrosswordCell]:
-        return self.cells_by_position.values()
+        return [
+            _CrosswordCell(letter.character, letter.position, self.axis)
+            for letter in self.letters
+        ]
 
     @cached_property
-    def adjacent_positions(self) -> set[Position]:
-        return {
-            position
-            for position in union(
-                [
-                    letter.position.adjacent_positions_on_axis(self.axis.rotate())
-                    for letter in self.cells
-                ]
-                + [
-                    {
-                        self.start_position.prev_by_axis(self.axis),
-                        self.end_position.next_by_axis(self.axis),
-                    }
-                ]
-            )
-            if position in self.grid
-        }
+    def _line_coordinates(self) -> tuple[int, int]:
+        return _line_coordinates(self.start_position, self.axis)
 
     @cached_property
-    def intersecting_positions(self) -> set[Position]:
-        return {cell.position for cell in self.cells if cell.position in self.grid}
+    def intersecting_mask(self) -> int:
+        line, start = self._line_coordinates
+        return self.occupancy.occupied(self.axis, line, start, len(self.word))
 
     @cached_property
-    def incorrect_intersecting_positions(self) -> set[Position]:
-        return {
-            intersecting_position
-            for intersecting_position in self.intersecting_positions
-            if self.cells_by_position[intersecting_position].letter
-            != self.grid[intersecting_position].letter
-        }
+    def intersecting_positions(self) -> list[Position]:
+        unit_position = self.axis.unit_position()
+        return [
+            self.start_position.shift(unit_position.x * index, unit_position.y * index)
+            for index in _set_bit_indices(self.intersecting_mask)
+        ]
 
     @cached_property
     def has_incorrect_intersections(self) -> bool:
-        return bool(self.incorrect_intersecting_positions)
-
-    @cached_property
-    def allowed_touching_positions(self) -> set[Position]:
-        return {
-            allowed_touching_position
-            for allowed_touching_position in union(
-                [
-                    intersecting_position.adjacent_positions_on_axis(
-                        self.grid[intersecting_position].axis
-                    )
-                    for intersecting_position in self.intersecting_positions
-                ]
+        return any(
+            self.grid[position].character != self.word[index]
+            for index, position in zip(
+                _set_bit_indices(self.intersecting_mask), self.intersecting_positions
             )
-            if allowed_touching_position in self.grid
-        }
+        )
 
     @cached_property
     def has_not_allowed_touching_positions(self) -> bool:
-        return bool(self.adjacent_positions - self.allowed_touching_positions)
+        """
+        Cells next to the word are only allowed to be taken where the word crosses another one, and before or after
+        the word only if the word overlaps with a word running along the same axis there.
+        """
+        line, start = self._line_coordinates
+        length = len(self.word)
+        crossing_mask = self.occupancy.crossing(self.axis, line, start, length)
+        touching_mask = self.occupancy.occupied(
+            self.axis, line - 1, start, length
+        ) | self.occupancy.occupied(self.axis, line + 1, start, length)
+        if touching_mask & ~crossing_mask:
+            return True
+        parallel_mask = self.intersecting_mask & ~crossing_mask
+        if self.occupancy.occupied(self.axis, line, start - 1, 1) and not (
+            parallel_mask & 1
+        ):
+            return True
+        return bool(
+            self.occupancy.occupied(self.axis, line, start + length, 1)
+            and not (parallel_mask >> (length - 1)) & 1
+        )
 
     @cached_property
     def exceeds_maximum_dimensions(self) -> bool:
@@ -167,32 +401,152 @@ class _Insertion:
         return False
 
 
+CANDIDATE_INSERTIONS = REGISTRY.counter(
+    'learnle_crossword_candidate_insertions',
+    'Placements of words checked against the grid, by the outcome of the checks',
+    ('outcome',),
+)
+
+
+def _record_candidate_insertions(
+    tried: int, exceeding: int, touching: int, incorrect: int
+):
+    for outcome, count in (
+        ('valid', tried - exceeding - touching - incorrect),
+        ('exceeds_maximum_dimensions', exceeding),
+        ('touches_other_words', touching),
+        ('incorrect_intersection', incorrect),
+    ):
+        if count:
+            CANDIDATE_INSERTIONS.inc(outcome, amount=count)
+
+
 class UnpackedCrosswordGrid:
     """
     Represents a crossword grid that can scale infinitely in every dimension, limited by the specified maximum
     dimensions. This grid is therefore unpacked, it does not represent a ready crossword puzzle.
     """
 
-    def __init__(self, maximum_dimensions: Dimensions | None = None):
+    def __init__(
+        self,
+        maximum_dimensions: Dimensions | None = None,
+        grid_class: type[Grid] = DenseGrid,
+    ):
         """
         Creates an empty unpacked crossword grid. By default, there is no maximum width and height specified,
         the grid can grow infinitely in every dimension.
         :param maximum_dimensions: the maximum width and height of the grid.
+        :param grid_class: the grid backend storing the cells, DenseGrid by default.
         """
-        self._grid = InfiniteGrid[_CrosswordCell](
-            item_to_text_converter=lambda x: x.letter.character.capitalize()
+        self._grid: Grid[_CrosswordCell] = grid_class(
+            item_to_text_converter=lambda x: x.character.capitalize()
         )
+        self._grid_class = grid_class
+        self._occupancy = _OccupancyMasks()
+        self._open_cells_by_character: dict[
+            str, dict[Position, tuple[int, _CrosswordCell]]
+        ] = defaultdict(dict)
         self._maximum_dimensions = maximum_dimensions
 
-    def add_word(self, word: str) -> list[CrosswordPuzzleLetter]:
+    @classmethod
+    def from_words(
+        cls,
+        words: Iterable[Sequence[GridLetter]],
+        maximum_dimensions: Dimensions | None = None,
+        grid_class: type[Grid] = DenseGrid,
+    ) -> 'UnpackedCrosswordGrid':
+        """
+        Rebuilds the grid of an existing crossword by placing its words in the order they were inserted, so the
+        cells, their axes and the intersections are the same as in the grid the crossword was created with.
+        :param words: The letters of each word, in the coordinates of the grid
+        :param maximum_dimensions: the maximum width and height of the grid for the words added later.
+        :param grid_class: the grid backend storing the cells, DenseGrid by default.
+        :return: The grid with the words
+        """
+        grid = cls(maximum_dimensions, grid_class)
+        for letters in words:
+            grid.place_word(letters)
+        return grid
+
+    def add_word(self, word: str) -> list[GridLetter]:
         """
         Attempts to fit a new word into the grid.
         :param word: The string that you want to insert into the grid
         :return: True, if the word was successfully inserted, False otherwise
         """
+        for insertion in self.valid_insertions(word):
+            return self.insert(insertion)
+        return []
+
+    def valid_insertions(self, word: str) -> Iterator['_Insertion']:
+        """
+        Lists the placements of a word that fit into the grid, in the order add_word tries them. The grid must not be
+        modified while the placements are being iterated.
+        :param word: The string that you want to insert into the grid
+        :return: An iterator of insertions that can be passed to insert
+        """
         if not self._grid:
-            return self._fit_first_word(word, Axis.HORIZONTAL)
-        return self._fit_additional_word(word)
+            insertion = self._first_insertion(word, Axis.HORIZONTAL)
+            if not insertion.exceeds_maximum_dimensions:
+                yield insertion
+            return
+        # Counted locally and recorded once, as the checks run for every candidate
+        tried = exceeding = touching = incorrect = 0
+        try:
+            for possible_insertion in self._possible_insertions(word):
+                tried += 1
+                if possible_insertion.exceeds_maximum_dimensions:
+                    exceeding += 1
+                elif possible_insertion.has_not_allowed_touching_positions:
+                    touching += 1
+                elif possible_insertion.has_incorrect_intersections:
+                    incorrect += 1
+                else:
+                    yield possible_insertion
+        finally:
+            _record_candidate_insertions(tried, exceeding, touching, incorrect)
+
+    def insert(self, insertion: '_Insertion') -> list[GridLetter]:
+        """
+        Inserts a word at a placement returned by valid_insertions of this grid or of a copy with the same state.
+        :param insertion: The placement of the word
+        :return: The letters of the inserted word
+        """
+        self._place(insertion.cells, insertion.intersecting_positions)
+        return insertion.letters
+
+    def place_word(self, letters: Sequence[GridLetter]):
+        """
+        Places a word at the positions of its letters, only checking that they form a line and agree with the letters
+        already in the grid, and not the rules that add_word follows.
+        :param letters: The letters of the word
+        :raises ValueError: If the letters cannot be placed
+        """
+        axis = self._axis_of(letters)
+        intersecting_positions = []
+        for letter in letters:
+            if letter.position in self._grid:
+                if self._grid[letter.position].character != letter.character:
+                    raise ValueError(
+                        f'Conflicting letters at ({letter.position.x}, {letter.position.y})'
+                    )
+                intersecting_positions.append(letter.position)
+        self._place(
+            [
+                _CrosswordCell(letter.character, letter.position, axis)
+                for letter in letters
+            ],
+            intersecting_positions,
+        )
+
+    def copy(self) -> 'UnpackedCrosswordGrid':
+        """
+        Creates an independent copy of the grid by replaying its cells into an empty grid.
+        :return: The copy of the grid
+        """
+        grid_copy = UnpackedCrosswordGrid(self._maximum_dimensions, self._grid_class)
+        grid_copy._add_letters(cell.copy() for cell in self._grid.items)
+        return grid_copy
 
     def text_view(self) -> str:
         """
@@ -216,6 +570,13 @@ class UnpackedCrosswordGrid:
         """
         return self._grid.shape
 
+    @property
+    def grid_class(self) -> type[Grid]:
+        """
+        :return: The grid backend used for storing the cells
+        """
+        return self._grid_class
+
     @property
     def cells(self) -> Iterable[_CrosswordCell]:
         """
@@ -223,17 +584,80 @@ class UnpackedCrosswordGrid:
         """
         return self._grid.items
 
+    def __len__(self):
+        return len(self._grid)
+
+    def _place(
+        self, cells: Iterable[_CrosswordCell], intersecting_positions: list[Position]
+    ):
+        self._add_letters(cells)
+        for intersecting_position in intersecting_positions:
+            self._mark_intersected(intersecting_position)
+
+    def _axis_of(self, letters: Sequence[GridLetter]) -> Axis:
+        """
+        :return: The axis of the word, a one letter word runs across the word it is placed on
+        """
+        if not letters:
+            raise ValueError('A word must have at least one letter')
+        start, end = letters[0].position, letters[-1].position
+        if len(letters) == 1:
+            return (
+                self._grid[start].axis.rotate()
+                if start in self._grid
+                else Axis.HORIZONTAL
+            )
+        if [letter.position for letter in letters] != list(start.to(end)):
+            raise ValueError('The letters of a word must follow each other in a line')
+        return Axis.HORIZONTAL if start.y == end.y else Axis.VERTICAL
+
     def _add_letters(self, letters: Iterable[_CrosswordCell]):
         for letter in letters:
-            self._grid[letter.position] = letter
+            position = letter.position
+            order: int | None = len(self._grid)
+            if position in self._grid:
+                order = self._close_cell(self._grid[position])
+            self._grid[position] = letter
+            self._occupancy.add(position, letter.axis)
+            if order is not None and not letter.is_intersected:
+                self._open_cells_by_character[letter.character][position] = (
+                    order,
+                    letter,
+                )
+
+    def _close_cell(self, cell: _CrosswordCell) -> int | None:
+        """
+        Removes the cell from the index of cells that new words can intersect.
+        :return: The insertion order of the cell, None if it was not in the index
+        """
+        open_cell = self._open_cells_by_character[cell.character].pop(
+            cell.position, None
+        )
+        return open_cell[0] if open_cell else None
+
+    def _mark_intersected(self, position: Position):
+        cell = self._grid[position]
+        cell.mark_intersected()
+        self._close_cell(cell)
+
+    def _open_cells(self, word: str) -> list[_CrosswordCell]:
+        """
+        :return: The cells that the word could intersect in the order they were added to the grid
+        """
+        open_cells = [
+            open_cell
+            for character in set(word)
+            if character in self._open_cells_by_character
+            for open_cell in self._open_cells_by_character[character].values()
+        ]
+        open_cells.sort(key=lambda open_cell: open_cell[0])
+        return [cell for _, cell in open_cells]
 
     def _possible_insertions(self, word: str):
-        for cell in self._grid.items:
-            if cell.is_intersected or cell.letter.character not in word:
-                continue
+        for cell in self._open_cells(word):
             insertion_axis = cell.axis.rotate()
             for char_index, char in enumerate(word):
-                if char == cell.letter.character:
+                if char == cell.character:
                     start_pos, end_pos = cell.position.line(
                         len(word), insertion_axis, offset=char_index
                     )
@@ -243,42 +667,21 @@ class UnpackedCrosswordGrid:
                         end_position=end_pos,
                         axis=insertion_axis,
                         grid=self._grid,
+                        occupancy=self._occupancy,
                         maximum_dimensions=self._maximum_dimensions,
                     )
 
-    def _fit_first_word(
-        self, word: str, starting_axis: Axis
-    ) -> list[CrosswordPuzzleLetter]:
+    def _first_insertion(self, word: str, starting_axis: Axis) -> _Insertion:
         start_position, end_position = _START_POSITION.line(len(word), starting_axis)
-        insertion = _Insertion(
+        return _Insertion(
             word=word,
             start_position=start_position,
             end_position=end_position,
             axis=starting_axis,
             grid=self._grid,
+            occupancy=self._occupancy,
             maximum_dimensions=self._maximum_dimensions,
         )
-        if insertion.exceeds_maximum_dimensions:
-            return []
-        self._add_letters(insertion.cells)
-        return insertion.letters
-
-    def _fit_additional_word(self, word: str) -> list[CrosswordPuzzleLetter]:
-        for possible_insertion in self._possible_insertions(word):
-            if any(
-                [
-                    possible_insertion.exceeds_maximum_dimensions,
-                    possible_insertion.has_incorrect_intersections,
-                    possible_insertion.has_not_allowed_touching_positions,
-                ]
-            ):
-                continue
-
-            self._add_letters(possible_insertion.cells)
-            for intersecting_letter in possible_insertion.intersecting_positions:
-                self._grid[intersecting_letter].mark_intersected()
-            return possible_insertion.letters
-        return []
 
     def pack(self) -> 'PackedCrosswordGrid':
         return PackedCrosswordGrid(self)
@@ -286,7 +689,7 @@ class UnpackedCrosswordGrid:
 
 class PackedCrosswordGrid:
     def __init__(self, infinite_grid: UnpackedCrosswordGrid):
-        self._grid = InfiniteGrid[CrosswordPuzzleLetter](
+        self._grid: Grid[GridLetter] = infinite_grid.grid_class(
             item_to_text_converter=lambda x: x.character.capitalize()
         )
 
@@ -297,12 +700,10 @@ class PackedCrosswordGrid:
 
         for cell in infinite_grid.cells:
             packed_position = cell.position.shift(offset_x, offset_y)
-            self._grid[packed_position] = CrosswordPuzzleLetter(
-                character=cell.letter.character, position=packed_position
-            )
+            self._grid[packed_position] = GridLetter(cell.character, packed_position)
 
     def letters(self) -> Iterable[CrosswordPuzzleLetter]:
-        return self._grid.items
+        return (letter.to_model() for letter in self._grid.items)
 
     def dimensions(self) -> Dimensions:
         return self._grid.dimensions
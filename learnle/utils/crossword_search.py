@@ -0,0 +1,132 @@
+from dataclasses import dataclass
+from itertools import islice
+from time import monotonic
+
+from learnle.datatypes import Dimensions
+from learnle.utils.crossword_grid import GridLetter, UnpackedCrosswordGrid
+
+
+@dataclass(frozen=True)
+class SearchBudget:
+    """
+    Limits of the layout search. Every inserted word counts as a node, so the node budget makes the cut-off
+    deterministic. The optional wall-clock budget is a safety net on top of it.
+    """
+
+    max_nodes: int = 1000
+    max_seconds: float | None = None
+    max_branching: int = 8
+
+
+@dataclass(frozen=True)
+class CrosswordLayout:
+    grid: UnpackedCrosswordGrid
+    letters_by_word: dict[str, list[GridLetter]]
+
+    @property
+    def word_count(self) -> int:
+        return len(self.letters_by_word)
+
+    @property
+    def density(self) -> float:
+        dimensions = self.grid.dimensions
+        return len(self.grid) / (dimensions.width * dimensions.height)
+
+    @property
+    def score(self) -> tuple[int, float]:
+        return self.word_count, self.density
+
+
+class _LayoutSearch:
+    def __init__(
+        self,
+        words: list[str],
+        maximum_dimensions: Dimensions | None,
+        budget: SearchBudget,
+    ):
+        self._words = words
+        self._maximum_dimensions = maximum_dimensions
+        self._budget = budget
+        self._nodes = 0
+        self._deadline = (
+            monotonic() + budget.max_seconds if budget.max_seconds is not None else None
+        )
+        self._best: CrosswordLayout | None = None
+
+    def run(self) -> CrosswordLayout:
+        self._visit(UnpackedCrosswordGrid(self._maximum_dimensions), {}, 0)
+        assert self._best is not None
+        return self._best
+
+    def _exhausted(self) -> bool:
+        return self._nodes >= self._budget.max_nodes or (
+            self._deadline is not None and monotonic() >= self._deadline
+        )
+
+    def _record(self, layout: CrosswordLayout):
+        if self._best is None or layout.score > self._best.score:
+            self._best = layout
+
+    def _complete_greedily(
+        self,
+        grid: UnpackedCrosswordGrid,
+        letters_by_word: dict[str, list[GridLetter]],
+        word_index: int,
+    ) -> CrosswordLayout:
+        grid = grid.copy()
+        letters_by_word = dict(letters_by_word)
+        for word in self._words[word_index:]:
+            if letters := grid.add_word(word):
+                letters_by_word[word] = letters
+        return CrosswordLayout(grid, letters_by_word)
+
+    def _visit(
+        self,
+        grid: UnpackedCrosswordGrid,
+        letters_by_word: dict[str, list[GridLetter]],
+        word_index: int,
+    ):
+        remaining_words = len(self._words) - word_index
+        if (
+            self._best
+            and len(letters_by_word) + remaining_words < self._best.word_count
+        ):
+            return
+        if not remaining_words:
+            self._record(CrosswordLayout(grid, letters_by_word))
+            return
+        if self._exhausted():
+            if self._best is None:
+                self._record(self._complete_greedily(grid, letters_by_word, word_index))
+            return
+
+        word = self._words[word_index]
+        for insertion in islice(
+            grid.valid_insertions(word), self._budget.max_branching
+        ):
+            # Only the frames that are already on the stack are left once the budget runs out
+            if self._exhausted():
+                break
+            self._nodes += 1
+            child_grid = grid.copy()
+            letters = child_grid.insert(insertion)
+            self._visit(child_grid, {**letters_by_word, word: letters}, word_index + 1)
+        self._visit(grid, letters_by_word, word_index + 1)
+
+
+def search_layout(
+    words: list[str],
+    maximum_dimensions: Dimensions | None = None,
+    budget: SearchBudget = SearchBudget(),
+) -> CrosswordLayout:
+    """
+    Searches for the layout that contains the most words, and among those the densest one. The words are tried in
+    the given order with depth-first backtracking over their alternative placements, the first branch explored is
+    the layout that UnpackedCrosswordGrid.add_word would build. When the budget runs out, the best layout found so
+    far is returned.
+    :param words: The words to insert, in the order of preference
+    :param maximum_dimensions: The maximum width and height of the layout
+    :param budget: The limits of the search
+    :return: The best layout found
+    """
+    return _LayoutSearch(words, maximum_dimensions, budget).run()
@@ -0,0 +1,150 @@
+from typing import AsyncIterator, Callable, Collection, Type
+
+from fastapi import (
+    APIRouter,
+    HTTPException,
+    Depends,
+    Header,
+    Query,
+    Response,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, PositiveInt, Field
+
+from learnle.utils.crud_operation import (
+    CRUDAdapter,
+    InvalidCursorError,
+    RESERVED_UIDS,
+    T,
+)
+
+
+class _DeleteResponse(BaseModel):
+    message: str = Field(
+        default='DELETED',
+        json_schema_extra={
+            'const': 'DELETED',
+        },
+    )
+
+
+async def _ndjson_lines(items: AsyncIterator[BaseModel]) -> AsyncIterator[str]:
+    async for item in items:
+        yield item.model_dump_json() + '\n'
+
+
+def crud_api(
+    adapter_factory: Callable[..., CRUDAdapter[T]],
+    model_class: Type[T],
+    reserved_uids: Collection[str] = RESERVED_UIDS,
+) -> APIRouter:
+    """
+    :param reserved_uids: The uids that the save endpoint rejects, because the fixed paths of the routers under the
+        same prefix take precedence over the read endpoint of an item with such a uid
+    """
+    model_name = model_class.__name__
+    api_router = APIRouter(prefix=f'/{model_name.lower()}')
+
+    @api_router.get(
+        path='/export',
+        description=f'Streams every {model_name} object as NDJSON, one JSON object per line',
+        summary=f'Export {model_name} objects',
+        tags=[model_name],
+        response_class=StreamingResponse,
+        responses={
+            200: {
+                'content': {'application/x-ndjson': {}},
+                'description': f'One {model_name} per line',
+            }
+        },
+    )
+    async def _(
+        adapter: CRUDAdapter[model_class] = Depends(adapter_factory),  # type: ignore[valid-type]
+    ) -> StreamingResponse:
+        return StreamingResponse(
+            _ndjson_lines(adapter.iterate()), media_type='application/x-ndjson'
+        )
+
+    @api_router.get(
+        path='/{uid}',
+        response_model=model_class,
+        description=f'Read endpoint for {model_name} objects. '
+        'The response carries an ETag, and a matching If-None-Match header gets a 304 response.',
+        summary=f'Read {model_name}',
+        tags=[model_name],
+        responses={304: {'description': 'Not Modified'}},
+    )
+    async def _(
+        uid: str,
+        if_none_match: str | None = Header(default=None),
+        adapter: CRUDAdapter[model_class] = Depends(adapter_factory),  # type: ignore[valid-type]
+    ) -> Response:
+        serialized_item = await adapter.get_serialized(uid)
+        if serialized_item is None:
+            raise HTTPException(status_code=404)
+        headers = {'ETag': serialized_item.etag}
+        if serialized_item.matches(if_none_match):
+            return Response(status_code=304, headers=headers)
+        return Response(
+            serialized_item.body, media_type='application/json', headers=headers
+        )
+
+    @api_router.get(
+        path='',
+        description=f'List endpoint for {model_name} objects',
+        summary=f'List {model_name} objects',
+        tags=[model_name],
+        responses={400: {'description': 'Invalid cursor'}},
+    )
+    async def _(
+        response: Response,
+        page_number: PositiveInt = 1,
+        page_size: PositiveInt = 20,
+        cursor: str | None = Query(
+            default=None,
+            description='Lists the items in a stable order instead of by page number. An empty cursor asks for the '
+            'first page, the cursor of the next page is returned in the X-Next-Cursor header.',
+        ),
+        adapter: CRUDAdapter[model_class] = Depends(adapter_factory),  # type: ignore[valid-type]
+    ) -> list[model_class]:  # type: ignore[valid-type]
+        if cursor is None:
+            return await adapter.list(page_number, page_size)
+        try:
+            page = await adapter.list_page(cursor, page_size)
+        except InvalidCursorError:
+            raise HTTPException(status_code=400, detail='Invalid cursor')
+        if page.next_cursor is not None:
+            response.headers['X-Next-Cursor'] = page.next_cursor
+        return page.items
+
+    @api_router.post(
+        path='',
+        response_model=model_class,
+        description=f'Save endpoint for {model_name} objects',
+        summary=f'Save {model_name} objects',
+        tags=[model_name],
+        responses={400: {'description': 'Reserved uid'}},
+    )
+    async def _(
+        item: model_class,  # type: ignore[valid-type]
+        adapter: CRUDAdapter[model_class] = Depends(adapter_factory),  # type: ignore[valid-type]
+    ) -> model_class:  # type: ignore[valid-type]
+        uid = getattr(item, 'uid', None)
+        if uid in reserved_uids:
+            raise HTTPException(status_code=400, detail=f'The uid {uid} is reserved')
+        return await adapter.save(item)
+
+    @api_router.delete(
+        path='/{uid}',
+        description=f'Delete endpoint for {model_name} objects',
+        summary=f'Delete {model_name}',
+        tags=[model_name],
+    )
+    async def _(
+        uid: str,
+        adapter: CRUDAdapter[model_class] = Depends(adapter_factory),  # type: ignore[valid-type]
+    ) -> _DeleteResponse:
+        await adapter.delete(uid)
+        return _DeleteResponse()
+
+    return api_router
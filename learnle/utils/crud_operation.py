@@ -1,49 +1,274 @@
+import random
 from abc import ABC, abstractmethod
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from bisect import bisect_left
+from itertools import islice
 from typing import (
     Generic,
     TypeVar,
-    OrderedDict,
-    Type,
     Callable,
+    MutableMapping,
+    Sequence,
+    AsyncIterator,
+    Iterator,
 )
 
-from fastapi import (
-    APIRouter,
-    HTTPException,
-    Depends,
-)
-from pydantic import BaseModel, PositiveInt, Field
+from pydantic import BaseModel
+
+from learnle.utils.metrics import REGISTRY, timed
+from learnle.utils.response_cache import SerializedCache, SerializedItem
 
 
 T = TypeVar('T', bound=BaseModel)
+V = TypeVar('V')
+
+EXPORT_PAGE_SIZE = 500
+
+# The uids of the fixed paths of the CRUD routers, which take precedence over the read endpoint of an item
+RESERVED_UIDS = frozenset({'export'})
+
+ADAPTER_OPERATION_SECONDS = REGISTRY.histogram(
+    'learnle_adapter_operation_seconds',
+    'Duration of the database adapter operations',
+    ('adapter', 'operation'),
+)
 
 
 class CRUDAdapter(ABC, Generic[T]):
+    _serialized_cache: SerializedCache | None = None
+
+    def use_serialized_cache(self, cache: SerializedCache):
+        """
+        Caches the JSON of the items read by get_serialized. The adapters invalidate the cached items when they are
+        saved or deleted.
+        """
+        self._serialized_cache = cache
+
+    def _invalidate(self, uid: str):
+        if self._serialized_cache is not None:
+            self._serialized_cache.invalidate(uid)
+
     @abstractmethod
     async def save(self, item: T) -> T:
         raise NotImplementedError
 
+    async def save_many(self, items: Sequence[T]) -> int:
+        """
+        Saves a batch of items. Adapters override it to write the whole batch at once.
+        :param items: The items to save
+        :return: The number of items saved
+        """
+        for item in items:
+            await self.save(item)
+        return len(items)
+
     @abstractmethod
     async def list(self, page_number: int, page_size: int) -> list[T]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def list_page(self, cursor: str | None, page_size: int) -> 'Page[T]':
+        """
+        Lists the items in a stable order page by page.
+        :param cursor: The next_cursor of the previous page, None for the first page
+        :param page_size: The maximum number of items on the page
+        :return: The items of the page and the cursor of the next page
+        """
+        raise NotImplementedError
+
+    async def iterate(self, page_size: int = EXPORT_PAGE_SIZE) -> AsyncIterator[T]:
+        """
+        Iterates over all the items page by page, so only one page is kept in memory.
+        :param page_size: The number of items fetched at once
+        """
+        cursor = None
+        while True:
+            page = await self.list_page(cursor, page_size)
+            for item in page.items:
+                yield item
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+
     @abstractmethod
     async def get_by_uid(self, uid: str) -> T | None:
         raise NotImplementedError
 
+    async def get_serialized(self, uid: str) -> SerializedItem | None:
+        """
+        :return: The JSON of the item and its ETag, None if the item does not exist
+        """
+        cache = self._serialized_cache
+        if cache is None:
+            item = await self.get_by_uid(uid)
+            return SerializedItem.of(item.model_dump_json().encode()) if item else None
+        serialized_item = cache.get(uid)
+        if serialized_item is None:
+            version = cache.version
+            item = await self.get_by_uid(uid)
+            if item is None:
+                return None
+            serialized_item = SerializedItem.of(item.model_dump_json().encode())
+            cache.put(uid, version, serialized_item)
+        return serialized_item
+
     @abstractmethod
     async def delete(self, uid: str):
         raise NotImplementedError
 
 
-def _paginate(items: list[T], page_number: int, page_size: int) -> list[T]:
-    offset = (page_number - 1) * page_size
-    return items[offset : offset + page_size]
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+
+
+class InvalidCursorError(Exception):
+    pass
+
+
+def encode_cursor(sequence: int) -> str:
+    return urlsafe_b64encode(sequence.to_bytes(8, 'big')).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        sequence_bytes = urlsafe_b64decode(cursor.encode())
+    except (BinasciiError, ValueError):
+        raise InvalidCursorError(cursor)
+    if len(sequence_bytes) != 8:
+        raise InvalidCursorError(cursor)
+    return int.from_bytes(sequence_bytes, 'big')
+
+
+_MAXIMUM_SAMPLING_ATTEMPTS_PER_ITEM = 32
+
+
+class IndexedDict(MutableMapping[str, V]):
+    """
+    Insertion ordered dictionary with two extra indices of its keys:
+    - A dense list, so random items can be picked without copying the values. Deleting a key moves the last key of
+      the list into its place.
+    - An append-only log of the keys with increasing sequence numbers, so iteration can be resumed after a key with a
+      binary search. Deleted keys leave a gap in the log, which is compacted once half of it are gaps.
+    """
+
+    def __init__(self):
+        self._items: dict[str, V] = {}
+        self._keys: list[str] = []
+        self._key_indices: dict[str, int] = {}
+        self._key_sequences: dict[str, int] = {}
+        self._logged_sequences: list[int] = []
+        self._logged_keys: list[str | None] = []
+        self._next_sequence = 0
+
+    def __getitem__(self, key: str) -> V:
+        return self._items[key]
+
+    def __setitem__(self, key: str, value: V):
+        if key not in self._items:
+            self._key_indices[key] = len(self._keys)
+            self._keys.append(key)
+            self._key_sequences[key] = self._next_sequence
+            self._logged_sequences.append(self._next_sequence)
+            self._logged_keys.append(key)
+            self._next_sequence += 1
+        self._items[key] = value
+
+    def __delitem__(self, key: str):
+        del self._items[key]
+        index = self._key_indices.pop(key)
+        last_key = self._keys.pop()
+        if last_key != key:
+            self._keys[index] = last_key
+            self._key_indices[last_key] = index
+        sequence = self._key_sequences.pop(key)
+        self._logged_keys[bisect_left(self._logged_sequences, sequence)] = None
+        if len(self._logged_keys) > 2 * len(self._items):
+            self._compact_log()
+
+    def _compact_log(self):
+        logged_entries = [
+            (sequence, key)
+            for sequence, key in zip(self._logged_sequences, self._logged_keys)
+            if key is not None
+        ]
+        self._logged_sequences = [sequence for sequence, _ in logged_entries]
+        self._logged_keys = [key for _, key in logged_entries]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def values_from(self, offset: int, count: int) -> list[V]:
+        """
+        :return: At most count values, skipping the first offset values in insertion order
+        """
+        return list(islice(self._items.values(), offset, offset + count))
+
+    def values_after(
+        self, sequence: int | None, count: int
+    ) -> tuple[list[V], int | None]:
+        """
+        Resumes iteration in insertion order at the key with the given sequence number, or the first key inserted
+        after it, if it was deleted.
+        :param sequence: The sequence number returned for the previous values, None to start from the beginning
+        :param count: The maximum number of values to return
+        :return: The values and the sequence number to continue from, None if there are no more values
+        """
+        index = (
+            bisect_left(self._logged_sequences, sequence) if sequence is not None else 0
+        )
+        values: list[V] = []
+        while index < len(self._logged_keys):
+            key = self._logged_keys[index]
+            if key is not None:
+                if len(values) == count:
+                    return values, self._logged_sequences[index]
+                values.append(self._items[key])
+            index += 1
+        return values, None
+
+    def sample(
+        self,
+        count: int,
+        predicate: Callable[[V], bool] | None = None,
+        rng: random.Random | None = None,
+    ) -> list[V]:
+        """
+        Picks distinct random values. Without a predicate, this takes O(count) time. With a predicate, random keys
+        are drawn without replacement until enough values match it, giving up after a number of draws proportional to
+        count, so fewer values may be returned if the predicate rarely matches.
+        :param count: The number of values to pick
+        :param predicate: The condition that the picked values must meet
+        :param rng: The random number generator to use
+        :return: The picked values
+        """
+        rng = rng or random.Random()
+        size = len(self._keys)
+        if predicate is None:
+            indices = rng.sample(range(size), min(count, size))
+            return [self._items[self._keys[index]] for index in indices]
+
+        sampled: list[V] = []
+        swapped_indices: dict[int, int] = {}
+        for draw in range(min(count * _MAXIMUM_SAMPLING_ATTEMPTS_PER_ITEM, size)):
+            drawn_index = rng.randrange(draw, size)
+            index = swapped_indices.get(drawn_index, drawn_index)
+            swapped_indices[drawn_index] = swapped_indices.get(draw, draw)
+            item = self._items[self._keys[index]]
+            if predicate(item):
+                sampled.append(item)
+                if len(sampled) == count:
+                    break
+        return sampled
 
 
 class InMemoryCRUDAdapter(CRUDAdapter[T]):
     def __init__(self):
-        self._items: dict[str, T] = OrderedDict[str, T]()
+        self._items = IndexedDict[T]()
 
     @property
     def items(self):
@@ -57,89 +282,44 @@ class InMemoryCRUDAdapter(CRUDAdapter[T]):
     def _set_uid(self, item: T, uid: str):
         raise NotImplementedError
 
+    @timed(ADAPTER_OPERATION_SECONDS, 'save')
     async def save(self, item: T) -> T:
         uid = self._extract_uid(item)
         self._set_uid(item, uid)
         self._items[uid] = item
+        self._invalidate(uid)
         return item
 
+    @timed(ADAPTER_OPERATION_SECONDS, 'save_many')
+    async def save_many(self, items: Sequence[T]) -> int:
+        for item in items:
+            uid = self._extract_uid(item)
+            self._set_uid(item, uid)
+            self._items[uid] = item
+            self._invalidate(uid)
+        return len(items)
+
+    @timed(ADAPTER_OPERATION_SECONDS, 'list')
     async def list(self, page_number: int, page_size: int) -> list[T]:
-        return _paginate(list(self._items.values()), page_number, page_size)
+        return self._items.values_from((page_number - 1) * page_size, page_size)
+
+    @timed(ADAPTER_OPERATION_SECONDS, 'list_page')
+    async def list_page(self, cursor: str | None, page_size: int) -> Page[T]:
+        items, next_sequence = self._items.values_after(
+            decode_cursor(cursor) if cursor else None, page_size
+        )
+        return Page[T](
+            items=items,
+            next_cursor=encode_cursor(next_sequence)
+            if next_sequence is not None
+            else None,
+        )
 
+    @timed(ADAPTER_OPERATION_SECONDS, 'get_by_uid')
     async def get_by_uid(self, uid: str) -> T | None:
         return self._items.get(uid)
 
+    @timed(ADAPTER_OPERATION_SECONDS, 'delete')
     async def delete(self, uid: str):
         del self._items[uid]
-
-
-class _DeleteResponse(BaseModel):
-    message: str = Field(
-        default='DELETED',
-        json_schema_extra={
-            'const': 'DELETED',
-        },
-    )
-
-
-def crud_api(
-    adapter_factory: Callable[..., CRUDAdapter[T]], model_class: Type[T]
-) -> APIRouter:
-    model_name = model_class.__name__
-    api_router = APIRouter(prefix=f'/{model_name.lower()}')
-
-    @api_router.get(
-        path='/{uid}',
-        description=f'Read endpoint for {model_name} objects',
-        summary=f'Read {model_name}',
-        tags=[model_name],
-    )
-    async def _(
-        uid: str,
-        adapter: CRUDAdapter[model_class] = Depends(adapter_factory),  # type: ignore[valid-type]
-    ) -> model_class:  # type: ignore[valid-type]
-        item_found = await adapter.get_by_uid(uid)
-        if not item_found:
-            raise HTTPException(status_code=404)
-        return item_found
-
-    @api_router.get(
-        path='',
-        description=f'List endpoint for {model_name} objects',
-        summary=f'List {model_name} objects',
-        tags=[model_name],
-    )
-    async def _(
-        page_number: PositiveInt = 1,
-        page_size: PositiveInt = 20,
-        adapter: CRUDAdapter[model_class] = Depends(adapter_factory),  # type: ignore[valid-type]
-    ) -> list[model_class]:  # type: ignore[valid-type]
-        return await adapter.list(page_number, page_size)
-
-    @api_router.post(
-        path='',
-        response_model=model_class,
-        description=f'Save endpoint for {model_name} objects',
-        summary=f'Save {model_name} objects',
-        tags=[model_name],
-    )
-    async def _(
-        item: model_class,  # type: ignore[valid-type]
-        adapter: CRUDAdapter[model_class] = Depends(adapter_factory),  # type: ignore[valid-type]
-    ) -> model_class:  # type: ignore[valid-type]
-        return await adapter.save(item)
-
-    @api_router.delete(
-        path='/{uid}',
-        description=f'Delete endpoint for {model_name} objects',
-        summary=f'Delete {model_name}',
-        tags=[model_name],
-    )
-    async def _(
-        uid: str,
-        adapter: CRUDAdapter[model_class] = Depends(adapter_factory),  # type: ignore[valid-type]
-    ) -> _DeleteResponse:
-        await adapter.delete(uid)
-        return _DeleteResponse()
-
-    return api_router
+        self._invalidate(uid)
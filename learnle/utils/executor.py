@@ -0,0 +1,127 @@
+import asyncio
+from collections import deque
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+    FIRST_COMPLETED,
+)
+from functools import partial
+from typing import Callable, TypeVar, Iterable, Iterator
+
+from learnle.utils.metrics import REGISTRY, collect_metrics
+
+R = TypeVar('R')
+S = TypeVar('S')
+
+
+class ExecutorSaturatedError(Exception):
+    pass
+
+
+class BoundedExecutor:
+    """
+    Runs blocking functions in an executor without blocking the event loop. At most max_pending calls can be queued
+    or running at the same time, further calls are rejected or, if they ask to, wait for a free slot. A call that
+    does not finish in time raises TimeoutError, its slot is only released once the function actually returns. The
+    metrics recorded by calls in worker processes are merged into the registry of this process.
+    """
+
+    def __init__(
+        self, executor: Executor, max_pending: int, timeout_seconds: float | None
+    ):
+        self._executor = executor
+        self._max_pending = max_pending
+        self._timeout_seconds = timeout_seconds
+        self._pending = 0
+        self._slot_waiters: deque[asyncio.Future[None]] = deque()
+        self._collects_metrics = isinstance(executor, ProcessPoolExecutor)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def run(self, function: Callable[..., R], *args, wait: bool = False) -> R:
+        """
+        :param wait: Waits for a free slot instead of raising ExecutorSaturatedError when all slots are taken
+        """
+        while self._pending >= self._max_pending:
+            if not wait:
+                raise ExecutorSaturatedError(
+                    f'{self._pending} calls are already pending'
+                )
+            waiter = asyncio.get_running_loop().create_future()
+            self._slot_waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # A call cancelled right after it was woken passes the free slot on to the next waiting call
+                if waiter.done() and not waiter.cancelled():
+                    self._wake_next_waiter()
+                raise
+        if self._collects_metrics:
+            result, _ = await self._submit(partial(collect_metrics, function, *args))
+            return result
+        return await self._submit(partial(function, *args))
+
+    async def _submit(self, call: Callable[[], S]) -> S:
+        future = asyncio.get_running_loop().run_in_executor(self._executor, call)
+        # The slot is only taken once the call is submitted, a rejected submission has no callback to release it
+        self._pending += 1
+        future.add_done_callback(self._release)
+        return await asyncio.wait_for(asyncio.shield(future), self._timeout_seconds)
+
+    def _wake_next_waiter(self):
+        """
+        Wakes the oldest waiting call that was not cancelled, it takes the slot if no other call took it first.
+        """
+        while self._slot_waiters:
+            waiter = self._slot_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    def _release(self, future: asyncio.Future):
+        self._pending -= 1
+        self._wake_next_waiter()
+        if self._collects_metrics and not future.cancelled() and not future.exception():
+            REGISTRY.merge(future.result()[1])
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _pop_completed(
+    in_flight: dict[Future[R], int],
+) -> Iterator[tuple[int, Future[R]]]:
+    completed, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+    for future in completed:
+        yield in_flight.pop(future), future
+
+
+def map_unordered(
+    executor: Executor,
+    function: Callable[..., R],
+    arguments: Iterable[tuple],
+    max_in_flight: int,
+) -> Iterator[tuple[int, Future[R]]]:
+    """
+    Calls the function in the executor with each tuple of arguments, keeping at most max_in_flight calls submitted
+    at a time, so the arguments can be consumed lazily.
+    :return: The index of the arguments and the completed future of each call, in the order of completion. The
+        future of a call that could not be submitted holds the error of the submission
+    """
+    in_flight: dict[Future[R], int] = {}
+    for index, function_arguments in enumerate(arguments):
+        if len(in_flight) >= max_in_flight:
+            yield from _pop_completed(in_flight)
+        try:
+            future = executor.submit(function, *function_arguments)
+        except Exception as e:
+            # A call that cannot be submitted, for example to a broken process pool, is yielded as a failed call
+            future = Future()
+            future.set_exception(e)
+        in_flight[future] = index
+    while in_flight:
+        yield from _pop_completed(in_flight)
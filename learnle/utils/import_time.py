@@ -0,0 +1,57 @@
+import subprocess
+import sys
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class ModuleImportTime:
+    module: str
+    self_microseconds: int
+    cumulative_microseconds: int
+    depth: int
+
+
+def parse_import_times(output: str) -> list[ModuleImportTime]:
+    """
+    Parses the report that python -X importtime writes to the standard error.
+    """
+    import_times = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_time, cumulative_time, module = line.removeprefix('import time:').split(
+            '|'
+        )
+        import_times.append(
+            ModuleImportTime(
+                module=module.strip(),
+                self_microseconds=int(self_time),
+                cumulative_microseconds=int(cumulative_time),
+                depth=(len(module) - len(module.lstrip()) - 1) // 2,
+            )
+        )
+    return import_times
+
+
+def measure_import_times(module: str) -> list[ModuleImportTime]:
+    """
+    Imports the module in a new interpreter, so the modules already imported by this process are measured too.
+    :param module: The name of the module to import
+    :return: The import time of every module imported along with it
+    :raises ImportError: If the import failed or the interpreter reported no import times
+    """
+    completed_process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+    )
+    stderr = completed_process.stderr.strip()
+    if completed_process.returncode:
+        raise ImportError(
+            stderr.splitlines()[-1]
+            if stderr
+            else f'Importing {module} failed with exit status {completed_process.returncode}'
+        )
+    if not stderr:
+        raise ImportError(f'No import times were reported for {module}')
+    return parse_import_times(stderr)
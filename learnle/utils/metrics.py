@@ -0,0 +1,236 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from threading import Lock
+from typing import Any, Callable, Coroutine, Iterator, TypeVar, ParamSpec
+
+P = ParamSpec('P')
+R = TypeVar('R')
+_M = TypeVar('_M', bound='_Metric')
+
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)  # fmt: skip
+
+Samples = dict[str, dict[tuple[str, ...], list[float]]]
+
+
+def _format_labels(label_names: tuple[str, ...], label_values: tuple[str, ...]) -> str:
+    if not label_names:
+        return ''
+    labels = ','.join(
+        f'{name}="{value}"' for name, value in zip(label_names, label_values)
+    )
+    return '{' + labels + '}'
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._values: dict[tuple[str, ...], list[float]] = {}
+        self._lock = Lock()
+
+    def _new_values(self) -> list[float]:
+        raise NotImplementedError
+
+    def _values_of(self, label_values: tuple[str, ...]) -> list[float]:
+        values = self._values.get(label_values)
+        if values is None:
+            with self._lock:
+                values = self._values.setdefault(label_values, self._new_values())
+        return values
+
+    def drain(self) -> dict[tuple[str, ...], list[float]]:
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, values: dict[tuple[str, ...], list[float]]):
+        for label_values, other_values in values.items():
+            own_values = self._values_of(label_values)
+            with self._lock:
+                for index, value in enumerate(other_values):
+                    own_values[index] += value
+
+    def _sorted_values(self) -> list[tuple[tuple[str, ...], list[float]]]:
+        with self._lock:
+            return sorted(
+                (label_values, list(values))
+                for label_values, values in self._values.items()
+            )
+
+    def render(self) -> Iterator[str]:
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} {self.kind}'
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _new_values(self) -> list[float]:
+        return [0.0]
+
+    def inc(self, *label_values: str, amount: float = 1):
+        values = self._values_of(label_values)
+        with self._lock:
+            values[0] += amount
+
+    def value(self, *label_values: str) -> float:
+        values = self._values.get(label_values)
+        return values[0] if values else 0.0
+
+    def render(self) -> Iterator[str]:
+        yield from super().render()
+        for label_values, values in self._sorted_values():
+            labels = _format_labels(self.label_names, label_values)
+            yield f'{self.name}_total{labels} {_format_value(values[0])}'
+
+
+class Histogram(_Metric):
+    """
+    Counts the observations per bucket. The values are a count per bucket, the count of the observations above
+    every bucket, the sum and the count of the observations. The counts are only made cumulative when rendered.
+    """
+
+    kind = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...],
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets = buckets
+
+    def _new_values(self) -> list[float]:
+        return [0.0] * (len(self.buckets) + 3)
+
+    def observe(self, value: float, *label_values: str):
+        values = self._values_of(label_values)
+        with self._lock:
+            values[bisect_left(self.buckets, value)] += 1
+            values[-2] += value
+            values[-1] += 1
+
+    @contextmanager
+    def time(self, *label_values: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def count(self, *label_values: str) -> float:
+        values = self._values.get(label_values)
+        return values[-1] if values else 0.0
+
+    def render(self) -> Iterator[str]:
+        yield from super().render()
+        for label_values, values in self._sorted_values():
+            cumulative_count = 0.0
+            for bucket, bucket_count in zip(
+                (*map(_format_value, self.buckets), '+Inf'), values
+            ):
+                cumulative_count += bucket_count
+                labels = _format_labels(
+                    (*self.label_names, 'le'), (*label_values, bucket)
+                )
+                yield f'{self.name}_bucket{labels} {_format_value(cumulative_count)}'
+            labels = _format_labels(self.label_names, label_values)
+            yield f'{self.name}_sum{labels} {_format_value(values[-2])}'
+            yield f'{self.name}_count{labels} {_format_value(values[-1])}'
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def counter(
+        self, name: str, documentation: str, label_names: tuple[str, ...] = ()
+    ) -> Counter:
+        return self._register(Counter(name, documentation, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, label_names, buckets))
+
+    def _register(self, metric: _M) -> _M:
+        if metric.name in self._metrics:
+            raise ValueError(f'Metric {metric.name} is already registered')
+        self._metrics[metric.name] = metric
+        return metric
+
+    def drain(self) -> Samples:
+        """
+        Takes the values recorded so far and resets the metrics, so that a worker process can hand its values over.
+        """
+        return {name: metric.drain() for name, metric in self._metrics.items()}
+
+    def merge(self, samples: Samples):
+        for name, values in samples.items():
+            self._metrics[name].merge(values)
+
+    def render(self) -> str:
+        """
+        :return: The metrics in the Prometheus text exposition format
+        """
+        return ''.join(
+            line + '\n' for metric in self._metrics.values() for line in metric.render()
+        )
+
+
+REGISTRY = MetricsRegistry()
+
+
+def collect_metrics(function: Callable[..., R], *args) -> tuple[R, Samples]:
+    """
+    Calls the function in a worker process and returns its result together with the metrics it recorded, so the
+    parent process can merge them into its own registry. The values a forked worker inherited are dropped first, a
+    worker process runs one call at a time.
+    """
+    REGISTRY.drain()
+    result = function(*args)
+    return result, REGISTRY.drain()
+
+
+def timed(
+    histogram: Histogram, operation: str
+) -> Callable[
+    [Callable[P, Coroutine[Any, Any, R]]], Callable[P, Coroutine[Any, Any, R]]
+]:
+    """
+    Records the duration of an async method, labelled with the class of the instance and the operation.
+    """
+
+    def _decorator(
+        method: Callable[P, Coroutine[Any, Any, R]],
+    ) -> Callable[P, Coroutine[Any, Any, R]]:
+        @wraps(method)
+        async def _timed(*args: P.args, **kwargs: P.kwargs) -> R:
+            start = time.perf_counter()
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                histogram.observe(
+                    time.perf_counter() - start, type(args[0]).__name__, operation
+                )
+
+        return _timed
+
+    return _decorator
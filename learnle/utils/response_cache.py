@@ -0,0 +1,93 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from hashlib import blake2b
+from typing import Callable, Generic, TypeVar
+
+V = TypeVar('V')
+
+
+@dataclass(frozen=True, slots=True)
+class SerializedItem:
+    body: bytes
+    etag: str
+
+    @classmethod
+    def of(cls, body: bytes) -> 'SerializedItem':
+        return cls(body, f'"{blake2b(body, digest_size=16).hexdigest()}"')
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """
+        :param if_none_match: The value of an If-None-Match header
+        :return: True if the header lists the ETag of the item
+        """
+        if not if_none_match:
+            return False
+        tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+        return '*' in tags or self.etag in tags
+
+
+class VersionedCache(Generic[V]):
+    """
+    A least recently used cache of values derived from the items by uid, whose entries expire after a time to live.
+    Every invalidation bumps a version counter, and values derived before an invalidation are not stored, so a read
+    that races a write never caches the old state.
+    """
+
+    def __init__(
+        self,
+        maximum_size: int = 1024,
+        time_to_live_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._maximum_size = maximum_size
+        self._time_to_live_seconds = time_to_live_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[V, float | None]] = OrderedDict()
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, uid: str) -> V | None:
+        entry = self._entries.get(uid)
+        if entry is None:
+            return None
+        item, expires_at = entry
+        if expires_at is not None and expires_at <= self._clock():
+            del self._entries[uid]
+            return None
+        self._entries.move_to_end(uid)
+        return item
+
+    def put(self, uid: str, version: int, item: V):
+        """
+        :param uid: The uid of the item
+        :param version: The version of the cache before the item was read
+        :param item: The value derived from the item
+        """
+        if version != self._version or self._maximum_size <= 0:
+            return
+        expires_at = (
+            self._clock() + self._time_to_live_seconds
+            if self._time_to_live_seconds is not None
+            else None
+        )
+        self._entries[uid] = (item, expires_at)
+        self._entries.move_to_end(uid)
+        if len(self._entries) > self._maximum_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, uid: str):
+        self._version += 1
+        self._entries.pop(uid, None)
+
+
+class SerializedCache(VersionedCache[SerializedItem]):
+    """
+    Caches the JSON of the items, see VersionedCache.
+    """
@@ -0,0 +1,223 @@
+import asyncio
+import random
+import sqlite3
+from abc import abstractmethod
+from contextlib import contextmanager
+from queue import Queue
+from typing import Callable, Iterator, Sequence, Type, TypeVar
+
+from learnle.utils.crud_operation import (
+    ADAPTER_OPERATION_SECONDS,
+    CRUDAdapter,
+    Page,
+    T,
+    decode_cursor,
+    encode_cursor,
+)
+from learnle.utils.metrics import timed
+
+R = TypeVar('R')
+
+_MAXIMUM_SAMPLING_PROBES_PER_ITEM = 32
+
+
+class SQLiteConnectionPool:
+    """
+    A fixed number of SQLite connections in WAL mode, shared by the threads that run the queries off the event loop.
+    Each connection keeps its own cache of prepared statements. Every connection to an in-memory database opens a
+    database of its own, so such a pool has a single connection.
+    """
+
+    def __init__(self, path: str, size: int = 4):
+        if path == ':memory:':
+            size = 1
+        self._connections: Queue[sqlite3.Connection] = Queue()
+        for _ in range(size):
+            connection = sqlite3.connect(
+                path, check_same_thread=False, isolation_level=None
+            )
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._connections.put(connection)
+        self._size = size
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connections.get()
+        try:
+            yield connection
+        finally:
+            self._connections.put(connection)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        with self.connection() as connection:
+            connection.execute('BEGIN')
+            try:
+                yield connection
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+            connection.execute('COMMIT')
+
+    async def run(self, function: Callable[[sqlite3.Connection], R]) -> R:
+        """
+        Runs the function with a connection of the pool in a worker thread.
+        """
+
+        def _run() -> R:
+            with self.connection() as connection:
+                return function(connection)
+
+        return await asyncio.to_thread(_run)
+
+    def close(self):
+        for _ in range(self._size):
+            self._connections.get().close()
+
+
+class SQLiteCRUDAdapter(CRUDAdapter[T]):
+    """
+    Stores the items as JSON in a table with a unique index on the uid. The rows are listed in the order of their
+    integer primary key, which also serves as the cursor of the pages.
+    """
+
+    def __init__(
+        self,
+        connection_pool: SQLiteConnectionPool,
+        table_name: str,
+        model_class: Type[T],
+    ):
+        self._connection_pool = connection_pool
+        self._table_name = table_name
+        self._model_class = model_class
+        with connection_pool.connection() as connection:
+            connection.execute(
+                f'CREATE TABLE IF NOT EXISTS {table_name} ('
+                'sequence INTEGER PRIMARY KEY AUTOINCREMENT, '
+                'uid TEXT NOT NULL UNIQUE, '
+                'data TEXT NOT NULL)'
+            )
+
+    @abstractmethod
+    def _extract_uid(self, item: T) -> str:
+        raise NotImplementedError
+
+    def _parse(self, data: str) -> T:
+        return self._model_class.model_validate_json(data)
+
+    async def _random_items(
+        self, count: int, predicate: Callable[[T], bool] | None = None
+    ) -> list[T]:
+        """
+        Picks distinct random items by probing random primary keys, so the table is never scanned. Rows that follow
+        a gap of deleted keys are slightly more likely to be picked. The probing gives up after a number of probes
+        proportional to count, so fewer items may be returned if the predicate rarely matches.
+        """
+
+        def _sample(connection: sqlite3.Connection) -> list[T]:
+            minimum, maximum = connection.execute(
+                f'SELECT (SELECT min(sequence) FROM {self._table_name}), '
+                f'(SELECT max(sequence) FROM {self._table_name})'
+            ).fetchone()
+            if minimum is None:
+                return []
+            items: dict[str, T] = {}
+            for _ in range(count * _MAXIMUM_SAMPLING_PROBES_PER_ITEM):
+                if len(items) == count:
+                    break
+                row = connection.execute(
+                    f'SELECT uid, data FROM {self._table_name} '
+                    'WHERE sequence >= ? ORDER BY sequence LIMIT 1',
+                    (random.randint(minimum, maximum),),
+                ).fetchone()
+                # The last rows may have been deleted since the maximum was read, the next probe retries
+                if row is None:
+                    continue
+                uid, data = row
+                if uid in items:
+                    continue
+                item = self._parse(data)
+                if predicate is None or predicate(item):
+                    items[uid] = item
+            return list(items.values())
+
+        return await self._connection_pool.run(_sample)
+
+    @timed(ADAPTER_OPERATION_SECONDS, 'save')
+    async def save(self, item: T) -> T:
+        uid, data = self._extract_uid(item), item.model_dump_json()
+        await self._connection_pool.run(
+            lambda connection: connection.execute(
+                f'INSERT INTO {self._table_name} (uid, data) VALUES (?, ?) '
+                'ON CONFLICT(uid) DO UPDATE SET data = excluded.data',
+                (uid, data),
+            )
+        )
+        self._invalidate(uid)
+        return item
+
+    @timed(ADAPTER_OPERATION_SECONDS, 'save_many')
+    async def save_many(self, items: Sequence[T]) -> int:
+        rows = [(self._extract_uid(item), item.model_dump_json()) for item in items]
+
+        def _save_many():
+            with self._connection_pool.transaction() as connection:
+                connection.executemany(
+                    f'INSERT INTO {self._table_name} (uid, data) VALUES (?, ?) '
+                    'ON CONFLICT(uid) DO UPDATE SET data = excluded.data',
+                    rows,
+                )
+
+        await asyncio.to_thread(_save_many)
+        for uid, _ in rows:
+            self._invalidate(uid)
+        return len(rows)
+
+    @timed(ADAPTER_OPERATION_SECONDS, 'list')
+    async def list(self, page_number: int, page_size: int) -> list[T]:
+        rows = await self._connection_pool.run(
+            lambda connection: connection.execute(
+                f'SELECT data FROM {self._table_name} '
+                'ORDER BY sequence LIMIT ? OFFSET ?',
+                (page_size, (page_number - 1) * page_size),
+            ).fetchall()
+        )
+        return [self._parse(data) for (data,) in rows]
+
+    @timed(ADAPTER_OPERATION_SECONDS, 'list_page')
+    async def list_page(self, cursor: str | None, page_size: int) -> Page[T]:
+        sequence = decode_cursor(cursor) if cursor else 0
+        rows = await self._connection_pool.run(
+            lambda connection: connection.execute(
+                f'SELECT sequence, data FROM {self._table_name} '
+                'WHERE sequence >= ? ORDER BY sequence LIMIT ?',
+                (sequence, page_size + 1),
+            ).fetchall()
+        )
+        return Page[T](
+            items=[self._parse(data) for _, data in rows[:page_size]],
+            next_cursor=encode_cursor(rows[page_size][0])
+            if len(rows) > page_size
+            else None,
+        )
+
+    @timed(ADAPTER_OPERATION_SECONDS, 'get_by_uid')
+    async def get_by_uid(self, uid: str) -> T | None:
+        row = await self._connection_pool.run(
+            lambda connection: connection.execute(
+                f'SELECT data FROM {self._table_name} WHERE uid = ?', (uid,)
+            ).fetchone()
+        )
+        return self._parse(row[0]) if row else None
+
+    @timed(ADAPTER_OPERATION_SECONDS, 'delete')
+    async def delete(self, uid: str):
+        cursor = await self._connection_pool.run(
+            lambda connection: connection.execute(
+                f'DELETE FROM {self._table_name} WHERE uid = ?', (uid,)
+            )
+        )
+        self._invalidate(uid)
+        if not cursor.rowcount:
+            raise KeyError(uid)
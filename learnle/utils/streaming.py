@@ -0,0 +1,25 @@
+import codecs
+from typing import AsyncIterable, AsyncIterator, Iterable, TypeVar
+
+R = TypeVar('R')
+
+
+async def iterate_async(iterable: Iterable[R]) -> AsyncIterator[R]:
+    for item in iterable:
+        yield item
+
+
+async def iterate_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """
+    Splits a stream of UTF-8 encoded chunks into lines without the line endings. Only the current line is kept in
+    memory, however large the stream is.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    remainder = ''
+    async for chunk in chunks:
+        *lines, remainder = (remainder + decoder.decode(chunk)).split('\n')
+        for line in lines:
+            yield line.removesuffix('\r')
+    remainder += decoder.decode(b'', final=True)
+    if remainder:
+        yield remainder.removesuffix('\r')
@@ -0,0 +1,128 @@
+import heapq
+import math
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+
+_TOKEN = re.compile(r'[^\W_]+')
+
+# The parameters of the BM25 ranking, the saturation of the term frequencies and the weight of the document length
+_K1 = 1.2
+_B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Splits the text into runs of letters and digits, folding the case and dropping the diacritics, like the unicode61
+    tokenizer of SQLite.
+    """
+    decomposed_text = unicodedata.normalize('NFKD', text.casefold())
+    return _TOKEN.findall(
+        ''.join(
+            character
+            for character in decomposed_text
+            if not unicodedata.combining(character)
+        )
+    )
+
+
+class TextIndex:
+    """
+    An inverted index from the tokens of the documents to the keys of the documents containing them, with the
+    frequency of the token in each document. The tokens are also kept sorted, so every query term is matched as a
+    prefix of the tokens. The matches of a query contain every query term, and are ranked with BM25.
+    """
+
+    def __init__(self):
+        self._postings: dict[str, dict[str, int]] = {}
+        self._sorted_tokens: list[str] = []
+        self._document_tokens: dict[str, tuple[str, ...]] = {}
+        self._document_lengths: dict[str, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._document_lengths)
+
+    def add(self, key: str, text: str):
+        """
+        Indexes the text under the key, replacing the text indexed under the same key before.
+        """
+        self.remove(key)
+        tokens = tokenize(text)
+        token_counts = Counter(tokens)
+        for token, count in token_counts.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                insort(self._sorted_tokens, token)
+            postings[key] = count
+        self._document_tokens[key] = tuple(token_counts)
+        self._document_lengths[key] = len(tokens)
+        self._total_length += len(tokens)
+
+    def remove(self, key: str):
+        tokens = self._document_tokens.pop(key, None)
+        if tokens is None:
+            return
+        for token in tokens:
+            postings = self._postings[token]
+            del postings[key]
+            if not postings:
+                del self._postings[token]
+                del self._sorted_tokens[bisect_left(self._sorted_tokens, token)]
+        self._total_length -= self._document_lengths.pop(key)
+
+    def search(self, query: str, offset: int, limit: int) -> tuple[int, list[str]]:
+        """
+        :param query: The terms that the documents must contain, each as a prefix of a token
+        :param offset: The number of best ranked keys to skip
+        :param limit: The maximum number of keys returned
+        :return: The number of matching documents and the keys of the requested range of them, best ranked first
+        """
+        if not self._document_lengths:
+            return 0, []
+        scores: dict[str, float] | None = None
+        for term in sorted(set(tokenize(query)), key=len, reverse=True):
+            term_scores = self._term_scores(term, scores)
+            scores = (
+                term_scores
+                if scores is None
+                else {key: scores[key] + score for key, score in term_scores.items()}
+            )
+            if not scores:
+                return 0, []
+        if scores is None:
+            return 0, []
+        ranked_keys = heapq.nsmallest(
+            offset + limit, scores, key=lambda key: (-scores[key], key)
+        )
+        return len(scores), ranked_keys[offset:]
+
+    def _term_scores(
+        self, term: str, candidates: dict[str, float] | None
+    ) -> dict[str, float]:
+        """
+        :return: The BM25 score of the term for every document having a token the term is a prefix of, limited to the
+            candidate documents if specified
+        """
+        document_count = len(self._document_lengths)
+        average_length = self._total_length / document_count
+        scores: dict[str, float] = {}
+        index = bisect_left(self._sorted_tokens, term)
+        while index < len(self._sorted_tokens) and self._sorted_tokens[
+            index
+        ].startswith(term):
+            postings = self._postings[self._sorted_tokens[index]]
+            inverse_document_frequency = math.log(
+                1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5)
+            )
+            for key, count in postings.items():
+                if candidates is not None and key not in candidates:
+                    continue
+                length_norm = 1 - _B + _B * self._document_lengths[key] / average_length
+                scores[key] = scores.get(key, 0.0) + inverse_document_frequency * (
+                    count * (_K1 + 1) / (count + _K1 * length_norm)
+                )
+            index += 1
+        return scores
@@ -0,0 +1,198 @@
+import random
+import re
+from collections import defaultdict
+from string import ascii_lowercase
+from typing import Callable
+
+WILDCARD = '?'
+
+_SET_BYTES = re.compile(rb'[^\x00]')
+
+
+def _set_bit(bitset: bytearray, index: int):
+    byte_index = index >> 3
+    if byte_index >= len(bitset):
+        bitset.extend(bytes(byte_index - len(bitset) + 1))
+    bitset[byte_index] |= 1 << (index & 7)
+
+
+def _clear_bit(bitset: bytearray, index: int):
+    bitset[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+
+def _lowest_bit(value: int) -> int:
+    return (value & -value).bit_length() - 1
+
+
+def letter_signature(word: str) -> int:
+    """
+    :return: A bitmask with bit i set if the word contains the i-th letter of the alphabet, ignoring the case and the
+        characters outside of a to z
+    """
+    signature = 0
+    for letter in set(word.lower()):
+        bit = ord(letter) - ord('a')
+        if 0 <= bit < len(ascii_lowercase):
+            signature |= 1 << bit
+    return signature
+
+
+class WordPatternIndex:
+    """
+    Finds words by length and by the letters at given positions. Every word gets a slot, and every length and every
+    (position, letter) pair has a bitset of the slots of its words. A query ANDs the bitsets of its constraints, so
+    its cost depends on the number of slots and constraints, and not on the number of words that are checked. The
+    bitsets are kept as bytearrays that can be updated in place, and are converted to integers for the queries,
+    until the next update. Words are indexed in lower case.
+
+    The letter signature of every word is computed when it is added, together with a bitset of the slots of the
+    words that contain each letter, so the words sharing a letter with a given word are found by ORing the bitsets
+    of its letters.
+    """
+
+    def __init__(self):
+        self._slots: dict[str, int] = {}
+        self._keys: list[str | None] = []
+        self._words: list[str] = []
+        self._free_slots: list[int] = []
+        self._by_length: defaultdict[int, bytearray] = defaultdict(bytearray)
+        self._by_letter: defaultdict[tuple[int, str], bytearray] = defaultdict(
+            bytearray
+        )
+        self._values: dict[int | tuple[int, str], int] = {}
+        self._signatures: list[int] = []
+        self._by_contained_letter = [bytearray() for _ in ascii_lowercase]
+        self._contained_letter_values: list[int | None] = [None] * len(ascii_lowercase)
+        self._occupied = bytearray()
+        self._occupied_value: int | None = None
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def add(self, key: str, word: str):
+        """
+        Indexes the word under the key, replacing the word indexed under the same key before.
+        """
+        if key in self._slots:
+            self.remove(key)
+        word = word.lower()
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._keys[slot], self._words[slot] = key, word
+            self._signatures[slot] = letter_signature(word)
+        else:
+            slot = len(self._keys)
+            self._keys.append(key)
+            self._words.append(word)
+            self._signatures.append(letter_signature(word))
+        self._slots[key] = slot
+        self._update_signature_bitsets(slot, _set_bit)
+        _set_bit(self._by_length[len(word)], slot)
+        self._values.pop(len(word), None)
+        for position, letter in enumerate(word):
+            _set_bit(self._by_letter[position, letter], slot)
+            self._values.pop((position, letter), None)
+
+    def remove(self, key: str):
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return
+        word = self._words[slot]
+        self._update_signature_bitsets(slot, _clear_bit)
+        _clear_bit(self._by_length[len(word)], slot)
+        self._values.pop(len(word), None)
+        for position, letter in enumerate(word):
+            _clear_bit(self._by_letter[position, letter], slot)
+            self._values.pop((position, letter), None)
+        self._keys[slot] = None
+        self._free_slots.append(slot)
+
+    def find(self, pattern: str, limit: int | None = None) -> list[str]:
+        """
+        :param pattern: The letters of the words, with a question mark where any letter is allowed, ?a??e matches
+            the five letter words with a as their second and e as their last letter
+        :param limit: The maximum number of keys returned
+        :return: The keys of the matching words in the order of their slots
+        """
+        pattern = pattern.lower()
+        values = [self._value(self._by_length, len(pattern))] + [
+            self._value(self._by_letter, (position, letter))
+            for position, letter in enumerate(pattern)
+            if letter != WILDCARD
+        ]
+        matches = -1
+        for value in sorted(values, key=int.bit_length):
+            matches &= value
+            if not matches:
+                return []
+        keys: list[str] = []
+        match_bytes = matches.to_bytes((matches.bit_length() + 7) // 8, 'little')
+        for byte_match in _SET_BYTES.finditer(match_bytes):
+            byte_index, byte = byte_match.start(), byte_match[0][0]
+            for bit in range(8):
+                if byte >> bit & 1:
+                    keys.append(self._keys[byte_index * 8 + bit])  # type: ignore[arg-type]
+                    if len(keys) == limit:
+                        return keys
+        return keys
+
+    def sample_interlocking(self, count: int, rng: random.Random) -> list[str]:
+        """
+        Picks distinct random words that pairwise share at least one letter. The first word is picked at random, every
+        next word among the words sharing a letter with all the words picked before. A word is found by drawing a
+        random slot and taking the next candidate slot, so words that follow a gap of non-candidate slots are more
+        likely to be picked.
+        :param count: The number of words to pick
+        :param rng: The random number generator to use
+        :return: The keys of the picked words, fewer if not enough words share letters with the picked ones
+        """
+        if self._occupied_value is None:
+            self._occupied_value = int.from_bytes(self._occupied, 'little')
+        candidates = self._occupied_value
+        keys: list[str] = []
+        while candidates and len(keys) < count:
+            start = rng.randrange(candidates.bit_length())
+            following_candidates = candidates >> start
+            slot = (
+                start + _lowest_bit(following_candidates)
+                if following_candidates
+                else _lowest_bit(candidates)
+            )
+            keys.append(self._keys[slot])  # type: ignore[arg-type]
+            candidates &= self._sharing_a_letter(slot) & ~(1 << slot)
+        return keys
+
+    def _sharing_a_letter(self, slot: int) -> int:
+        slots = 0
+        signature = self._signatures[slot]
+        while signature:
+            bit = _lowest_bit(signature)
+            value = self._contained_letter_values[bit]
+            if value is None:
+                value = self._contained_letter_values[bit] = int.from_bytes(
+                    self._by_contained_letter[bit], 'little'
+                )
+            slots |= value
+            signature &= signature - 1
+        return slots
+
+    def _update_signature_bitsets(
+        self, slot: int, update_bit: Callable[[bytearray, int], None]
+    ):
+        update_bit(self._occupied, slot)
+        self._occupied_value = None
+        signature = self._signatures[slot]
+        while signature:
+            bit = _lowest_bit(signature)
+            update_bit(self._by_contained_letter[bit], slot)
+            self._contained_letter_values[bit] = None
+            signature &= signature - 1
+
+    def _value(self, bitsets: dict, key: int | tuple[int, str]) -> int:
+        value = self._values.get(key)
+        if value is None:
+            bitset = bitsets.get(key)
+            value = self._values[key] = (
+                int.from_bytes(bitset, 'little') if bitset else 0
+            )
+        return value
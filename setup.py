@@ -26,7 +26,7 @@ TEST_PACKAGES = [
 setup(
     name='Learnle',
     version='0.0.0',
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
     install_requires=PROD_PACKAGES,
     extras_require={
         'dev': PROD_PACKAGES + TEST_PACKAGES + DEV_PACKAGES,
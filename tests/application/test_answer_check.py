@@ -0,0 +1,58 @@
+from learnle.application.answer_check import CrosswordAnswerKey, CrosswordWordCheck
+from learnle.application.crosswords import create_crossword_draft
+from learnle.application.model import CrosswordPuzzleLetter
+from learnle.datatypes import Position
+from tests.dummy_data import dummy_lemma
+
+
+def _crossword():
+    lemmas = [dummy_lemma(word='hello'), dummy_lemma(word='world')]
+    return create_crossword_draft(lemmas).crossword
+
+
+def test_check__solved():
+    crossword = _crossword()
+
+    result = CrosswordAnswerKey(crossword).check(
+        [
+            letter.model_copy(update={'character': letter.character.upper()})
+            for letter in crossword.solution_letters
+        ]
+    )
+
+    assert result.solved
+    assert result.words == [
+        CrosswordWordCheck(lemma_uid=word.lemma.uid, correct=True)
+        for word in crossword.solution
+    ]
+
+
+def test_check__wrong_missing_and_outside_letters():
+    crossword = _crossword()
+    first_word, second_word = crossword.solution
+    intersection = {letter.position for letter in first_word.letters} & {
+        letter.position for letter in second_word.letters
+    }
+    wrong_letter = next(
+        letter for letter in second_word.letters if letter.position not in intersection
+    )
+    letters = [
+        letter for letter in crossword.solution_letters if letter != wrong_letter
+    ]
+    answer_key = CrosswordAnswerKey(crossword)
+
+    result = answer_key.check(letters)
+    assert not result.solved
+    assert [word.correct for word in result.words] == [True, False]
+
+    outside_letters = [
+        CrosswordPuzzleLetter(character='x', position=Position(-10, 0)),
+        CrosswordPuzzleLetter(character='x', position=Position(0, 10)),
+    ]
+    result = answer_key.check(
+        letters + outside_letters + [wrong_letter.model_copy(update={'character': '?'})]
+    )
+    assert [word.correct for word in result.words] == [True, False]
+
+    result = answer_key.check(letters + outside_letters + [wrong_letter])
+    assert result.solved
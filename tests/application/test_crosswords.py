@@ -1,3 +1,4 @@
+import logging
 import uuid
 from unittest.mock import Mock, AsyncMock
 
@@ -6,14 +7,18 @@ import pytest
 from learnle.application.crosswords import (
     random_crossword_puzzle,
     CrosswordPuzzle,
+    CrosswordPuzzleClue,
     CrosswordPuzzleLetter,
     SolvedCrosswordPuzzleWord,
     create_crossword_draft,
     CrosswordError,
+    CrosswordWordNotFoundError,
+    add_lemma_to_crossword,
+    remove_lemma_from_crossword,
 )
 from learnle.application.words import LemmaDatabaseAdapter
 from learnle.application.model import Lemma, Crossword, CrosswordDraft
-from learnle.datatypes import Position
+from learnle.datatypes import Dimensions, Position
 
 LEMMA_EFGHI = Lemma(
     uid='lemma_1', word='efghi', definition='efghi definition', example='efghi example'
@@ -60,9 +65,12 @@ async def test_random_crossword_puzzle__all_lemmas_fit(mock_shuffle, mock_uid):
     ■C■Y■
     """
     lemma_db = Mock(spec_set=LemmaDatabaseAdapter)
-    lemma_db.random_lemmas = AsyncMock(return_value=[LEMMA_EFGHI, LEMMA_FBC, LEMMA_HYY])
+    lemma_db.random_interlocking_lemmas = AsyncMock(
+        return_value=[LEMMA_EFGHI, LEMMA_FBC, LEMMA_HYY]
+    )
     mock_shuffle(['b', 'c', 'i', 'y', 'g', 'h', 'y', 'e', 'f'])
-    assert await random_crossword_puzzle(lemma_db) == CrosswordPuzzle(
+    puzzle, crossword = await random_crossword_puzzle(lemma_db)
+    assert crossword == Crossword(
         uid=mock_uid,
         width=5,
         height=3,
@@ -109,6 +117,28 @@ async def test_random_crossword_puzzle__all_lemmas_fit(mock_shuffle, mock_uid):
                 ],
             ),
         ],
+    )
+    assert puzzle == CrosswordPuzzle(
+        uid=mock_uid,
+        width=5,
+        height=3,
+        clues=[
+            CrosswordPuzzleClue(
+                lemma_uid='lemma_1',
+                definition='efghi definition',
+                positions=[Position(x=x, y=0) for x in range(5)],
+            ),
+            CrosswordPuzzleClue(
+                lemma_uid='lemma_2',
+                definition='fbc definition',
+                positions=[Position(x=1, y=y) for y in range(3)],
+            ),
+            CrosswordPuzzleClue(
+                lemma_uid='lemma_3',
+                definition='hyy definition',
+                positions=[Position(x=3, y=y) for y in range(3)],
+            ),
+        ],
         shuffled_state=[
             CrosswordPuzzleLetter(character='b', position=Position(x=0, y=0)),
             CrosswordPuzzleLetter(character='c', position=Position(x=1, y=0)),
@@ -231,6 +261,138 @@ def test_create_crossword_draft__lemmas_with_a_common_word():
         create_crossword_draft(lemmas, 3, 3)
 
 
+def test_create_crossword_draft__trace(caplog):
+    # The root logger keeps its default WARNING level
+    create_crossword_draft([LEMMA_FBC, LEMMA_EFGHI], 5, 5, trace=True)
+    assert caplog.messages == ['Crossword grid:\nEFGHI\n■B■■■\n■C■■■']
+
+
+def test_create_crossword_draft__no_trace(caplog):
+    caplog.set_level(logging.INFO)
+    create_crossword_draft([LEMMA_FBC, LEMMA_EFGHI], 5, 5)
+    assert caplog.messages == []
+
+
+def test_add_lemma_to_crossword__keeps_the_placements():
+    crossword = create_crossword_draft([LEMMA_EFGHI, LEMMA_FBC]).crossword
+
+    draft = add_lemma_to_crossword(crossword, LEMMA_HYY)
+
+    assert draft.lemmas_excluded == []
+    assert draft.crossword.uid == crossword.uid
+    assert draft.crossword.solution[:2] == crossword.solution
+    full_draft = create_crossword_draft([LEMMA_EFGHI, LEMMA_FBC, LEMMA_HYY])
+    assert draft.crossword.solution == full_draft.crossword.solution
+    assert (draft.crossword.width, draft.crossword.height) == (
+        full_draft.crossword.width,
+        full_draft.crossword.height,
+    )
+
+
+def test_add_lemma_to_crossword__word_does_not_fit():
+    crossword = create_crossword_draft([LEMMA_EFGHI, LEMMA_FBC]).crossword
+
+    draft = add_lemma_to_crossword(crossword, LEMMA_IJKL, Dimensions(5, 3))
+
+    assert draft == CrosswordDraft(crossword=crossword, lemmas_excluded=[LEMMA_IJKL])
+
+
+def test_add_lemma_to_crossword__non_unique_word():
+    crossword = create_crossword_draft([LEMMA_EFGHI]).crossword
+
+    with pytest.raises(CrosswordError):
+        add_lemma_to_crossword(
+            crossword, LEMMA_EFGHI.model_copy(update={'uid': 'other'})
+        )
+
+
+def test_add_lemma_to_crossword__letters_do_not_form_a_grid():
+    crossword = create_crossword_draft([LEMMA_EFGHI, LEMMA_FBC]).crossword
+    crossword.solution[1].letters[0].character = 'x'
+
+    with pytest.raises(CrosswordError):
+        add_lemma_to_crossword(crossword, LEMMA_HYY)
+
+
+def test_add_lemma_to_crossword__words_are_not_connected():
+    crossword = create_crossword_draft([LEMMA_EFGHI, LEMMA_FBC]).crossword
+    for letter in crossword.solution[1].letters:
+        letter.position = letter.position.shift(100_000, 100_000)
+
+    with pytest.raises(CrosswordError, match='not connected'):
+        add_lemma_to_crossword(crossword, LEMMA_HYY)
+
+
+def test_add_lemma_to_crossword__letters_exceed_the_dimensions():
+    crossword = create_crossword_draft([LEMMA_EFGHI, LEMMA_FBC]).crossword
+
+    with pytest.raises(CrosswordError, match='exceed'):
+        add_lemma_to_crossword(crossword.model_copy(update={'height': 2}), LEMMA_HYY)
+    # A connected crossword whose letters and origin span more than the maximum dimension
+    long_lemma = Lemma(uid='long', word='a' * 300, definition='', example='')
+    long_crossword = Crossword(
+        uid='long',
+        width=300,
+        height=1,
+        solution=[
+            SolvedCrosswordPuzzleWord(
+                lemma=long_lemma,
+                letters=[
+                    CrosswordPuzzleLetter(character='a', position=Position(x=x, y=0))
+                    for x in range(300)
+                ],
+            )
+        ],
+    )
+    with pytest.raises(CrosswordError, match='exceed'):
+        add_lemma_to_crossword(long_crossword, LEMMA_HYY)
+
+
+def test_remove_lemma_from_crossword():
+    crossword = create_crossword_draft([LEMMA_EFGHI, LEMMA_FBC, LEMMA_HYY]).crossword
+
+    edited_crossword = remove_lemma_from_crossword(crossword, LEMMA_FBC.uid)
+
+    assert edited_crossword.uid == crossword.uid
+    assert edited_crossword.solution == [crossword.solution[0], crossword.solution[2]]
+    assert edited_crossword == remove_lemma_from_crossword(
+        add_lemma_to_crossword(edited_crossword, LEMMA_FBC).crossword, LEMMA_FBC.uid
+    )
+    with pytest.raises(CrosswordWordNotFoundError):
+        remove_lemma_from_crossword(edited_crossword, LEMMA_FBC.uid)
+
+
+def test_remove_lemma_from_crossword__first_word_shrinks_the_crossword():
+    lemma_abcde = Lemma(uid='abcde', word='abcde', definition='', example='')
+    lemma_exy = Lemma(uid='exy', word='exy', definition='', example='')
+    crossword = create_crossword_draft([lemma_abcde, lemma_exy]).crossword
+    assert (crossword.width, crossword.height) == (5, 3)
+
+    edited_crossword = remove_lemma_from_crossword(crossword, lemma_abcde.uid)
+
+    assert (edited_crossword.width, edited_crossword.height) == (1, 3)
+    assert edited_crossword.solution[0].letters == [
+        CrosswordPuzzleLetter(character='e', position=Position(x=0, y=0)),
+        CrosswordPuzzleLetter(character='x', position=Position(x=0, y=1)),
+        CrosswordPuzzleLetter(character='y', position=Position(x=0, y=2)),
+    ]
+    assert not add_lemma_to_crossword(edited_crossword, lemma_abcde).lemmas_excluded
+
+
+def test_remove_lemma_from_crossword__word_connecting_the_others():
+    lemma_abcde = Lemma(uid='abcde', word='abcde', definition='', example='')
+    crossword = create_crossword_draft(
+        [
+            lemma_abcde,
+            Lemma(uid='axy', word='axy', definition='', example=''),
+            Lemma(uid='ezw', word='ezw', definition='', example=''),
+        ]
+    ).crossword
+
+    with pytest.raises(CrosswordError, match='split'):
+        remove_lemma_from_crossword(crossword, lemma_abcde.uid)
+
+
 # async def test_save_crossword():
 #     crossword = dummy_crossword()
 #
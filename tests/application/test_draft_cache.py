@@ -0,0 +1,70 @@
+from learnle.application.crosswords import create_crossword_draft
+from learnle.application.draft_cache import CrosswordDraftCache
+from learnle.utils.crossword_search import SearchBudget
+from tests.dummy_data import dummy_lemma
+
+
+def _lemmas():
+    return [dummy_lemma(word=word) for word in ['efghi', 'fbc', 'hyy', 'ijkl']]
+
+
+def _assert_same_layout(draft, expected_draft):
+    assert draft.crossword.uid != expected_draft.crossword.uid
+    assert draft.crossword.width == expected_draft.crossword.width
+    assert draft.crossword.height == expected_draft.crossword.height
+    assert [(word.lemma.word, word.letters) for word in draft.crossword.solution] == [
+        (word.lemma.word, word.letters) for word in expected_draft.crossword.solution
+    ]
+    assert [lemma.word for lemma in draft.lemmas_excluded] == [
+        lemma.word for lemma in expected_draft.lemmas_excluded
+    ]
+
+
+def test_draft_cache__hit_assembles_a_new_draft_from_the_new_lemmas():
+    cache = CrosswordDraftCache()
+    lemmas = _lemmas()
+    draft = create_crossword_draft(lemmas, 5, 5)
+    cache.put(lemmas, 5, 5, None, draft)
+
+    resubmitted_lemmas = [dummy_lemma(word=lemma.word) for lemma in lemmas]
+    cached_draft = cache.get(resubmitted_lemmas, 5, 5)
+
+    assert cached_draft is not None
+    _assert_same_layout(cached_draft, draft)
+    assert {word.lemma.uid for word in cached_draft.crossword.solution} <= {
+        lemma.uid for lemma in resubmitted_lemmas
+    }
+    assert cache.get(resubmitted_lemmas, 5, 6) is None
+    assert cache.get(resubmitted_lemmas[::-1], 5, 5) is None
+
+
+def test_draft_cache__time_budget_is_not_cached():
+    cache = CrosswordDraftCache()
+    lemmas = _lemmas()
+    search_budget = SearchBudget(max_seconds=1)
+    cache.put(
+        lemmas, 5, 5, search_budget, create_crossword_draft(lemmas, 5, 5, search_budget)
+    )
+
+    assert len(cache) == 0
+    assert cache.get(lemmas, 5, 5, search_budget) is None
+
+
+def test_draft_cache__least_recently_used_eviction():
+    cache = CrosswordDraftCache(maximum_size=1)
+    lemmas = _lemmas()
+    cache.put(lemmas, 5, 5, None, create_crossword_draft(lemmas, 5, 5))
+    cache.put(lemmas, 6, 6, None, create_crossword_draft(lemmas, 6, 6))
+
+    assert cache.get(lemmas, 5, 5) is None
+    assert cache.get(lemmas, 6, 6) is not None
+
+
+def test_draft_cache__directory_is_shared(tmp_path):
+    lemmas = _lemmas()
+    draft = create_crossword_draft(lemmas, 5, 5)
+    CrosswordDraftCache(directory=str(tmp_path)).put(lemmas, 5, 5, None, draft)
+
+    _assert_same_layout(
+        CrosswordDraftCache(directory=str(tmp_path)).get(lemmas, 5, 5), draft
+    )
@@ -0,0 +1,123 @@
+from learnle.application import lemma_import
+from learnle.application.lemma_import import LemmaImportFormat, import_lemmas
+from learnle.services.lemma_database import LemmaInMemoryDatabaseAdapter
+from learnle.utils.streaming import iterate_async
+from tests.dummy_data import dummy_lemma, dummy_lemmas
+
+
+async def test_import_lemmas__jsonl():
+    lemma_database = LemmaInMemoryDatabaseAdapter()
+    lemmas = dummy_lemmas(5)
+    lines = [lemma.model_dump_json() for lemma in lemmas]
+    lines.insert(2, '')
+
+    summary = await import_lemmas(lemma_database, iterate_async(lines), chunk_size=2)
+
+    assert summary.imported == 5
+    assert summary.failed == 0
+    assert await lemma_database.list(1, 10) == lemmas
+
+
+async def test_import_lemmas__csv():
+    lemma_database = LemmaInMemoryDatabaseAdapter()
+    lines = [
+        'word,uid,definition,example',
+        'apple,1,a fruit,"an apple',
+        'a day, ""keeps"" the doctor away"',
+        'pear,2,another fruit,pears are green',
+    ]
+
+    summary = await import_lemmas(
+        lemma_database, iterate_async(lines), LemmaImportFormat.CSV
+    )
+
+    assert summary.imported == 2
+    apple = await lemma_database.get_by_uid('1')
+    assert apple is not None
+    assert apple.word == 'apple'
+    assert apple.example == 'an apple\na day, "keeps" the doctor away'
+
+
+async def test_import_lemmas__invalid_records_are_reported():
+    lemma_database = LemmaInMemoryDatabaseAdapter()
+    lemma = dummy_lemmas(1)[0]
+    lines = ['{"uid": "1"}', lemma.model_dump_json(), 'not json']
+
+    summary = await import_lemmas(lemma_database, iterate_async(lines))
+
+    assert summary.imported == 1
+    assert summary.failed == 2
+    assert [error.line for error in summary.errors] == [1, 3]
+    assert await lemma_database.list(1, 10) == [lemma]
+
+
+async def test_import_lemmas__reserved_uids_are_reported():
+    lemma_database = LemmaInMemoryDatabaseAdapter()
+    lemmas = dummy_lemmas(2)
+    reserved_lemma = lemmas[1].model_copy(update={'uid': 'search'})
+    lines = [lemmas[0].model_dump_json(), reserved_lemma.model_dump_json()]
+
+    summary = await import_lemmas(
+        lemma_database, iterate_async(lines), reserved_uids={'search'}
+    )
+
+    assert summary.imported == 1
+    assert [(error.line, error.error) for error in summary.errors] == [
+        (2, 'The uid search is reserved')
+    ]
+    assert await lemma_database.list(1, 10) == [lemmas[0]]
+
+
+async def test_import_lemmas__unterminated_csv_quote_is_reported():
+    lemma_database = LemmaInMemoryDatabaseAdapter()
+    lines = [
+        'word,uid,definition,example',
+        'apple,1,a fruit,"an apple',
+        'pear,2,another fruit,pears are green',
+        'plum,3,a stone fruit,plums are purple',
+    ]
+
+    summary = await import_lemmas(
+        lemma_database, iterate_async(lines), LemmaImportFormat.CSV
+    )
+
+    assert summary.imported == 2
+    assert [(error.line, error.error) for error in summary.errors] == [
+        (2, 'Unterminated quoted field')
+    ]
+    assert [lemma.uid for lemma in await lemma_database.list(1, 10)] == ['2', '3']
+
+
+async def test_import_lemmas__csv_record_length_is_capped(monkeypatch):
+    monkeypatch.setattr(lemma_import, 'MAXIMUM_RECORD_LENGTH', 100)
+    lemma_database = LemmaInMemoryDatabaseAdapter()
+    lines = [
+        'word,uid,definition,example',
+        'apple,1,a fruit,"an apple',
+        *['pear,2,another fruit,pears are green'] * 5,
+        'plum,3,a stone fruit,"plums are',
+        'purple"',
+    ]
+
+    summary = await import_lemmas(
+        lemma_database, iterate_async(lines), LemmaImportFormat.CSV
+    )
+
+    assert summary.imported == 6
+    assert [error.line for error in summary.errors] == [2]
+    plum = await lemma_database.get_by_uid('3')
+    assert plum is not None
+    assert plum.example == 'plums are\npurple'
+
+
+async def test_import_lemmas__fixed_lemma_paths_are_reserved_by_default():
+    lemma_database = LemmaInMemoryDatabaseAdapter()
+    lines = [
+        dummy_lemma(uid=uid).model_dump_json()
+        for uid in ('export', 'search', 'text-search')
+    ]
+
+    summary = await import_lemmas(lemma_database, iterate_async(lines))
+
+    assert summary.imported == 0
+    assert summary.failed == 3
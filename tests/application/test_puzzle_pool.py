@@ -0,0 +1,76 @@
+import asyncio
+from unittest.mock import Mock, AsyncMock
+
+import pytest
+
+from learnle.application.model import Lemma
+from learnle.application.puzzle_pool import CrosswordPuzzlePool
+from learnle.application.words import LemmaDatabaseAdapter
+from learnle.datatypes import Dimensions
+
+LEMMAS = [
+    Lemma(uid='lemma_1', word='efghi', definition='definition', example='example'),
+    Lemma(uid='lemma_2', word='fbc', definition='definition', example='example'),
+]
+
+
+@pytest.fixture
+def lemma_db() -> LemmaDatabaseAdapter:
+    lemma_db = Mock(spec_set=LemmaDatabaseAdapter)
+    lemma_db.random_interlocking_lemmas = AsyncMock(return_value=LEMMAS)
+    return lemma_db
+
+
+async def wait_for_refills():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+async def test_get__empty_pool_generates_puzzle_and_refills(lemma_db):
+    pool = CrosswordPuzzlePool(lemma_db, depth=3, refill_concurrency=2)
+
+    puzzle, crossword = await pool.get()
+    assert [word.lemma for word in crossword.solution] == LEMMAS
+    assert puzzle.uid == crossword.uid
+    assert pool.size() == 0
+
+    await wait_for_refills()
+    assert pool.size() == 3
+    assert lemma_db.random_interlocking_lemmas.await_count == 4
+
+
+async def test_get__takes_puzzle_from_pool(lemma_db):
+    pool = CrosswordPuzzlePool(lemma_db, depth=2, refill_concurrency=1)
+    pool.refill()
+    await wait_for_refills()
+    assert pool.size() == 2
+
+    await pool.get()
+    assert pool.size() == 1
+    assert lemma_db.random_interlocking_lemmas.await_count == 2
+
+    await wait_for_refills()
+    assert pool.size() == 2
+
+
+async def test_get__pools_are_kept_by_maximum_dimensions(lemma_db):
+    pool = CrosswordPuzzlePool(lemma_db, depth=1, refill_concurrency=1)
+    pool.refill(Dimensions(3, 3))
+    await wait_for_refills()
+
+    _, crossword = await pool.get(Dimensions(3, 3))
+    assert [word.lemma for word in crossword.solution] == LEMMAS[1:]
+    assert pool.size(Dimensions(3, 3)) == 0
+    assert pool.size() == 0
+
+    await pool.close()
+
+
+async def test_refill__does_not_keep_puzzles_without_words(lemma_db):
+    lemma_db.random_interlocking_lemmas = AsyncMock(return_value=[])
+    pool = CrosswordPuzzlePool(lemma_db, depth=2, refill_concurrency=1)
+
+    pool.refill()
+    await wait_for_refills()
+
+    assert pool.size() == 0
@@ -0,0 +1,68 @@
+from learnle.datatypes import Dimensions
+from learnle.utils.crossword_grid import UnpackedCrosswordGrid
+from learnle.utils.crossword_search import search_layout, SearchBudget
+from tests.crossword.assertions import assert_grid_equals
+
+WORDS = ['edea', 'eeb', 'bde', 'dc']
+
+
+def test_search_layout__fits_words_that_greedy_insertion_excludes():
+    greedy_grid = UnpackedCrosswordGrid(Dimensions(5, 5))
+    assert [bool(greedy_grid.add_word(word)) for word in WORDS] == [
+        True,
+        True,
+        True,
+        False,
+    ]
+
+    layout = search_layout(WORDS, Dimensions(5, 5), SearchBudget(max_nodes=100))
+
+    assert list(layout.letters_by_word) == WORDS
+    assert_grid_equals(
+        layout.grid,
+        """
+    EDEA
+    E■■■
+    BDE■
+    ■C■■
+    """,
+    )
+
+
+def test_search_layout__exhausted_budget_falls_back_to_greedy_layout():
+    greedy_grid = UnpackedCrosswordGrid(Dimensions(5, 5))
+    for word in WORDS:
+        greedy_grid.add_word(word)
+
+    layout = search_layout(WORDS, Dimensions(5, 5), SearchBudget(max_nodes=1))
+
+    assert list(layout.letters_by_word) == WORDS[:3]
+    assert layout.grid.text_view() == greedy_grid.text_view()
+
+
+def test_search_layout__same_budget_gives_same_layout():
+    words = ['dbbbe', 'ddedb', 'aabea', 'acde']
+    budget = SearchBudget(max_nodes=50)
+
+    first_layout = search_layout(words, Dimensions(5, 5), budget)
+    second_layout = search_layout(words, Dimensions(5, 5), budget)
+
+    assert first_layout.letters_by_word == second_layout.letters_by_word
+    assert first_layout.grid.text_view() == second_layout.grid.text_view()
+
+
+def test_search_layout__copies_no_grid_past_the_node_budget(monkeypatch):
+    copies = 0
+    copy = UnpackedCrosswordGrid.copy
+
+    def counting_copy(grid):
+        nonlocal copies
+        copies += 1
+        return copy(grid)
+
+    monkeypatch.setattr(UnpackedCrosswordGrid, 'copy', counting_copy)
+
+    search_layout(WORDS, Dimensions(5, 5), SearchBudget(max_nodes=3))
+
+    # One copy per node, and one for the greedy completion of the first exhausted branch
+    assert copies <= 3 + 1
@@ -1,24 +1,34 @@
+import pytest
+
 from learnle.application.model import CrosswordPuzzleLetter
 from learnle.utils.crossword_grid import (
+    GridLetter,
     UnpackedCrosswordGrid,
     PackedCrosswordGrid,
+    InfiniteGrid,
+    DenseGrid,
 )
 from learnle.datatypes import Dimensions, Position
 from tests.crossword.assertions import assert_grid_equals
 
 
+@pytest.fixture(params=[InfiniteGrid, DenseGrid], ids=lambda x: x.__name__)
+def grid_class(request):
+    return request.param
+
+
 def add_words_and_assert_success(grid, *words):
     for word in words:
         assert grid.add_word(word)
 
 
-def test_empty_grid():
-    grid = UnpackedCrosswordGrid()
+def test_empty_grid(grid_class):
+    grid = UnpackedCrosswordGrid(grid_class=grid_class)
     assert_grid_equals(grid, '■')
 
 
-def test_add_word__one_character():
-    grid = UnpackedCrosswordGrid()
+def test_add_word__one_character(grid_class):
+    grid = UnpackedCrosswordGrid(grid_class=grid_class)
     assert grid.add_word('a')
     assert_grid_equals(
         grid,
@@ -28,8 +38,8 @@ def test_add_word__one_character():
     )
 
 
-def test_add_word__two_characters():
-    grid = UnpackedCrosswordGrid()
+def test_add_word__two_characters(grid_class):
+    grid = UnpackedCrosswordGrid(grid_class=grid_class)
     assert grid.add_word('ab')
     assert_grid_equals(
         grid,
@@ -39,8 +49,8 @@ def test_add_word__two_characters():
     )
 
 
-def test_add_word__two_words__first_letter_in_common():
-    grid = UnpackedCrosswordGrid()
+def test_add_word__two_words__first_letter_in_common(grid_class):
+    grid = UnpackedCrosswordGrid(grid_class=grid_class)
     assert grid.add_word('dig')
     assert grid.add_word('dry')
     assert_grid_equals(
@@ -53,8 +63,8 @@ def test_add_word__two_words__first_letter_in_common():
     )
 
 
-def test_add_word__two_words__second_letter_in_common():
-    grid = UnpackedCrosswordGrid()
+def test_add_word__two_words__second_letter_in_common(grid_class):
+    grid = UnpackedCrosswordGrid(grid_class=grid_class)
     add_words_and_assert_success(grid, 'dig', 'odd')
     assert_grid_equals(
         grid,
@@ -66,8 +76,8 @@ def test_add_word__two_words__second_letter_in_common():
     )
 
 
-def test_add_word__two_words__last_letter_in_common():
-    grid = UnpackedCrosswordGrid()
+def test_add_word__two_words__last_letter_in_common(grid_class):
+    grid = UnpackedCrosswordGrid(grid_class=grid_class)
     add_words_and_assert_success(grid, 'dig', 'rug')
     assert_grid_equals(
         grid,
@@ -79,8 +89,8 @@ def test_add_word__two_words__last_letter_in_common():
     )
 
 
-def test_add_word__two_words_cannot_fit_together():
-    grid = UnpackedCrosswordGrid()
+def test_add_word__two_words_cannot_fit_together(grid_class):
+    grid = UnpackedCrosswordGrid(grid_class=grid_class)
     assert grid.add_word('dig')
     assert not grid.add_word('nope')
     assert_grid_equals(
@@ -91,8 +101,8 @@ def test_add_word__two_words_cannot_fit_together():
     )
 
 
-def test_add_word__three_words__two_words_share_a_character():
-    grid = UnpackedCrosswordGrid()
+def test_add_word__three_words__two_words_share_a_character(grid_class):
+    grid = UnpackedCrosswordGrid(grid_class=grid_class)
     add_words_and_assert_success(grid, 'doggy', 'ding', 'trudge')
     assert_grid_equals(
         grid,
@@ -109,8 +119,8 @@ def test_add_word__three_words__two_words_share_a_character():
     )
 
 
-def test_add_word__three_words__second_word_shares_a_character_with_third():
-    grid = UnpackedCrosswordGrid()
+def test_add_word__three_words__second_word_shares_a_character_with_third(grid_class):
+    grid = UnpackedCrosswordGrid(grid_class=grid_class)
     add_words_and_assert_success(grid, 'doggy', 'drag', 'amend')
     assert_grid_equals(
         grid,
@@ -123,8 +133,8 @@ def test_add_word__three_words__second_word_shares_a_character_with_third():
     )
 
 
-def test_add_word__multiple_words__each_sharing_a_character_with_another():
-    grid = UnpackedCrosswordGrid()
+def test_add_word__multiple_words__each_sharing_a_character_with_another(grid_class):
+    grid = UnpackedCrosswordGrid(grid_class=grid_class)
     add_words_and_assert_success(
         grid, 'dorm', 'drag', 'arm', 'ridge', 'might', 'height'
     )
@@ -143,8 +153,10 @@ def test_add_word__multiple_words__each_sharing_a_character_with_another():
     )
 
 
-def test_add_word__last_word_would_intersect_two_words_without_matching_characters():
-    grid = UnpackedCrosswordGrid()
+def test_add_word__last_word_would_intersect_two_words_without_matching_characters(
+    grid_class,
+):
+    grid = UnpackedCrosswordGrid(grid_class=grid_class)
     add_words_and_assert_success(grid, 'mould', 'among', 'new', 'undo')
     assert_grid_equals(
         grid,
@@ -159,8 +171,10 @@ def test_add_word__last_word_would_intersect_two_words_without_matching_characte
     )
 
 
-def test_add_word__last_word_intersects_other_words___common_letters_intersect():
-    grid = UnpackedCrosswordGrid()
+def test_add_word__last_word_intersects_other_words___common_letters_intersect(
+    grid_class,
+):
+    grid = UnpackedCrosswordGrid(grid_class=grid_class)
     add_words_and_assert_success(grid, 'mould', 'among', 'new', 'unwind')
     assert_grid_equals(
         grid,
@@ -176,8 +190,8 @@ def test_add_word__last_word_intersects_other_words___common_letters_intersect()
     )
 
 
-def test_add_word__last_word_would_touch_another__cannot_fit():
-    grid = UnpackedCrosswordGrid()
+def test_add_word__last_word_would_touch_another__cannot_fit(grid_class):
+    grid = UnpackedCrosswordGrid(grid_class=grid_class)
     add_words_and_assert_success(grid, 'efg', 'bde', 'jigc')
     assert not grid.add_word('abc')
     assert_grid_equals(
@@ -191,8 +205,10 @@ def test_add_word__last_word_would_touch_another__cannot_fit():
     )
 
 
-def test_add_word__maximum_dimensions_exceeded():
-    grid = UnpackedCrosswordGrid(maximum_dimensions=Dimensions(5, 4))
+def test_add_word__maximum_dimensions_exceeded(grid_class):
+    grid = UnpackedCrosswordGrid(
+        maximum_dimensions=Dimensions(5, 4), grid_class=grid_class
+    )
     add_words_and_assert_success(grid, 'abcde', 'feff')
     assert not grid.add_word('fiiiiiiii')
     assert_grid_equals(
@@ -206,8 +222,10 @@ def test_add_word__maximum_dimensions_exceeded():
     )
 
 
-def test_add_word__word_forced_to_choose_intersection_that_fits_dimensions():
-    grid = UnpackedCrosswordGrid(maximum_dimensions=Dimensions(5, 5))
+def test_add_word__word_forced_to_choose_intersection_that_fits_dimensions(grid_class):
+    grid = UnpackedCrosswordGrid(
+        maximum_dimensions=Dimensions(5, 5), grid_class=grid_class
+    )
     add_words_and_assert_success(grid, 'fbcdh', 'efghi', 'hyyyy')
     assert_grid_equals(
         grid,
@@ -221,8 +239,45 @@ def test_add_word__word_forced_to_choose_intersection_that_fits_dimensions():
     )
 
 
-def test_packed_grid():
-    grid = UnpackedCrosswordGrid()
+def test_from_words__rebuilds_the_grid(grid_class):
+    grid = UnpackedCrosswordGrid(grid_class=grid_class)
+    words = [grid.add_word(word) for word in ('abc', 'defa', 'ghd')]
+
+    rebuilt_grid = UnpackedCrosswordGrid.from_words(words, grid_class=grid_class)
+
+    assert rebuilt_grid.text_view() == grid.text_view()
+    assert sorted(
+        (cell.position.x, cell.position.y, cell.axis.name, cell.is_intersected)
+        for cell in rebuilt_grid.cells
+    ) == sorted(
+        (cell.position.x, cell.position.y, cell.axis.name, cell.is_intersected)
+        for cell in grid.cells
+    )
+    for word in ('ie', 'bj', 'kg'):
+        assert rebuilt_grid.add_word(word) == grid.add_word(word)
+
+
+@pytest.mark.parametrize(
+    'letters',
+    [
+        [],
+        [GridLetter('x', Position(0, 0))],
+        [GridLetter('y', Position(5, 5)), GridLetter('z', Position(6, 6))],
+        [GridLetter('y', Position(5, 5)), GridLetter('z', Position(7, 5))],
+    ],
+)
+def test_place_word__invalid_letters(grid_class, letters):
+    grid = UnpackedCrosswordGrid.from_words(
+        [[GridLetter('a', Position(0, 0)), GridLetter('b', Position(1, 0))]],
+        grid_class=grid_class,
+    )
+
+    with pytest.raises(ValueError):
+        grid.place_word(letters)
+
+
+def test_packed_grid(grid_class):
+    grid = UnpackedCrosswordGrid(grid_class=grid_class)
     add_words_and_assert_success(grid, 'abc', 'defa', 'ghd')
 
     packed_grid = PackedCrosswordGrid(grid)
@@ -237,3 +292,15 @@ def test_packed_grid():
         CrosswordPuzzleLetter(character='h', position=Position(x=1, y=0)),
     ]
     assert packed_grid.dimensions() == grid.dimensions
+
+
+def test_dense_grid__grows_in_every_direction():
+    grid = DenseGrid[str]()
+    positions = [Position(x, y) for x in range(-20, 21, 5) for y in range(-30, 31, 6)]
+    for position in positions:
+        grid[position] = f'{position.x},{position.y}'
+
+    assert len(grid) == len(positions)
+    assert all(grid[position] == f'{position.x},{position.y}' for position in positions)
+    assert Position(1, 1) not in grid
+    assert grid.dimensions == Dimensions(41, 61)
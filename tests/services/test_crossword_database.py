@@ -3,20 +3,33 @@ from dataclasses import dataclass, field
 import pytest
 
 from learnle.application.model import Crossword
-from learnle.services.crossword_database import CrosswordInMemoryDatabaseAdapter
+from learnle.services.crossword_database import (
+    CrosswordInMemoryDatabaseAdapter,
+    CrosswordSQLiteDatabaseAdapter,
+)
+from learnle.utils.response_cache import VersionedCache
+from learnle.utils.sqlite_crud import SQLiteConnectionPool
 from tests.dummy_data import (
     dummy_crossword,
     dummy_crosswords,
 )
 
 
-async def test_save():
-    adapter = CrosswordInMemoryDatabaseAdapter()
+@pytest.fixture(params=['memory', 'sqlite'])
+def adapter(request, tmp_path):
+    if request.param == 'memory':
+        yield CrosswordInMemoryDatabaseAdapter()
+        return
+    connection_pool = SQLiteConnectionPool(str(tmp_path / 'learnle.sqlite3'))
+    yield CrosswordSQLiteDatabaseAdapter(connection_pool)
+    connection_pool.close()
+
 
+async def test_save(adapter):
     crossword = dummy_crossword()
     assert await adapter.save(crossword) == crossword
 
-    assert adapter.items[crossword.uid] == crossword
+    assert await adapter.get_by_uid(crossword.uid) == crossword
 
 
 @dataclass
@@ -63,11 +76,9 @@ search_test_cases = [
 
 
 @pytest.mark.parametrize('test_case', search_test_cases, ids=lambda x: x.name)
-async def test_search(test_case):
-    adapter = CrosswordInMemoryDatabaseAdapter()
-
+async def test_search(adapter, test_case):
     for lemma in test_case.state:
-        adapter.items[lemma.uid] = lemma
+        await adapter.save(lemma)
 
     assert (
         await adapter.list(test_case.page_number, test_case.page_size)
@@ -75,34 +86,46 @@ async def test_search(test_case):
     )
 
 
-async def test_get_by_uid():
-    adapter = CrosswordInMemoryDatabaseAdapter()
-
+async def test_get_by_uid(adapter):
     crossword = dummy_crossword()
-    adapter.items[crossword.uid] = crossword
+    await adapter.save(crossword)
 
     assert await adapter.get_by_uid(crossword.uid) == crossword
 
 
-async def test_get_by_uid__unknown_uid():
-    adapter = CrosswordInMemoryDatabaseAdapter()
-
+async def test_get_by_uid__unknown_uid(adapter):
     assert await adapter.get_by_uid('does not exist') is None
 
 
-async def test_delete():
-    adapter = CrosswordInMemoryDatabaseAdapter()
-
+async def test_delete(adapter):
     crossword = dummy_crossword()
-    adapter.items[crossword.uid] = crossword
+    await adapter.save(crossword)
 
     await adapter.delete(crossword.uid)
 
-    assert crossword.uid not in adapter.items
-
+    assert await adapter.get_by_uid(crossword.uid) is None
 
-async def test_delete__unknown_uid():
-    adapter = CrosswordInMemoryDatabaseAdapter()
 
+async def test_delete__unknown_uid(adapter):
     with pytest.raises(Exception):
         await adapter.delete('does not exist')
+
+
+async def test_get_answer_key__invalidated_on_save_and_delete(adapter):
+    adapter.use_answer_key_cache(VersionedCache())
+    crossword = dummy_crossword()
+    await adapter.save(crossword)
+    assert await adapter.get_answer_key('does not exist') is None
+
+    answer_key = await adapter.get_answer_key(crossword.uid)
+    assert await adapter.get_answer_key(crossword.uid) is answer_key
+    assert answer_key.check(crossword.solution_letters).solved
+
+    updated_crossword = dummy_crossword().model_copy(update={'uid': crossword.uid})
+    await adapter.save(updated_crossword)
+    updated_answer_key = await adapter.get_answer_key(crossword.uid)
+    assert updated_answer_key is not answer_key
+    assert updated_answer_key.check(updated_crossword.solution_letters).solved
+
+    await adapter.delete(crossword.uid)
+    assert await adapter.get_answer_key(crossword.uid) is None
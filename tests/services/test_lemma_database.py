@@ -1,19 +1,35 @@
+import asyncio
+import random
 from dataclasses import dataclass, field
 
 import pytest
 
 from learnle.application.model import Lemma
-from learnle.services.lemma_database import LemmaInMemoryDatabaseAdapter
+from learnle.services.lemma_database import (
+    LemmaInMemoryDatabaseAdapter,
+    LemmaSQLiteDatabaseAdapter,
+)
+from learnle.utils.sqlite_crud import SQLiteConnectionPool
+from learnle.utils.crud_operation import InvalidCursorError
+from learnle.utils.response_cache import SerializedCache
 from tests.dummy_data import dummy_lemma, dummy_lemmas
 
 
-async def test_save():
-    adapter = LemmaInMemoryDatabaseAdapter()
+@pytest.fixture(params=['memory', 'sqlite'])
+def adapter(request, tmp_path):
+    if request.param == 'memory':
+        yield LemmaInMemoryDatabaseAdapter()
+        return
+    connection_pool = SQLiteConnectionPool(str(tmp_path / 'learnle.sqlite3'))
+    yield LemmaSQLiteDatabaseAdapter(connection_pool)
+    connection_pool.close()
 
+
+async def test_save(adapter):
     lemma = dummy_lemma()
     assert await adapter.save(lemma) == lemma
 
-    assert adapter.items[lemma.uid] == lemma
+    assert await adapter.get_by_uid(lemma.uid) == lemma
 
 
 @dataclass
@@ -60,11 +76,9 @@ search_test_cases = [
 
 
 @pytest.mark.parametrize('test_case', search_test_cases, ids=lambda x: x.name)
-async def test_search(test_case):
-    adapter = LemmaInMemoryDatabaseAdapter()
-
+async def test_search(adapter, test_case):
     for lemma in test_case.state:
-        adapter.items[lemma.uid] = lemma
+        await adapter.save(lemma)
 
     assert (
         await adapter.list(test_case.page_number, test_case.page_size)
@@ -72,34 +86,254 @@ async def test_search(test_case):
     )
 
 
-async def test_get_by_uid():
-    adapter = LemmaInMemoryDatabaseAdapter()
-
+async def test_get_by_uid(adapter):
     lemma = dummy_lemma()
-    adapter.items[lemma.uid] = lemma
+    await adapter.save(lemma)
 
     assert await adapter.get_by_uid(lemma.uid) == lemma
 
 
-async def test_get_by_uid__unknown_uid():
-    adapter = LemmaInMemoryDatabaseAdapter()
-
+async def test_get_by_uid__unknown_uid(adapter):
     assert await adapter.get_by_uid('does not exist') is None
 
 
-async def test_delete():
-    adapter = LemmaInMemoryDatabaseAdapter()
-
+async def test_delete(adapter):
     lemma = dummy_lemma()
-    adapter.items[lemma.uid] = lemma
+    await adapter.save(lemma)
 
     await adapter.delete(lemma.uid)
 
-    assert lemma.uid not in adapter.items
-
+    assert await adapter.get_by_uid(lemma.uid) is None
 
-async def test_delete__unknown_uid():
-    adapter = LemmaInMemoryDatabaseAdapter()
 
+async def test_delete__unknown_uid(adapter):
     with pytest.raises(Exception):
         await adapter.delete('does not exist')
+
+
+async def test_random_lemmas(adapter):
+    lemmas = dummy_lemmas(10)
+    for lemma in lemmas:
+        await adapter.save(lemma)
+
+    random_lemmas = await adapter.random_lemmas(3)
+
+    assert len(random_lemmas) == 3
+    assert len({lemma.uid for lemma in random_lemmas}) == 3
+    assert all(lemma in lemmas for lemma in random_lemmas)
+
+
+async def test_random_lemmas__more_than_stored(adapter):
+    lemma = dummy_lemma()
+    await adapter.save(lemma)
+
+    assert await adapter.random_lemmas(3) == [lemma]
+
+
+async def test_random_lemmas__filters(adapter):
+    matching_lemmas = [dummy_lemma(word='abcd'), dummy_lemma(word='xbyz')]
+    for lemma in matching_lemmas + [
+        dummy_lemma(word='abc'),
+        dummy_lemma(word='abcdefg'),
+        dummy_lemma(word='xxyz'),
+    ]:
+        await adapter.save(lemma)
+
+    random_lemmas = await adapter.random_lemmas(
+        5, minimum_word_length=4, maximum_word_length=5, letters='b'
+    )
+
+    assert sorted(random_lemmas, key=lambda x: x.word) == matching_lemmas
+
+
+async def test_random_lemmas__deleted_lemmas_are_not_picked(adapter):
+    lemmas = dummy_lemmas(5)
+    for lemma in lemmas:
+        await adapter.save(lemma)
+
+    await adapter.delete(lemmas[0].uid)
+    await adapter.delete(lemmas[3].uid)
+
+    random_lemmas = await adapter.random_lemmas(5)
+    assert sorted(random_lemmas, key=lambda x: x.uid) == sorted(
+        [lemmas[1], lemmas[2], lemmas[4]], key=lambda x: x.uid
+    )
+
+
+async def test_list_page(adapter):
+    lemmas = dummy_lemmas(5)
+    for lemma in lemmas:
+        await adapter.save(lemma)
+
+    first_page = await adapter.list_page(None, 2)
+    assert first_page.items == lemmas[:2]
+    second_page = await adapter.list_page(first_page.next_cursor, 2)
+    assert second_page.items == lemmas[2:4]
+    last_page = await adapter.list_page(second_page.next_cursor, 2)
+    assert last_page.items == lemmas[4:]
+    assert last_page.next_cursor is None
+
+
+async def test_list_page__cursor_survives_deletes(adapter):
+    lemmas = dummy_lemmas(6)
+    for lemma in lemmas:
+        await adapter.save(lemma)
+
+    first_page = await adapter.list_page(None, 2)
+    for lemma in lemmas[:3]:
+        await adapter.delete(lemma.uid)
+
+    second_page = await adapter.list_page(first_page.next_cursor, 2)
+    assert second_page.items == lemmas[3:5]
+
+
+async def test_list_page__invalid_cursor(adapter):
+    with pytest.raises(InvalidCursorError):
+        await adapter.list_page('not a cursor', 2)
+
+
+async def test_save_many(adapter):
+    lemmas = dummy_lemmas(5)
+    await adapter.save(lemmas[0])
+    lemmas[0] = dummy_lemma(uid=lemmas[0].uid)
+
+    assert await adapter.save_many(lemmas) == 5
+
+    assert await adapter.list(1, 10) == lemmas
+
+
+async def test_iterate(adapter):
+    lemmas = dummy_lemmas(5)
+    await adapter.save_many(lemmas)
+
+    assert [lemma async for lemma in adapter.iterate(page_size=2)] == lemmas
+
+
+async def test_get_serialized__invalidated_on_save_and_delete(adapter):
+    adapter.use_serialized_cache(SerializedCache())
+    lemma = dummy_lemma()
+    await adapter.save(lemma)
+
+    serialized_lemma = await adapter.get_serialized(lemma.uid)
+    assert serialized_lemma.body == lemma.model_dump_json().encode()
+
+    updated_lemma = dummy_lemma(uid=lemma.uid)
+    await adapter.save_many([updated_lemma])
+    assert (
+        await adapter.get_serialized(lemma.uid)
+    ).body == updated_lemma.model_dump_json().encode()
+
+    await adapter.delete(lemma.uid)
+    assert await adapter.get_serialized(lemma.uid) is None
+
+
+async def test_find_by_pattern(adapter):
+    words = ['crane', 'Plane', 'planet', 'crate', 'cross', 'c*abs']
+    lemmas = [dummy_lemma(word=word) for word in words]
+    await adapter.save_many(lemmas[:3])
+    await adapter.save(lemmas[3])
+    await adapter.save(lemmas[4])
+    await adapter.save(lemmas[5])
+
+    assert {lemma.word for lemma in await adapter.find_by_pattern('??a?e')} == {
+        'crane',
+        'Plane',
+        'crate',
+    }
+    assert {lemma.word for lemma in await adapter.find_by_pattern('c*???')} == {'c*abs'}
+    assert len(await adapter.find_by_pattern('?????', limit=2)) == 2
+
+    await adapter.delete(lemmas[0].uid)
+    await adapter.save(dummy_lemma(uid=lemmas[3].uid, word='blame'))
+    assert {lemma.word for lemma in await adapter.find_by_pattern('??a?e')} == {
+        'Plane',
+        'blame',
+    }
+
+
+async def test_random_interlocking_lemmas(adapter):
+    words = ['cat', 'act', 'tack', 'dog', 'god', 'moon']
+    lemmas = [dummy_lemma(word=word) for word in words]
+    await adapter.save_many(lemmas)
+    await adapter.delete(lemmas[2].uid)
+
+    for _ in range(20):
+        picked_words = [
+            lemma.word for lemma in await adapter.random_interlocking_lemmas(3)
+        ]
+
+        assert len(set(picked_words)) == len(picked_words)
+        assert sorted(picked_words) in (['act', 'cat'], ['dog', 'god', 'moon'])
+
+
+async def test_search_text(adapter):
+    lemmas = [
+        dummy_lemma(definition='A large bird of prey', example='The eagle flew'),
+        dummy_lemma(definition='A small bird', example='It sings a bird song'),
+        dummy_lemma(definition='A large river', example='The Rhône flows'),
+    ]
+    await adapter.save_many(lemmas[:2])
+    await adapter.save(lemmas[2])
+
+    page = await adapter.search_text('BIRD', page_size=1)
+    assert page.total == 2
+    assert page.items == [lemmas[1]]
+    assert (await adapter.search_text('bird', page_number=2, page_size=1)).items == [
+        lemmas[0]
+    ]
+    assert (await adapter.search_text('larg rhone')).items == [lemmas[2]]
+    assert (await adapter.search_text('?')).total == 0
+
+    await adapter.delete(lemmas[1].uid)
+    updated_lemma = dummy_lemma(
+        uid=lemmas[0].uid, definition='A fish', example='It swims'
+    )
+    await adapter.save(updated_lemma)
+    assert (await adapter.search_text('bird')).total == 0
+    assert (await adapter.search_text('swim')).items == [updated_lemma]
+
+
+async def test_search_text__indexes_existing_rows(tmp_path):
+    connection_pool = SQLiteConnectionPool(str(tmp_path / 'learnle.sqlite3'))
+    lemma = dummy_lemma(definition='A large bird of prey')
+    with connection_pool.connection() as connection:
+        connection.execute(
+            'CREATE TABLE lemma (sequence INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'uid TEXT NOT NULL UNIQUE, data TEXT NOT NULL)'
+        )
+        connection.execute(
+            'INSERT INTO lemma (uid, data) VALUES (?, ?)',
+            (lemma.uid, lemma.model_dump_json()),
+        )
+
+    adapter = LemmaSQLiteDatabaseAdapter(connection_pool)
+    assert (await adapter.search_text('prey')).items == [lemma]
+    LemmaSQLiteDatabaseAdapter(connection_pool)
+    assert (await adapter.search_text('prey')).total == 1
+    connection_pool.close()
+
+
+async def test_random_lemmas__probe_past_the_last_row_is_retried(tmp_path, monkeypatch):
+    connection_pool = SQLiteConnectionPool(str(tmp_path / 'learnle.sqlite3'))
+    adapter = LemmaSQLiteDatabaseAdapter(connection_pool)
+    lemma = dummy_lemma()
+    await adapter.save(lemma)
+    # The first probe lands after the last row, like after a concurrent delete of the last rows
+    probes = iter([2, 1])
+    monkeypatch.setattr(random, 'randint', lambda a, b: next(probes))
+
+    assert await adapter.random_lemmas(1) == [lemma]
+    connection_pool.close()
+
+
+async def test_sqlite_in_memory_database_is_shared_by_the_pool():
+    connection_pool = SQLiteConnectionPool(':memory:')
+    adapter = LemmaSQLiteDatabaseAdapter(connection_pool)
+    lemmas = dummy_lemmas(4)
+    await adapter.save_many(lemmas)
+
+    assert (
+        await asyncio.gather(*(adapter.get_by_uid(lemma.uid) for lemma in lemmas))
+        == lemmas
+    )
+    connection_pool.close()
@@ -0,0 +1,35 @@
+import random
+
+from benchmarks.crosswords import (
+    BenchmarkResult,
+    find_regressions,
+    generate_corpus,
+)
+
+
+def _result(name: str, p50: float) -> BenchmarkResult:
+    return BenchmarkResult(
+        name=name,
+        parameters={'grid_size': 10},
+        operations=1,
+        throughput_per_second=1000 / p50,
+        latency_ms={'p50': p50, 'p90': p50, 'p99': p50, 'max': p50},
+        peak_memory_bytes=0,
+    )
+
+
+def test_generate_corpus__unique_words():
+    corpus = generate_corpus(100, random.Random(0))
+
+    assert len({lemma.word for lemma in corpus}) == 100
+    assert all(3 <= len(lemma.word) <= 9 for lemma in corpus)
+    assert generate_corpus(100, random.Random(0)) == corpus
+
+
+def test_find_regressions():
+    baseline = [_result('pack', 1.0).to_dict(), _result('add_word', 1.0).to_dict()]
+    results = [_result('pack', 1.2), _result('add_word', 1.3), _result('new', 5.0)]
+
+    assert find_regressions(results, baseline, tolerance=0.25) == [
+        'add_word grid_size=10: median latency 1.300 ms, baseline 1.000 ms'
+    ]
@@ -0,0 +1,39 @@
+from learnle.utils.crud_operation import IndexedDict
+
+
+def test_indexed_dict__keeps_insertion_order():
+    indexed_dict = IndexedDict[int]()
+    for key in 'abcde':
+        indexed_dict[key] = ord(key)
+
+    del indexed_dict['b']
+    indexed_dict['a'] = 0
+
+    assert list(indexed_dict.items()) == [('a', 0), ('c', 99), ('d', 100), ('e', 101)]
+
+
+def test_indexed_dict__sample_after_deletes():
+    indexed_dict = IndexedDict[int]()
+    for value, key in enumerate('abcde'):
+        indexed_dict[key] = value
+
+    for key in 'aec':
+        del indexed_dict[key]
+
+    assert sorted(indexed_dict.sample(5)) == [1, 3]
+    assert indexed_dict.sample(5, predicate=lambda x: x > 2) == [3]
+
+
+def test_indexed_dict__values_after_compaction():
+    indexed_dict = IndexedDict[int]()
+    for value, key in enumerate('abcdefgh'):
+        indexed_dict[key] = value
+
+    values, sequence = indexed_dict.values_after(None, 3)
+    assert values == [0, 1, 2]
+    for key in 'abcdef':
+        del indexed_dict[key]
+    indexed_dict['i'] = 8
+
+    assert indexed_dict.values_after(sequence, 3) == ([6, 7, 8], None)
+    assert indexed_dict.values_from(1, 5) == [7, 8]
@@ -0,0 +1,120 @@
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from learnle.utils.executor import (
+    BoundedExecutor,
+    ExecutorSaturatedError,
+    map_unordered,
+)
+from learnle.utils.crossword_grid import CANDIDATE_INSERTIONS, UnpackedCrosswordGrid
+
+
+@pytest.fixture
+def thread_pool():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+async def test_run(thread_pool):
+    executor = BoundedExecutor(thread_pool, max_pending=1, timeout_seconds=1)
+
+    assert await executor.run(sum, [1, 2, 3]) == 6
+    assert executor.pending == 0
+
+
+async def test_run__saturated(thread_pool):
+    executor = BoundedExecutor(thread_pool, max_pending=1, timeout_seconds=1)
+
+    running_call = asyncio.create_task(executor.run(time.sleep, 0.1))
+    await asyncio.sleep(0)
+    with pytest.raises(ExecutorSaturatedError):
+        await executor.run(sum, [1, 2, 3])
+
+    await running_call
+    assert await executor.run(sum, [1, 2, 3]) == 6
+
+
+async def test_run__saturated_call_waits_for_a_slot(thread_pool):
+    executor = BoundedExecutor(thread_pool, max_pending=1, timeout_seconds=1)
+
+    running_call = asyncio.create_task(executor.run(time.sleep, 0.1))
+    await asyncio.sleep(0)
+
+    assert await executor.run(sum, [1, 2, 3], wait=True) == 6
+    assert running_call.done()
+    assert executor.pending == 0
+
+
+async def test_run__cancelled_waiting_call_does_not_keep_the_slot(thread_pool):
+    executor = BoundedExecutor(thread_pool, max_pending=1, timeout_seconds=1)
+
+    running_call = asyncio.create_task(executor.run(time.sleep, 0.1))
+    await asyncio.sleep(0)
+    cancelled_call = asyncio.create_task(executor.run(sum, [1], wait=True))
+    waiting_call = asyncio.create_task(executor.run(sum, [1, 2, 3], wait=True))
+    await asyncio.sleep(0)
+    cancelled_call.cancel()
+
+    assert await waiting_call == 6
+    await running_call
+    assert executor.pending == 0
+
+
+async def test_run__timeout_keeps_slot_until_the_call_finishes(thread_pool):
+    executor = BoundedExecutor(thread_pool, max_pending=1, timeout_seconds=0.01)
+
+    with pytest.raises(TimeoutError):
+        await executor.run(time.sleep, 0.1)
+    assert executor.pending == 1
+
+    await asyncio.sleep(0.2)
+    assert executor.pending == 0
+
+
+async def test_run__rejected_submission_releases_slot():
+    thread_pool = ThreadPoolExecutor(max_workers=1)
+    executor = BoundedExecutor(thread_pool, max_pending=1, timeout_seconds=1)
+    executor.shutdown()
+
+    with pytest.raises(RuntimeError):
+        await executor.run(sum, [1, 2, 3])
+    assert executor.pending == 0
+
+
+def test_map_unordered(thread_pool):
+    arguments = ((number, 10) for number in range(10))
+
+    results = {
+        index: future.result()
+        for index, future in map_unordered(thread_pool, pow, arguments, 3)
+    }
+
+    assert results == {number: number**10 for number in range(10)}
+
+
+def test_map_unordered__failed_submission_is_yielded():
+    thread_pool = ThreadPoolExecutor(max_workers=1)
+    thread_pool.shutdown()
+
+    (index, future), *_ = map_unordered(thread_pool, pow, [(2, 10)], 1)
+
+    assert index == 0
+    assert isinstance(future.exception(), RuntimeError)
+
+
+def _add_words(words: list[str]) -> int:
+    grid = UnpackedCrosswordGrid()
+    return sum(bool(grid.add_word(word)) for word in words)
+
+
+async def test_run__metrics_of_process_pool_calls_are_merged():
+    valid_insertions = CANDIDATE_INSERTIONS.value('valid')
+    with ProcessPoolExecutor(max_workers=1) as process_pool:
+        executor = BoundedExecutor(process_pool, max_pending=1, timeout_seconds=10)
+
+        assert await executor.run(_add_words, ['abc', 'bcd']) == 2
+
+    assert CANDIDATE_INSERTIONS.value('valid') == valid_insertions + 1
@@ -0,0 +1,45 @@
+import subprocess
+
+import pytest
+
+from learnle.utils import import_time
+from learnle.utils.import_time import (
+    ModuleImportTime,
+    measure_import_times,
+    parse_import_times,
+)
+
+
+def test_parse_import_times():
+    output = (
+        'import time: self [us] | cumulative | imported package\n'
+        'import time:       120 |        120 |     _io\n'
+        'import time:      1500 |       1620 |   click\n'
+        'unrelated line\n'
+    )
+
+    assert parse_import_times(output) == [
+        ModuleImportTime('_io', 120, 120, 2),
+        ModuleImportTime('click', 1500, 1620, 1),
+    ]
+
+
+@pytest.mark.parametrize(
+    'returncode, stderr, message',
+    [
+        (1, '', 'Importing module failed with exit status 1'),
+        (1, 'Traceback\nImportError: boom\n', 'ImportError: boom'),
+        (0, '', 'No import times were reported for module'),
+    ],
+)
+def test_measure_import_times__failures(monkeypatch, returncode, stderr, message):
+    monkeypatch.setattr(
+        import_time.subprocess,
+        'run',
+        lambda *args, **kwargs: subprocess.CompletedProcess(
+            args, returncode, stdout='', stderr=stderr
+        ),
+    )
+
+    with pytest.raises(ImportError, match=message):
+        measure_import_times('module')
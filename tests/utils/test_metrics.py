@@ -0,0 +1,63 @@
+from learnle.utils.metrics import MetricsRegistry, timed
+
+
+def test_counter__render():
+    registry = MetricsRegistry()
+    counter = registry.counter('test_events', 'Events', ('kind',))
+
+    counter.inc('b')
+    counter.inc('a', amount=2)
+    counter.inc('b')
+
+    assert registry.render() == (
+        '# HELP test_events Events\n'
+        '# TYPE test_events counter\n'
+        'test_events_total{kind="a"} 2\n'
+        'test_events_total{kind="b"} 2\n'
+    )
+
+
+def test_histogram__render():
+    registry = MetricsRegistry()
+    histogram = registry.histogram('test_seconds', 'Durations', buckets=(0.1, 1.0))
+
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+
+    assert registry.render() == (
+        '# HELP test_seconds Durations\n'
+        '# TYPE test_seconds histogram\n'
+        'test_seconds_bucket{le="0.1"} 2\n'
+        'test_seconds_bucket{le="1"} 3\n'
+        'test_seconds_bucket{le="+Inf"} 4\n'
+        'test_seconds_sum 2.65\n'
+        'test_seconds_count 4\n'
+    )
+
+
+def test_registry__drain_and_merge():
+    worker_registry = MetricsRegistry()
+    worker_counter = worker_registry.counter('test_events', 'Events')
+    registry = MetricsRegistry()
+    counter = registry.counter('test_events', 'Events')
+    counter.inc()
+
+    worker_counter.inc(amount=3)
+    registry.merge(worker_registry.drain())
+
+    assert counter.value() == 4
+    assert worker_counter.value() == 0
+
+
+async def test_timed():
+    histogram = MetricsRegistry().histogram(
+        'test_seconds', 'Durations', ('adapter', 'operation')
+    )
+
+    class Adapter:
+        @timed(histogram, 'get')
+        async def get(self, value: int) -> int:
+            return value
+
+    assert await Adapter().get(1) == 1
+    assert histogram.count('Adapter', 'get') == 1
@@ -0,0 +1,46 @@
+from learnle.utils.response_cache import SerializedCache, SerializedItem
+
+
+def test_serialized_item__matches():
+    item = SerializedItem.of(b'{}')
+
+    assert item.matches(item.etag)
+    assert item.matches(f'"other", W/{item.etag}')
+    assert item.matches('*')
+    assert not item.matches('"other"')
+    assert not item.matches(None)
+    assert SerializedItem.of(b'{}').etag == item.etag
+
+
+def test_serialized_cache__least_recently_used_eviction():
+    cache = SerializedCache(maximum_size=2)
+    for uid in 'abc':
+        if uid == 'c':
+            cache.get('a')
+        cache.put(uid, cache.version, SerializedItem.of(uid.encode()))
+
+    assert cache.get('a') is not None
+    assert cache.get('b') is None
+    assert cache.get('c') is not None
+
+
+def test_serialized_cache__expiry():
+    now = [0.0]
+    cache = SerializedCache(time_to_live_seconds=10, clock=lambda: now[0])
+    cache.put('a', cache.version, SerializedItem.of(b'a'))
+
+    now[0] = 9.0
+    assert cache.get('a') is not None
+    now[0] = 10.0
+    assert cache.get('a') is None
+
+
+def test_serialized_cache__invalidation():
+    cache = SerializedCache()
+    cache.put('a', cache.version, SerializedItem.of(b'a'))
+    stale_version = cache.version
+
+    cache.invalidate('a')
+    cache.put('a', stale_version, SerializedItem.of(b'a'))
+
+    assert cache.get('a') is None
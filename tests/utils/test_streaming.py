@@ -0,0 +1,9 @@
+from learnle.utils.streaming import iterate_async, iterate_lines
+
+
+async def test_iterate_lines():
+    chunks = [b'first\r\nsec', b'ond\n\nthi', 'rd \xe9'.encode()[:-1], b'\xa9']
+
+    lines = [line async for line in iterate_lines(iterate_async(chunks))]
+
+    assert lines == ['first', 'second', '', 'third \xe9']
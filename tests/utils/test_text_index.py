@@ -0,0 +1,69 @@
+from learnle.utils.text_index import TextIndex, tokenize
+
+
+def _index(**texts: str) -> TextIndex:
+    index = TextIndex()
+    for key, text in texts.items():
+        index.add(key, text)
+    return index
+
+
+def test_tokenize():
+    assert tokenize('Crème brûlée, SNAKE_case 42!') == [
+        'creme',
+        'brulee',
+        'snake',
+        'case',
+        '42',
+    ]
+
+
+def test_search__every_term_matches_a_token_prefix():
+    index = _index(
+        a='A large bird of prey',
+        b='A small bird that sings',
+        c='Birdsong in the morning',
+        d='A large river',
+    )
+
+    assert index.search('BIRD', 0, 10)[0] == 3
+    assert sorted(index.search('bird', 0, 10)[1]) == ['a', 'b', 'c']
+    assert index.search('larg bird', 0, 10) == (1, ['a'])
+    assert index.search('fish', 0, 10) == (0, [])
+    assert index.search('!?', 0, 10) == (0, [])
+
+
+def test_search__ranking_and_pagination():
+    index = _index(
+        a='sun and rain',
+        b='sun, sun and more sun',
+        c='sun in a long description of the weather',
+        d='rain',
+    )
+
+    assert index.search('sun', 0, 10) == (3, ['b', 'a', 'c'])
+    assert index.search('sun', 1, 1) == (3, ['a'])
+    assert index.search('sun', 3, 1) == (3, [])
+
+
+def test_add__replaces_and_remove():
+    index = _index(a='red apple', b='green apple')
+    index.add('a', 'yellow banana')
+    index.remove('b')
+    index.remove('unknown')
+
+    assert len(index) == 1
+    assert index.search('apple', 0, 10) == (0, [])
+    assert index.search('bana', 0, 10) == (1, ['a'])
+
+
+def test_search__empty_index():
+    assert TextIndex().search('apple', 0, 10) == (0, [])
+
+
+def test_search__index_emptied_by_remove():
+    index = _index(a='red apple')
+    index.remove('a')
+
+    assert len(index) == 0
+    assert index.search('apple', 0, 10) == (0, [])
@@ -0,0 +1,78 @@
+import random
+from itertools import combinations
+
+from learnle.utils.word_index import WordPatternIndex, letter_signature
+
+
+def _index(**words: str) -> WordPatternIndex:
+    index = WordPatternIndex()
+    for key, word in words.items():
+        index.add(key, word)
+    return index
+
+
+def test_find():
+    index = _index(a='crane', b='plane', c='planet', d='Crate', e='cross')
+
+    assert index.find('?????') == ['a', 'b', 'd', 'e']
+    assert index.find('??a?e') == ['a', 'b', 'd']
+    assert index.find('CR???') == ['a', 'd', 'e']
+    assert index.find('plane?') == ['c']
+    assert index.find('?x???') == []
+    assert index.find('??????????') == []
+
+
+def test_find__limit():
+    index = _index(**{f'key_{number}': 'word' for number in range(20)})
+
+    assert index.find('w???', limit=3) == ['key_0', 'key_1', 'key_2']
+
+
+def test_add__replaces_the_word_of_the_key():
+    index = _index(a='crane')
+    index.add('a', 'plane')
+
+    assert len(index) == 1
+    assert index.find('cr???') == []
+    assert index.find('pl???') == ['a']
+
+
+def test_remove():
+    index = _index(a='crane', b='crate')
+    index.remove('a')
+    index.remove('unknown')
+
+    assert len(index) == 1
+    assert index.find('cra??') == ['b']
+
+    index.add('c', 'craft')
+    assert index.find('cra??') == ['c', 'b']
+
+
+def test_letter_signature():
+    assert letter_signature('') == 0
+    assert letter_signature('Abba') == 0b11
+    assert letter_signature('zé!') == 1 << 25
+
+
+def test_sample_interlocking():
+    index = _index(a='cat', b='act', c='dog', d='god', e='tide', f='moon')
+
+    for seed in range(50):
+        keys = index.sample_interlocking(3, random.Random(seed))
+
+        assert len(set(keys)) == 3
+        words = [index._words[index._slots[key]] for key in keys]
+        assert all(
+            not set(first_word).isdisjoint(second_word)
+            for first_word, second_word in combinations(words, 2)
+        )
+
+
+def test_sample_interlocking__removed_words_are_not_picked():
+    index = _index(a='cat', b='act', c='tack')
+    index.remove('b')
+
+    assert sorted(index.sample_interlocking(3, random.Random(0))) == ['a', 'c']
+    assert index.sample_interlocking(3, random.Random(0)) != []
+    assert WordPatternIndex().sample_interlocking(3, random.Random(0)) == []